@@ -0,0 +1,135 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare event loops for many-connection workloads.
+
+Fake router runs in a background thread (own asyncio loop). Clients open many connections at once,
+login and print rows on each connection. Backends which are not installed are skipped.
+
+Usage: python benchmarks/bench_async_backends.py [connections] [prints per connection] [rows per print]
+"""
+
+import asyncio
+import sys
+import threading
+from collections.abc import Awaitable, Callable
+from functools import partial
+from time import perf_counter
+
+from librouteros import async_connect
+from librouteros.api import AsyncApi
+from librouteros.connections import AsyncSocketTransport
+from librouteros.exceptions import ConnectionClosed
+from librouteros.protocol import AsyncApiProtocol
+
+Connect = Callable[..., Awaitable[AsyncApi]]
+
+
+async def handle(rows: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Accept any login. Reply to print with given number of rows."""
+    protocol = AsyncApiProtocol(transport=AsyncSocketTransport(reader=reader, writer=writer), encoding="ASCII")
+    row = tuple(f"=name=ether{number}" for number in range(10))
+    try:
+        while True:
+            cmd, _ = await protocol.readSentence()
+            if cmd.endswith("/print"):
+                await protocol.writeSentences(*((("!re", *row),) * rows))
+            await protocol.writeSentence("!done")
+    except ConnectionClosed:
+        pass
+    finally:
+        writer.close()
+
+
+def start_router(rows: int) -> int:
+    """Start fake router in background thread. Return its port."""
+    started: threading.Event = threading.Event()
+    port: list[int] = []
+
+    async def serve() -> None:
+        server = await asyncio.start_server(partial(handle, rows), "127.0.0.1", 0, backlog=4096)
+        port.append(server.sockets[0].getsockname()[1])
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    started.wait()
+    return port[0]
+
+
+async def session(connect: Connect, port: int, prints: int) -> int:
+    api = await connect("127.0.0.1", username="admin", password="", port=port)
+    received = 0
+    try:
+        for _ in range(prints):
+            received += len([row async for row in api.path("interface")])
+    finally:
+        await api.close()
+    return received
+
+
+async def workload_asyncio(connect: Connect, port: int, connections: int, prints: int) -> int:
+    results = await asyncio.gather(*(session(connect, port, prints) for _ in range(connections)))
+    return sum(results)
+
+
+async def workload_anyio(connect: Connect, port: int, connections: int, prints: int) -> int:
+    import anyio
+
+    results: list[int] = []
+
+    async def one() -> None:
+        results.append(await session(connect, port, prints))
+
+    async with anyio.create_task_group() as group:
+        for _ in range(connections):
+            group.start_soon(one)
+    return sum(results)
+
+
+def backends() -> dict[str, Callable[[int, int, int], int]]:
+    found: dict[str, Callable[[int, int, int], int]] = {
+        "asyncio": lambda *args: asyncio.run(workload_asyncio(async_connect, *args)),
+    }
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+        print("uvloop not installed, skipping")
+    else:
+        found["uvloop"] = lambda *args: uvloop.run(workload_asyncio(async_connect, *args))
+    try:
+        import anyio
+
+        from librouteros.anyio_backend import connect
+    except ImportError:
+        print("anyio not installed, skipping anyio backends")
+        return found
+    found["anyio+asyncio"] = lambda *args: anyio.run(workload_anyio, connect, *args, backend="asyncio")
+    if uvloop is not None:
+        found["anyio+uvloop"] = lambda *args: anyio.run(
+            workload_anyio, connect, *args, backend="asyncio", backend_options={"use_uvloop": True}
+        )
+    try:
+        import trio  # noqa F401
+    except ImportError:
+        print("trio not installed, skipping")
+    else:
+        found["anyio+trio"] = lambda *args: anyio.run(workload_anyio, connect, *args, backend="trio")
+    return found
+
+
+def main(connections: int, prints: int, rows: int) -> None:
+    port: int = start_router(rows)
+    print(f"{connections} connections, {prints} prints each, {rows} rows per print")
+    for name, run in backends().items():
+        start = perf_counter()
+        received = run(port, connections, prints)
+        elapsed = perf_counter() - start
+        if received != connections * prints * rows:
+            raise RuntimeError(f"{name} received {received} rows")
+        print(f"{name:<15} {elapsed:.3f}s {received / elapsed:>12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args) if args else main(100, 10, 20)
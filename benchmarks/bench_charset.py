@@ -0,0 +1,60 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare decoding of sentences word by word (as ApiProtocol did) with charset.decode_text()
+for each encoding strategy.
+
+Usage: python benchmarks/bench_charset.py [number of sentences]
+"""
+
+import sys
+from collections.abc import Callable, Sequence
+from time import perf_counter
+
+from librouteros.charset import decode_text
+
+WORDS = (
+    b"!re",
+    b"=.id=*1A2B",
+    b"=dst-address=192.168.88.0/24",
+    b"=gateway=ether1",
+    b"=distance=1",
+    b"=scope=30",
+    b"=target-scope=10",
+    b"=disabled=false",
+    b"=active=true",
+)
+ASCII_SENTENCE = (*WORDS, b"=comment=uplink to core")
+UTF8_SENTENCE = (*WORDS, "=comment=łącze do rdzenia".encode())
+INVALID_SENTENCE = (*WORDS, b"=comment=\xff\xfe uplink")
+
+
+def word_by_word(words: Sequence[bytes], encoding: str, errors: str) -> tuple[str, ...]:
+    return tuple(word.decode(encoding=encoding, errors=errors) for word in words)
+
+
+def measure(decode: Callable[[Sequence[bytes], str, str], tuple[str, ...]], *args: object, count: int) -> float:
+    start = perf_counter()
+    for _ in range(count):
+        decode(*args)  # type: ignore[arg-type]
+    return perf_counter() - start
+
+
+def main(count: int) -> None:
+    cases = (
+        ("ASCII, ignore", ASCII_SENTENCE, "ASCII", "ignore"),
+        ("UTF-8 ASCII data", ASCII_SENTENCE, "utf-8", "ignore"),
+        ("UTF-8 non ASCII data", UTF8_SENTENCE, "utf-8", "strict"),
+        ("UTF-8 surrogateescape", INVALID_SENTENCE, "utf-8", "surrogateescape"),
+    )
+    print(f"{count} sentences of {len(ASCII_SENTENCE)} words")
+    print(f"{'case':<24} {'word by word':>12} {'decode_text':>12} {'speedup':>8}")
+    for name, sentence, encoding, errors in cases:
+        if decode_text(sentence, encoding, errors) != word_by_word(sentence, encoding, errors):
+            raise RuntimeError(f"{name}: results differ")
+        reference = measure(word_by_word, sentence, encoding, errors, count=count)
+        fast = measure(decode_text, sentence, encoding, errors, count=count)
+        print(f"{name:<24} {reference:>11.3f}s {fast:>11.3f}s {reference / fast:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,161 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare word by word decoding (as done before codec module) with codec.decode_sentence()
+and with protocol.SentenceParser fed the way transports feed it.
+Also feed parser huge words in small chunks. Time should grow linearly with word size.
+
+Exact reads from in memory stream only show Python overhead. With sockets each read is a syscall,
+so number of reads per word matters more.
+
+Usage: python benchmarks/bench_codec.py [number of words]
+"""
+
+import sys
+from io import BytesIO
+from time import perf_counter
+
+from librouteros.codec import decode_sentence
+from librouteros.protocol import SentenceParser, encode_sentence
+
+
+def determine_length(length: bytes) -> int:
+    ctl_byte = length[0]
+    if ctl_byte < 128:
+        return 0
+    elif ctl_byte < 192:
+        return 1
+    elif ctl_byte < 224:
+        return 2
+    return 3
+
+
+def decode_length(length: bytes) -> int:
+    ctl_byte = length[0]
+    if ctl_byte < 0x80:
+        return int.from_bytes(length, "big")
+    elif ctl_byte < 0xC0:
+        return int.from_bytes(length[:2], "big") ^ 0x8000
+    elif ctl_byte < 0xE0:
+        return int.from_bytes(length[:3], "big") ^ 0xC00000
+    return int.from_bytes(length[:4], "big") ^ 0xE0000000
+
+
+class CountingStream(BytesIO):
+    reads = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        self.reads += 1
+        return super().read(size)
+
+
+def word_by_word(stream: BytesIO) -> int:
+    """Per word reads, as ApiProtocol.readWord did before SentenceParser."""
+    words = 0
+    read = stream.read
+    while byte := read(1):
+        if byte == b"\x00":
+            continue
+        byte += read(determine_length(byte))
+        read(decode_length(byte))
+        words += 1
+    return words
+
+
+def single_pass(data: bytes) -> int:
+    words = 0
+    offset = 0
+    while (result := decode_sentence(data, offset)) is not None:
+        sentence, offset = result
+        words += len(sentence)
+    return words
+
+
+def parser_exact_reads(stream: BytesIO) -> int:
+    """Parser fed by exact reads, as ApiProtocol does with blocking transports."""
+    words = 0
+    parser = SentenceParser()
+    read = stream.read
+    while True:
+        while (sentence := parser.next_sentence()) is None:
+            if not (data := read(parser.needed)):
+                return words
+            parser.feed(data)
+        words += len(sentence)
+
+
+def parser_chunks(data: bytes, size: int) -> int:
+    """Parser fed fixed size chunks, as received from socket with recv(size)."""
+    words = 0
+    parser = SentenceParser()
+    for start in range(0, len(data), size):
+        parser.feed(data[start : start + size])
+        while (sentence := parser.next_sentence()) is not None:
+            words += len(sentence)
+    return words
+
+
+def large_word(size: int, chunk: int) -> float:
+    """Feed single sentence with one huge word in chunks, as received from socket. Return seconds taken."""
+    data = encode_sentence("!re", "=source=" + "x" * size, encoding="ASCII")
+    parser = SentenceParser()
+    start = perf_counter()
+    for position in range(0, len(data), chunk):
+        parser.feed(data[position : position + chunk])
+        if (sentence := parser.next_sentence()) is not None and len(sentence[1]) != size + len("=source="):
+            raise RuntimeError("Large word decoded wrong")
+    return perf_counter() - start
+
+
+def main(count: int) -> None:
+    # Typical print response: 10 words per sentence, mostly short, some long (comments, scripts).
+    sentence = encode_sentence(
+        "!re",
+        "=.id=*1A2B",
+        "=dst-address=192.168.88.0/24",
+        "=gateway=ether1",
+        "=distance=1",
+        "=scope=30",
+        "=target-scope=10",
+        "=disabled=false",
+        "=comment=" + "x" * 300,
+        "=active=true",
+        encoding="ASCII",
+    )
+    data = sentence * (count // 10)
+
+    stream = CountingStream(data)
+    start = perf_counter()
+    reference = word_by_word(stream)
+    reference_time = perf_counter() - start
+    reference_reads = stream.reads
+
+    start = perf_counter()
+    fast = single_pass(data)
+    fast_time = perf_counter() - start
+
+    stream = CountingStream(data)
+    start = perf_counter()
+    exact = parser_exact_reads(stream)
+    exact_time = perf_counter() - start
+    exact_reads = stream.reads
+
+    start = perf_counter()
+    chunked = parser_chunks(data, 65536)
+    chunked_time = perf_counter() - start
+
+    if not reference == fast == exact == chunked:
+        raise RuntimeError(f"Word count differs: {reference} {fast} {exact} {chunked}")
+    print(f"words:                {fast}")
+    print(f"word by word:         {reference_time:.3f}s {reference_reads / reference:.2f} reads per word")
+    print(f"single pass:          {fast_time:.3f}s ({reference_time / fast_time:.2f}x)")
+    print(
+        f"parser, exact reads:  {exact_time:.3f}s ({reference_time / exact_time:.2f}x) "
+        f"{exact_reads / exact:.2f} reads per word"
+    )
+    print(f"parser, 64 KiB reads: {chunked_time:.3f}s ({reference_time / chunked_time:.2f}x)")
+    for megabytes in (4, 8, 16):
+        print(f"{megabytes:>2} MiB word, 64 KiB reads: {large_word(megabytes * 1024 * 1024, 65536):.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,40 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure cumulative import time of librouteros with -X importtime.
+Best of several runs is reported, single runs are too noisy on busy machines.
+
+Usage: python benchmarks/bench_import.py [runs]
+"""
+
+import subprocess
+import sys
+
+
+def cumulative_import_time(stderr: str, module: str) -> int:
+    """Parse -X importtime output. Return cumulative time in microseconds."""
+    for line in stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == module:
+            return int(cumulative)
+    raise LookupError(module)
+
+
+def import_time() -> int:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import librouteros"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return cumulative_import_time(result.stderr, "librouteros")
+
+
+def main(runs: int) -> None:
+    # Warm up bytecode cache.
+    import_time()
+    times = [import_time() for _ in range(runs)]
+    print(f"import librouteros: best {min(times) / 1000:.1f}ms, worst {max(times) / 1000:.1f}ms of {runs} runs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
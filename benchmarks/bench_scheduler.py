@@ -0,0 +1,76 @@
+# -*- coding: UTF-8 -*-
+"""
+Show how spreading and jitter flatten load of many recurring polls.
+
+Every poll takes a fixed time on a fake router. Peak number of polls running at once is reported,
+together with lag of timers and number of api calls saved by coalescing.
+
+Usage: python benchmarks/bench_scheduler.py [hosts] [paths per host] [seconds]
+"""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock
+
+from librouteros.api import AsyncApi
+from librouteros.pool import AsyncPool
+from librouteros.scheduler import Scheduler
+
+INTERVAL = 1.0
+POLL_TIME = 0.01
+
+
+class Load:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def connect(self, host: str) -> AsyncApi:
+        api = AsyncApi(protocol=AsyncMock())
+        api.rawCmd = self.raw_cmd
+        return api
+
+    async def raw_cmd(self, cmd, *words):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(POLL_TIME)
+        finally:
+            self.active -= 1
+        yield {"name": "ether1"}
+
+
+async def run(hosts: int, paths: int, seconds: float, **kwargs) -> None:
+    load = Load()
+    async with (
+        AsyncPool(load.connect, per_host=paths, limit=hosts * paths) as pool,
+        Scheduler(pool, **kwargs) as scheduler,
+    ):
+        for host in range(hosts):
+            for path in range(paths):
+                # Two collectors poll each path. They share one schedule and one call.
+                scheduler.add(f"host{host}", f"/path{path}", INTERVAL, lambda result: None)
+                scheduler.add(f"host{host}", f"/path{path}", INTERVAL, lambda result: None)
+        await asyncio.sleep(seconds)
+    stats = [schedule.stats for schedule in scheduler.schedules.values()]
+    max_lag = max(stat.max_lag for stat in stats)
+    mean_lag = sum(stat.total_lag for stat in stats) / max(1, sum(stat.runs for stat in stats))
+    callbacks = 2 * sum(stat.runs for stat in stats)
+    print(
+        f"jitter={kwargs['jitter']:<4} spread={kwargs['spread']!s:<6} peak {load.peak:>5} concurrent, "
+        f"{load.calls:>6} calls for {callbacks:>6} results, "
+        f"lag mean {mean_lag * 1000:.1f}ms max {max_lag * 1000:.1f}ms"
+    )
+
+
+def main(hosts: int, paths: int, seconds: float) -> None:
+    print(f"{hosts} hosts, {paths} paths each, every {INTERVAL}s, {seconds}s")
+    asyncio.run(run(hosts, paths, seconds, jitter=0, spread=False))
+    asyncio.run(run(hosts, paths, seconds, jitter=0.1, spread=True))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args) if args else main(200, 5, 3)
@@ -2,13 +2,11 @@
 
 from __future__ import annotations
 
-import asyncio
 from collections.abc import Awaitable, Callable
-from socket import create_connection, socket
-from ssl import SSLContext
-from typing import TypedDict
+from typing import TYPE_CHECKING, TypedDict
 
 from librouteros.api import Api, AsyncApi
+from librouteros.charset import ERRORS
 from librouteros.connections import AsyncSocketTransport, SocketTransport
 from librouteros.exceptions import ConnectionClosed, FatalError
 from librouteros.login import (
@@ -17,7 +15,11 @@ from librouteros.login import (
     plain,
     token,  # noqa F401
 )
-from librouteros.protocol import ApiProtocol, AsyncApiProtocol
+from librouteros.protocol import ApiProtocol, AsyncApiProtocol, Sink
+
+if TYPE_CHECKING:
+    from socket import socket
+    from ssl import SSLContext
 
 
 class ConnectKwargs(TypedDict, total=False):
@@ -26,6 +28,9 @@ class ConnectKwargs(TypedDict, total=False):
     saddr: str | None
     subclass: type[Api]
     encoding: str
+    errors: str
+    max_word_size: int | None
+    sink: Sink | None
     ssl_wrapper: Callable[[socket], socket] | None
     login_method: Callable[[Api, str, str], None]
 
@@ -36,6 +41,9 @@ class AsyncConnectKwargs(TypedDict, total=False):
     saddr: str | None
     subclass: type[AsyncApi]
     encoding: str
+    errors: str
+    max_word_size: int | None
+    sink: Sink | None
     ssl_wrapper: SSLContext | None
     login_method: Callable[[AsyncApi, str, str], Awaitable[None]]
 
@@ -46,6 +54,9 @@ DEFAULTS: ConnectKwargs = {
     "saddr": None,
     "subclass": Api,
     "encoding": "ASCII",
+    "errors": ERRORS,
+    "max_word_size": None,
+    "sink": None,
     "ssl_wrapper": None,
     "login_method": plain,
 }
@@ -56,6 +67,9 @@ ASYNC_DEFAULTS: AsyncConnectKwargs = {
     "saddr": None,
     "subclass": AsyncApi,
     "encoding": "ASCII",
+    "errors": ERRORS,
+    "max_word_size": None,
+    "sink": None,
     "ssl_wrapper": None,
     "login_method": async_plain,
 }
@@ -71,6 +85,9 @@ def connect(
     saddr: str | None = DEFAULTS["saddr"],
     subclass: type[Api] = DEFAULTS["subclass"],
     encoding: str = DEFAULTS["encoding"],
+    errors: str = DEFAULTS["errors"],
+    max_word_size: int | None = DEFAULTS["max_word_size"],
+    sink: Sink | None = DEFAULTS["sink"],
     ssl_wrapper: Callable[[socket], socket] | None = DEFAULTS["ssl_wrapper"],
     login_method: Callable[[Api, str, str], None] = DEFAULTS["login_method"],
 ) -> Api:
@@ -86,13 +103,20 @@ def connect(
     :param saddr: Source address to bind to.
     :param subclass: Subclass of Api class. Defaults to Api class from library.
     :param encoding: String encoding to use.
+    :param errors: Error handler for undecodable bytes. Defaults to "ignore".
+                   Use "surrogateescape" to keep them, or "strict" to raise UnicodeDecodeError.
+    :param max_word_size: Maximum length of received word. Longer words raise ProtocolError,
+                          unless sink is given. Defaults to no limit.
+    :param sink: Callable taking attribute name and returning file like object to write oversized value to.
     :param ssl_wrapper: Callable (e.g. ssl.SSLContext.wrap_socket()) to wrap socket with.
     :param login_method: Callable with login method.
     """
     transport: SocketTransport = create_transport(
         host=host, port=port, saddr=saddr, timeout=timeout, ssl_wrapper=ssl_wrapper
     )
-    protocol: ApiProtocol = ApiProtocol(transport=transport, encoding=encoding)
+    protocol: ApiProtocol = ApiProtocol(
+        transport=transport, encoding=encoding, max_word_size=max_word_size, sink=sink, errors=errors
+    )
     api: Api = subclass(protocol=protocol)
 
     try:
@@ -113,6 +137,9 @@ async def async_connect(
     saddr: str | None = ASYNC_DEFAULTS["saddr"],
     subclass: type[AsyncApi] = ASYNC_DEFAULTS["subclass"],
     encoding: str = ASYNC_DEFAULTS["encoding"],
+    errors: str = ASYNC_DEFAULTS["errors"],
+    max_word_size: int | None = ASYNC_DEFAULTS["max_word_size"],
+    sink: Sink | None = ASYNC_DEFAULTS["sink"],
     ssl_wrapper: SSLContext | None = ASYNC_DEFAULTS["ssl_wrapper"],
     login_method: Callable[[AsyncApi, str, str], Awaitable[None]] = ASYNC_DEFAULTS["login_method"],
 ) -> AsyncApi:
@@ -128,13 +155,25 @@ async def async_connect(
     :param saddr: Source address to bind to.
     :param subclass: Subclass of AsyncApi class. Defaults to AsyncApi class from library.
     :param encoding: String encoding to use.
+    :param errors: Error handler for undecodable bytes. Defaults to "ignore".
+                   Use "surrogateescape" to keep them, or "strict" to raise UnicodeDecodeError.
+    :param max_word_size: Maximum length of received word. Longer words raise ProtocolError,
+                          unless sink is given. Defaults to no limit.
+    :param sink: Callable taking attribute name and returning file like object to write oversized value to.
     :param ssl_wrapper: ssl.SSLContext instance to wrap socket with.
     :param login_method: Coroutine with login method.
     """
     transport: AsyncSocketTransport = await async_create_transport(
         host=host, port=port, saddr=saddr, timeout=timeout, ssl_wrapper=ssl_wrapper
     )
-    protocol: AsyncApiProtocol = AsyncApiProtocol(transport=transport, encoding=encoding, timeout=timeout)
+    protocol: AsyncApiProtocol = AsyncApiProtocol(
+        transport=transport,
+        encoding=encoding,
+        timeout=timeout,
+        max_word_size=max_word_size,
+        sink=sink,
+        errors=errors,
+    )
     api: AsyncApi = subclass(protocol=protocol)
 
     try:
@@ -145,6 +184,18 @@ async def async_connect(
         raise
 
 
+def create_connection(
+    address: tuple[str, int],
+    *,
+    timeout: float,
+    source_address: tuple[str, int] | None,
+) -> socket:
+    """Same as socket.create_connection(). socket module is imported only when connecting."""
+    from socket import create_connection as socket_create_connection
+
+    return socket_create_connection(address, timeout=timeout, source_address=source_address)
+
+
 def create_transport(
     host: str,
     *,
@@ -171,6 +222,8 @@ async def async_create_transport(
     timeout: float,
     ssl_wrapper: SSLContext | None = None,
 ) -> AsyncSocketTransport:
+    import asyncio
+
     reader, writer = await asyncio.wait_for(
         asyncio.open_connection(
             host=host,
@@ -0,0 +1,137 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, TypeVar
+
+import anyio
+from anyio.abc import ByteStream
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from librouteros import ASYNC_DEFAULTS
+from librouteros.api import AsyncApi
+from librouteros.exceptions import ConnectionClosed, FatalError
+from librouteros.protocol import AsyncApiProtocol, Sink
+
+if TYPE_CHECKING:
+    from ssl import SSLContext
+
+T = TypeVar("T")
+
+
+class AnyioTransport:
+    """
+    AsyncTransport on top of anyio byte stream.
+    Works with every event loop supported by anyio (asyncio, uvloop, trio).
+
+    :param stream: Connected anyio byte stream.
+    """
+
+    __slots__ = ("buffered", "stream")
+
+    def __init__(self, stream: ByteStream) -> None:
+        self.stream: ByteStream = stream
+        self.buffered: BufferedByteReceiveStream = BufferedByteReceiveStream(stream)
+
+    async def write(self, data: bytes) -> None:
+        try:
+            await self.stream.send(data)
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError) as error:
+            raise ConnectionClosed("Connection unexpectedly closed.") from error
+
+    async def read(self, length: int) -> bytes:
+        """Read exactly length bytes."""
+        try:
+            return await self.buffered.receive_exactly(length)
+        except (anyio.IncompleteRead, anyio.EndOfStream, anyio.BrokenResourceError, anyio.ClosedResourceError) as error:
+            raise ConnectionClosed("Connection unexpectedly closed.") from error
+
+    async def close(self) -> None:
+        await self.stream.aclose()
+
+    def pause_reading(self) -> None:
+        # anyio streams receive only when asked to. Not reading is enough.
+        pass
+
+    def resume_reading(self) -> None:
+        pass
+
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T:  # noqa ASYNC109  # AsyncTransport API
+        """
+        Await with timeout.
+
+        :throws TimeoutError: If timeout expires.
+        """
+        with anyio.fail_after(timeout):
+            return await awaitable
+
+
+async def create_transport(
+    host: str,
+    *,
+    port: int,
+    saddr: str | None,
+    timeout: float,  # noqa ASYNC109  # same signature as async_create_transport()
+    ssl_wrapper: SSLContext | None = None,
+) -> AnyioTransport:
+    with anyio.fail_after(timeout):
+        stream: ByteStream
+        if ssl_wrapper is None:
+            stream = await anyio.connect_tcp(host, port, local_host=saddr)
+        else:
+            stream = await anyio.connect_tcp(host, port, local_host=saddr, ssl_context=ssl_wrapper)
+    return AnyioTransport(stream)
+
+
+async def connect(
+    host: str,
+    username: str,
+    password: str,
+    *,
+    timeout: float = ASYNC_DEFAULTS["timeout"],  # noqa ASYNC109  # same signature as async_connect()
+    port: int = ASYNC_DEFAULTS["port"],
+    saddr: str | None = ASYNC_DEFAULTS["saddr"],
+    subclass: type[AsyncApi] = ASYNC_DEFAULTS["subclass"],
+    encoding: str = ASYNC_DEFAULTS["encoding"],
+    errors: str = ASYNC_DEFAULTS["errors"],
+    max_word_size: int | None = ASYNC_DEFAULTS["max_word_size"],
+    sink: Sink | None = ASYNC_DEFAULTS["sink"],
+    ssl_wrapper: SSLContext | None = ASYNC_DEFAULTS["ssl_wrapper"],
+    login_method: Callable[[AsyncApi, str, str], Awaitable[None]] = ASYNC_DEFAULTS["login_method"],
+) -> AsyncApi:
+    """
+    Same as librouteros.async_connect() but runs on any event loop supported by anyio.
+
+    .. code-block:: python
+
+        from librouteros.anyio_backend import connect
+
+
+        async def main():
+            api = await connect(host, username="admin", password="abc")
+
+
+        trio.run(main)
+
+    AsyncApi.stream(), AsyncPool and pagination helpers use asyncio primitives and need asyncio (or uvloop).
+    """
+    transport: AnyioTransport = await create_transport(
+        host=host, port=port, saddr=saddr, timeout=timeout, ssl_wrapper=ssl_wrapper
+    )
+    protocol: AsyncApiProtocol = AsyncApiProtocol(
+        transport=transport,
+        encoding=encoding,
+        timeout=timeout,
+        max_word_size=max_word_size,
+        sink=sink,
+        errors=errors,
+    )
+    api: AsyncApi = subclass(protocol=protocol)
+
+    try:
+        await login_method(api, username, password)
+        return api
+    except (ConnectionClosed, FatalError):
+        await transport.close()
+        raise
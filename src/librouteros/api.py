@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Sequence
+from functools import lru_cache
 from posixpath import join as pjoin
+from sys import _getframe, intern
+from typing import TYPE_CHECKING, Any
 
+from librouteros.batch import Batch, BatchResult, tag_sentences
 from librouteros.exceptions import MultiTrapError, TrapError
 from librouteros.protocol import (
     ApiProtocol,
@@ -15,12 +19,24 @@ from librouteros.protocol import (
 from librouteros.query import AsyncQuery, Key, Query
 from librouteros.types import (
     AsyncResponseIter,
+    QueryGen,
     ReplyDict,
     Response,
     ResponseIter,
     ROSType,
 )
 
+if TYPE_CHECKING:
+    from librouteros.pagination import AsyncPaginator, Paginator
+    from librouteros.profiling import Profile
+    from librouteros.streaming import AsyncStream
+
+
+@lru_cache(maxsize=4096)
+def join_path(*path: str) -> str:
+    """Join and normalize absolute path. Results are cached since same paths are used over and over again."""
+    return intern(pjoin("/", *path).rstrip("/"))
+
 
 class Api:
     def __init__(self, protocol: ApiProtocol) -> None:
@@ -80,6 +96,51 @@ class Api:
             raise traps[0]
         return response
 
+    def batch(self, sentences: Iterable[Sequence[str]]) -> list[BatchResult]:
+        """
+        Send many commands at once and wait for all of them.
+        Replies are matched with commands by .tag word.
+
+        :param sentences: Each one is command word followed by raw api words.
+                          e.g. [('/system/resource/print',), ('/ip/route/print', '=count-only=')]
+        :returns: Response of each command in given order.
+                  Failed ones are replaced by TrapError or MultiTrapError.
+        """
+        tagged: list[tuple[str, ...]] = tag_sentences(sentences)
+        if not tagged:
+            return []
+        self.protocol.writeSentences(*tagged)
+        batch: Batch = Batch(count=len(tagged))
+        while not batch.done:
+            batch.feed(*self.protocol.readSentence())
+        return batch.results()
+
+    def profile(self) -> Profile:
+        """
+        Context manager measuring where time is spent for each command path:
+        waiting for transport, framing, decoding and consuming rows.
+
+        .. code-block:: python
+
+            with api.profile() as profile:
+                tuple(api.path("interface"))
+            print(profile.report())
+        """
+        from librouteros.profiling import Profile
+
+        return Profile(self)
+
+    def download(self, name: str, destination: str, **kwargs: Any) -> str:
+        """
+        Download file from router in concurrently requested chunks.
+        See librouteros.transfer.download() for arguments.
+
+        :returns: Hex digest of downloaded file.
+        """
+        from librouteros.transfer import download
+
+        return download(self, name, destination, **kwargs)
+
     def close(self) -> None:
         self.protocol.close()
 
@@ -93,6 +154,8 @@ class Api:
 class Path:
     """Represents absolute command path."""
 
+    __slots__ = ("api", "path")
+
     def __init__(self, path: str, api: Api) -> None:
         self.path: str = path
         self.api: Api = api
@@ -109,9 +172,43 @@ class Path:
     def __iter__(self) -> ResponseIter:
         yield from self("print")
 
+    def count(self, *where: str | QueryGen) -> int:
+        """
+        Count rows. Only the number is transferred.
+
+        :param where: Optional query expressions. Same as in Query.where().
+        """
+        return self.select().where(*where).count()
+
+    def exists(self, *where: str | QueryGen) -> bool:
+        """
+        Check if any row exists.
+
+        :param where: Optional query expressions. Same as in Query.where().
+        """
+        return self.select().where(*where).exists()
+
+    def paginate(self, *, page_size: int = 1000, after: str | None = None, prefetch: Api | None = None) -> Paginator:
+        """
+        Read all rows in pages of at most page_size rows.
+
+        :param after: Resume after row with this .id.
+        :param prefetch: Separate connection used to read next page while current one is consumed.
+        """
+        return self.select().paginate(page_size=page_size, after=after, prefetch=prefetch)
+
+    def auto_select(self) -> ResponseIter:
+        """
+        Iterate all rows, asking only for keys which calling code read in previous runs.
+        Same as Query.auto_select().
+        """
+        from librouteros.projection import auto_select
+
+        return auto_select(self.select(), _getframe(1))
+
     def __call__(self, cmd: str, /, **kwargs: ROSType) -> ResponseIter:
         yield from self.api(
-            self.join(cmd).path,
+            join_path(self.path, cmd),
             **kwargs,
         )
 
@@ -119,7 +216,7 @@ class Path:
         """Join current path with one or more path strings."""
         return Path(
             api=self.api,
-            path=pjoin("/", self.path, *path).rstrip("/"),
+            path=join_path(self.path, *path),
         )
 
     def remove(self, *ids: str) -> None:
@@ -177,6 +274,20 @@ class AsyncApi:
         for item in response:
             yield item
 
+    def stream(self, cmd: str, *words: str, maxsize: int = 1000, low_watermark: int | None = None) -> AsyncStream:
+        """
+        Call Api with given command and raw words.
+        Yield each row as soon as it is received. Reading is paused while consumer lags behind.
+
+        :param cmd: Command word. eg. /ip/route/print
+        :param words: Raw api words.
+        :param maxsize: Maximum number of received, not yet consumed sentences.
+        :param low_watermark: Resume reading when this many sentences are waiting. Defaults to half of maxsize.
+        """
+        from librouteros.streaming import AsyncStream
+
+        return AsyncStream(self, cmd, *words, maxsize=maxsize, low_watermark=low_watermark)
+
     async def readSentence(self) -> tuple[str, ReplyDict]:  # noqa N802
         """
         Read one sentence and parse words.
@@ -208,6 +319,26 @@ class AsyncApi:
             raise traps[0]
         return response
 
+    async def batch(self, sentences: Iterable[Sequence[str]]) -> list[BatchResult]:
+        """
+        Send many commands at once and wait for all of them.
+        Same as Api.batch().
+        """
+        tagged: list[tuple[str, ...]] = tag_sentences(sentences)
+        if not tagged:
+            return []
+        await self.protocol.writeSentences(*tagged)
+        batch: Batch = Batch(count=len(tagged))
+        while not batch.done:
+            batch.feed(*await self.protocol.readSentence())
+        return batch.results()
+
+    async def download(self, name: str, destination: str, **kwargs: Any) -> str:
+        """Async version of Api.download()."""
+        from librouteros.transfer import async_download
+
+        return await async_download(self, name, destination, **kwargs)
+
     async def close(self) -> None:
         await self.protocol.close()
 
@@ -221,6 +352,8 @@ class AsyncApi:
 class AsyncPath:
     """Represents absolute command path."""
 
+    __slots__ = ("api", "path")
+
     def __init__(self, path: str, api: AsyncApi) -> None:
         self.path: str = path
         self.api: AsyncApi = api
@@ -238,9 +371,36 @@ class AsyncPath:
         async for response in self("print"):
             yield response
 
+    async def count(self, *where: str | QueryGen) -> int:
+        """
+        Count rows. Only the number is transferred.
+
+        :param where: Optional query expressions. Same as in Query.where().
+        """
+        return await self.select().where(*where).count()
+
+    async def exists(self, *where: str | QueryGen) -> bool:
+        """
+        Check if any row exists.
+
+        :param where: Optional query expressions. Same as in Query.where().
+        """
+        return await self.select().where(*where).exists()
+
+    def paginate(
+        self, *, page_size: int = 1000, after: str | None = None, prefetch: AsyncApi | None = None
+    ) -> AsyncPaginator:
+        """
+        Read all rows in pages of at most page_size rows.
+
+        :param after: Resume after row with this .id.
+        :param prefetch: Separate connection used to read next page while current one is consumed.
+        """
+        return self.select().paginate(page_size=page_size, after=after, prefetch=prefetch)
+
     async def __call__(self, cmd: str, /, **kwargs: ROSType) -> AsyncResponseIter:
         async for response in self.api(
-            self.join(cmd).path,
+            join_path(self.path, cmd),
             **kwargs,
         ):
             yield response
@@ -249,7 +409,7 @@ class AsyncPath:
         """Join current path with one or more path strings."""
         return AsyncPath(
             api=self.api,
-            path=pjoin("/", self.path, *path).rstrip("/"),
+            path=join_path(self.path, *path),
         )
 
     async def remove(self, *ids: str) -> None:
@@ -0,0 +1,77 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from librouteros.exceptions import MultiTrapError, ProtocolError, TrapError
+from librouteros.protocol import parse_word
+from librouteros.types import ReplyDict, Response
+
+TAG_PREFIX: str = ".tag="
+# Response of one command or exception raised by it.
+BatchResult = Response | ProtocolError
+
+
+def tag_sentences(sentences: Iterable[Sequence[str]]) -> list[tuple[str, ...]]:
+    """Append .tag word with sentence index to each sentence."""
+    return [(*sentence, f"{TAG_PREFIX}{index}") for index, sentence in enumerate(sentences)]
+
+
+def split_tag(words: Sequence[str]) -> tuple[str | None, tuple[str, ...]]:
+    """
+    Remove .tag word from words.
+
+    :returns: Tag value (None if sentence is not tagged), remaining words.
+    """
+    tag: str | None = None
+    rest: list[str] = []
+    for word in words:
+        if word.startswith(TAG_PREFIX):
+            tag = word[len(TAG_PREFIX) :]
+        else:
+            rest.append(word)
+    return tag, tuple(rest)
+
+
+class Batch:
+    """
+    Demultiplex replies to tagged sentences.
+
+    :param count: Number of sent sentences. Tags are their indexes.
+    """
+
+    def __init__(self, count: int) -> None:
+        self.responses: list[Response] = [[] for _ in range(count)]
+        self.traps: list[list[TrapError]] = [[] for _ in range(count)]
+        self.pending: set[str] = {str(index) for index in range(count)}
+
+    def feed(self, reply_word: str, words: Sequence[str]) -> None:
+        """Assign one received sentence to command it belongs to. Untagged or unknown sentences are ignored."""
+        tag, rest = split_tag(words)
+        if tag is None or not tag.isdigit() or int(tag) >= len(self.responses):
+            return
+        index: int = int(tag)
+        row: ReplyDict = dict(parse_word(word) for word in rest)
+        if reply_word == "!trap":
+            self.traps[index].append(TrapError(**row))  # type: ignore[arg-type]  # must be correct types
+        elif reply_word in ("!re", "!done") and row:
+            self.responses[index].append(row)
+        if reply_word == "!done":
+            self.pending.discard(tag)
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def results(self) -> list[BatchResult]:
+        """Response of each command in order in which they were sent. Failed ones are replaced by exception."""
+        results: list[BatchResult] = []
+        for response, traps in zip(self.responses, self.traps, strict=True):
+            if len(traps) > 1:
+                results.append(MultiTrapError(*traps))
+            elif len(traps) == 1:
+                results.append(traps[0])
+            else:
+                results.append(response)
+        return results
@@ -0,0 +1,45 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import cache
+
+# Undecodable bytes are dropped. Kept as default for backwards compatibility.
+ERRORS: str = "ignore"
+ASCII: bytes = bytes(range(0x80))
+
+
+@cache
+def ascii_compatible(encoding: str) -> bool:
+    """True if ASCII bytes decode to the same characters. e.g. UTF-8, latin-1, cp1250."""
+    try:
+        return ASCII.decode(encoding) == ASCII.decode("ascii")
+    except UnicodeDecodeError:
+        return False
+
+
+def decode_text(words: Sequence[bytes], encoding: str, errors: str = ERRORS) -> tuple[str, ...]:
+    """
+    Decode all words of one sentence.
+
+    Most sentences are plain ASCII. If whole sentence is ASCII and encoding is ASCII compatible,
+    every word is decoded with bytes.decode() defaults, which is the fastest way to decode in CPython.
+    Otherwise each word is decoded with given encoding and error handler.
+
+    :param words: Raw words.
+    :param encoding: Any codec known to Python.
+    :param errors: Error handler. "ignore" drops undecodable bytes, "strict" raises UnicodeDecodeError,
+                   "surrogateescape" keeps them. Words decoded with surrogateescape encode back to the same bytes.
+    """
+    if b"".join(words).isascii() and ascii_compatible(encoding):
+        return tuple(map(bytes.decode, words))
+    return tuple([word.decode(encoding, errors) for word in words])
+
+
+def encode_errors(errors: str) -> str:
+    """
+    Error handler used for encoding.
+    Only surrogateescape is kept. Any other handler could silently alter written data, so it raises instead.
+    """
+    return errors if errors == "surrogateescape" else "strict"
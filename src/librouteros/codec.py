@@ -0,0 +1,134 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from struct import Struct
+from typing import Final
+
+from librouteros.exceptions import ProtocolError
+
+# big is network byte order
+API_BYTE_ORDER: Final = "big"
+UINT16: Struct = Struct(">H")
+UINT32: Struct = Struct(">I")
+
+# Lengths < 0x80 are encoded as a single byte.
+SMALL_LENGTHS: tuple[bytes, ...] = tuple(bytes((length,)) for length in range(0x80))
+# Number of bytes following first (control) byte of encoded length. -1 marks invalid control byte.
+EXTRA_BYTES: tuple[int, ...] = tuple(
+    0 if byte < 0x80 else 1 if byte < 0xC0 else 2 if byte < 0xE0 else 3 if byte < 0xF0 else -1 for byte in range(256)
+)
+
+
+def encode_length(length: int) -> bytes:
+    """
+    Encode given length in mikrotik api format.
+
+    :param length: Integer < 0x10000000
+    :returns: Encoded length
+    """
+    if 0 <= length < 0x80:
+        return SMALL_LENGTHS[length]
+    elif 0x80 <= length < 0x4000:
+        return UINT16.pack(length | 0x8000)
+    elif 0x4000 <= length < 0x200000:
+        return UINT32.pack(length | 0xC00000)[1:]
+    elif 0x200000 <= length < 0x10000000:
+        return UINT32.pack(length | 0xE0000000)
+    raise ProtocolError(f"Unable to encode length {length!r}")
+
+
+def decode_length(length: bytes | bytearray) -> int:
+    """
+    Decode api length based on given bytes.
+
+    :param length: Bytes string to decode
+    :return: Decoded length
+    """
+    ctl_byte: int = length[0]
+
+    if ctl_byte < 0x80:
+        return ctl_byte
+    elif ctl_byte < 0xC0:
+        return UINT16.unpack_from(length)[0] ^ 0x8000
+    elif ctl_byte < 0xE0:
+        return (ctl_byte & 0x1F) << 16 | UINT16.unpack_from(length, 1)[0]
+    elif ctl_byte < 0xF0:
+        return UINT32.unpack_from(length)[0] ^ 0xE0000000
+    raise ProtocolError(f"Unable to decode length {bytes(length)!r}")
+
+
+def determine_length(length: bytes) -> int:
+    """
+    Given first read byte, determine how many more bytes
+    needs to be known in order to get fully encoded length.
+
+    :param length: First read byte.
+    :return: How many bytes to read.
+    """
+    extra: int = EXTRA_BYTES[length[0]]
+    if extra < 0:
+        raise ProtocolError(f"Unknown controll byte {bytes(length)!r}")
+    return extra
+
+
+def decode_sentence(data: bytes | bytearray, offset: int = 0) -> tuple[list[bytes], int] | None:
+    """
+    Decode every word of one sentence in a single pass over data.
+
+    :param data: Buffer with encoded words.
+    :param offset: Position in data where sentence starts.
+    :returns: Raw words and position right after sentence end (NULL byte).
+              None if data does not hold whole sentence yet.
+    """
+    words: list[bytes] = []
+    position, complete = decode_words(data, offset, words)
+    return (words, position) if complete else None
+
+
+def decode_words(data: bytes | bytearray, offset: int, words: list[bytes]) -> tuple[int, bool]:
+    """
+    Decode complete words until sentence end or until incomplete word.
+    Buffer is indexed directly. This is faster than going through a memoryview.
+
+    :param data: Buffer with encoded words.
+    :param offset: Position in data of first word to decode.
+    :param words: Decoded words are appended to it.
+    :returns: Position right after last decoded word (or after NULL byte),
+              True if sentence end was reached.
+    """
+    unpack16 = UINT16.unpack_from
+    unpack32 = UINT32.unpack_from
+    end: int = len(data)
+    append = words.append
+    position: int = offset
+    while position < end:
+        ctl_byte: int = data[position]
+        if ctl_byte < 0x80:
+            if ctl_byte == 0:
+                return position + 1, True
+            length: int = ctl_byte
+            start: int = position + 1
+        elif ctl_byte < 0xC0:
+            if position + 2 > end:
+                break
+            length = unpack16(data, position)[0] ^ 0x8000
+            start = position + 2
+        elif ctl_byte < 0xE0:
+            if position + 3 > end:
+                break
+            length = (ctl_byte & 0x1F) << 16 | unpack16(data, position + 1)[0]
+            start = position + 3
+        elif ctl_byte < 0xF0:
+            if position + 4 > end:
+                break
+            length = unpack32(data, position)[0] ^ 0xE0000000
+            start = position + 4
+        else:
+            raise ProtocolError(f"Unknown controll byte {bytes((ctl_byte,))!r}")
+        stop: int = start + length
+        if stop > end:
+            break
+        append(data[start:stop])  # type: ignore[arg-type]  # bytearray words decode the same way
+        position = stop
+    return position, False
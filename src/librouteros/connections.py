@@ -1,12 +1,48 @@
 # -*- coding: UTF-8 -*-
 
-from asyncio import StreamReader, StreamWriter
-from socket import socket
+from __future__ import annotations
 
-from librouteros.exceptions import ConnectionClosed
+from collections.abc import Awaitable, Iterator
+from contextlib import suppress
+from struct import Struct
+from time import monotonic
+from time import sleep as blocking_sleep
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple, Protocol, TypeVar
+
+from librouteros.exceptions import ConnectionClosed, ProtocolError
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader, StreamWriter
+    from socket import socket
+
+T = TypeVar("T")
+
+
+class Transport(Protocol):
+    def write(self, data: bytes) -> None: ...
+
+    def read(self, length: int) -> bytes: ...
+
+    def close(self) -> None: ...
+
+
+class AsyncTransport(Protocol):
+    async def write(self, data: bytes) -> None: ...
+
+    async def read(self, length: int) -> bytes: ...
+
+    async def close(self) -> None: ...
+
+    def pause_reading(self) -> None: ...
+
+    def resume_reading(self) -> None: ...
+
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T: ...
 
 
 class SocketTransport:
+    __slots__ = ("sock",)
+
     def __init__(self, sock: socket) -> None:
         self.sock: socket = sock
 
@@ -31,10 +67,17 @@ class SocketTransport:
         return bytes(data)
 
     def close(self) -> None:
+        from socket import SHUT_RDWR
+
+        # Shutdown wakes up any thread blocked in recv(). close() alone does not.
+        with suppress(OSError):
+            self.sock.shutdown(SHUT_RDWR)
         self.sock.close()
 
 
 class AsyncSocketTransport:
+    __slots__ = ("reader", "writer")
+
     def __init__(self, reader: StreamReader, writer: StreamWriter) -> None:
         self.reader: StreamReader = reader
         self.writer: StreamWriter = writer
@@ -63,3 +106,234 @@ class AsyncSocketTransport:
     async def close(self) -> None:
         self.writer.close()
         await self.writer.wait_closed()
+
+    def pause_reading(self) -> None:
+        """Stop receiving from socket. Already buffered data can still be read."""
+        transport = self.writer.transport
+        if transport.is_reading():  # type: ignore[attr-defined]  # socket transport is also a read transport
+            transport.pause_reading()  # type: ignore[attr-defined]
+
+    def resume_reading(self) -> None:
+        transport = self.writer.transport
+        if not transport.is_closing() and not transport.is_reading():  # type: ignore[attr-defined]
+            transport.resume_reading()  # type: ignore[attr-defined]
+
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T:
+        """
+        Await with timeout.
+
+        :throws asyncio.TimeoutError: If timeout expires.
+        """
+        from asyncio import wait_for
+
+        return await wait_for(awaitable, timeout)
+
+
+# direction, seconds since start of recording, data length
+RECORD_HEADER: Struct = Struct(">cdI")
+READ: bytes = b"r"
+WRITE: bytes = b"w"
+# Consecutive reads within this many seconds are stored as one record.
+COALESCE_WINDOW: float = 0.001
+
+
+class Record(NamedTuple):
+    direction: bytes
+    elapsed: float
+    data: bytes
+
+
+def read_records(file: BinaryIO) -> Iterator[Record]:
+    """Read every record from trace file."""
+    while header := file.read(RECORD_HEADER.size):
+        direction, elapsed, length = RECORD_HEADER.unpack(header)
+        yield Record(direction=direction, elapsed=elapsed, data=file.read(length))
+
+
+class TraceWriter:
+    """Write records to trace file. Consecutive reads are merged into one record."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file: BinaryIO = file
+        self.started: float = monotonic()
+        self.pending: Record | None = None
+
+    def add(self, direction: bytes, data: bytes) -> None:
+        elapsed: float = monotonic() - self.started
+        pending = self.pending
+        if (
+            pending is not None
+            and direction == READ == pending.direction
+            and elapsed - pending.elapsed < COALESCE_WINDOW
+        ):
+            self.pending = pending._replace(data=pending.data + data)
+            return
+        self.flush()
+        self.pending = Record(direction=direction, elapsed=elapsed, data=data)
+
+    def flush(self) -> None:
+        if self.pending is not None:
+            self.file.write(RECORD_HEADER.pack(self.pending.direction, self.pending.elapsed, len(self.pending.data)))
+            self.file.write(self.pending.data)
+            self.pending = None
+        self.file.flush()
+
+
+class Replay:
+    """
+    Serve recorded reads. Wait for original timing if requested.
+
+    :param file: Trace file.
+    :param timing: Preserve original timing. Else replay at full speed.
+    :param strict: Raise ProtocolError when written data differs from recorded one.
+    """
+
+    def __init__(self, file: BinaryIO, *, timing: bool = False, strict: bool = False) -> None:
+        self.records: Iterator[Record] = read_records(file)
+        self.timing: bool = timing
+        self.strict: bool = strict
+        self.started: float = monotonic()
+        self.buffer: bytearray = bytearray()
+        self.expected: bytearray = bytearray()
+
+    def next_record(self) -> float:
+        """Load next record. Return number of seconds to wait for it."""
+        record: Record | None = next(self.records, None)
+        if record is None:
+            raise ConnectionClosed("Recorded session ended.")
+        if record.direction == WRITE:
+            # Only strict replay compares written data. Otherwise it is dropped, long replays would keep all of it.
+            if self.strict:
+                self.expected += record.data
+            return 0
+        self.buffer += record.data
+        return max(0.0, record.elapsed - (monotonic() - self.started)) if self.timing else 0
+
+    def take(self, length: int) -> bytes:
+        data: bytes = bytes(self.buffer[:length])
+        del self.buffer[:length]
+        return data
+
+    def check(self, data: bytes) -> None:
+        if not self.strict:
+            return
+        try:
+            while len(self.expected) < len(data):
+                self.next_record()
+        except ConnectionClosed:
+            pass
+        if self.expected[: len(data)] != data:
+            raise ProtocolError(f"Written data {data!r} differs from recorded one.")
+        del self.expected[: len(data)]
+
+
+class RecordingTransport:
+    """
+    Pass every call to wrapped transport. Store read and written bytes in trace file.
+
+    :param transport: Transport to wrap.
+    :param file: File opened in binary write mode.
+    """
+
+    def __init__(self, transport: Transport, file: BinaryIO) -> None:
+        self.transport: Transport = transport
+        self.trace: TraceWriter = TraceWriter(file)
+
+    def write(self, data: bytes) -> None:
+        self.trace.add(WRITE, data)
+        self.transport.write(data)
+
+    def read(self, length: int) -> bytes:
+        data: bytes = self.transport.read(length)
+        self.trace.add(READ, data)
+        return data
+
+    def close(self) -> None:
+        self.trace.flush()
+        self.transport.close()
+
+
+class ReplayTransport:
+    """
+    Replay session recorded with RecordingTransport. No network is used.
+
+    :param file: File opened in binary read mode.
+    :param timing: Preserve original timing. Else replay at full speed.
+    :param strict: Raise ProtocolError when written data differs from recorded one.
+    """
+
+    def __init__(self, file: BinaryIO, *, timing: bool = False, strict: bool = False) -> None:
+        self.replay: Replay = Replay(file, timing=timing, strict=strict)
+
+    def write(self, data: bytes) -> None:
+        self.replay.check(data)
+
+    def read(self, length: int) -> bytes:
+        while len(self.replay.buffer) < length:
+            if delay := self.replay.next_record():
+                blocking_sleep(delay)
+        return self.replay.take(length)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncRecordingTransport:
+    """Async version of RecordingTransport."""
+
+    def __init__(self, transport: AsyncTransport, file: BinaryIO) -> None:
+        self.transport: AsyncTransport = transport
+        self.trace: TraceWriter = TraceWriter(file)
+
+    async def write(self, data: bytes) -> None:
+        self.trace.add(WRITE, data)
+        await self.transport.write(data)
+
+    async def read(self, length: int) -> bytes:
+        data: bytes = await self.transport.read(length)
+        self.trace.add(READ, data)
+        return data
+
+    async def close(self) -> None:
+        self.trace.flush()
+        await self.transport.close()
+
+    def pause_reading(self) -> None:
+        self.transport.pause_reading()
+
+    def resume_reading(self) -> None:
+        self.transport.resume_reading()
+
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T:
+        return await self.transport.wait_for(awaitable, timeout)
+
+
+class AsyncReplayTransport:
+    """Async version of ReplayTransport."""
+
+    def __init__(self, file: BinaryIO, *, timing: bool = False, strict: bool = False) -> None:
+        self.replay: Replay = Replay(file, timing=timing, strict=strict)
+
+    async def write(self, data: bytes) -> None:
+        self.replay.check(data)
+
+    async def read(self, length: int) -> bytes:
+        from asyncio import sleep
+
+        while len(self.replay.buffer) < length:
+            if delay := self.replay.next_record():
+                await sleep(delay)
+        return self.replay.take(length)
+
+    async def close(self) -> None:
+        pass
+
+    def pause_reading(self) -> None:
+        pass
+
+    def resume_reading(self) -> None:
+        pass
+
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T:
+        # Replayed data is already there. Nothing to time out on.
+        return await awaitable
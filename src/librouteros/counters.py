@@ -0,0 +1,134 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from time import monotonic
+from typing import NamedTuple
+
+from librouteros.api import Path
+from librouteros.types import Response
+
+COUNTERS: tuple[str, ...] = ("rx-byte", "tx-byte", "rx-packet", "tx-packet")
+# RouterOS counters are unsigned 64 bit integers.
+WRAP: int = 2**64
+
+
+class Sample(NamedTuple):
+    """
+    Change of counters of one interface since previous poll.
+
+    :param id: Interface .id
+    :param name: Interface name.
+    :param interval: Seconds since previous poll.
+    :param deltas: Change of each counter. Same order as counters passed to CounterPoller.
+    :param rates: Change of each counter per second.
+    """
+
+    id: str
+    name: str
+    interval: float
+    deltas: tuple[int, ...]
+    rates: tuple[float, ...]
+
+
+def deltas(current: array[int], previous: array[int], wrap: int) -> list[int]:
+    """
+    Compute counter deltas for whole column at once.
+
+    Smaller current value means counter wrapped. If wrapped delta is implausible
+    (more than half of counter range), counter was reset and current value is the delta.
+    """
+    half: int = wrap // 2
+    return [
+        cur - prev if cur >= prev else (cur + wrap - prev if cur + wrap - prev <= half else cur)
+        for cur, prev in zip(current, previous, strict=True)
+    ]
+
+
+class CounterPoller:
+    """
+    Poll interface counters (print stats). Return only interfaces whose counters changed.
+
+    Previous counters are kept in compact arrays, one per counter, indexed in order of received rows.
+    Deltas are computed column by column, not with per row dict math.
+
+    .. code-block:: python
+
+        poller = CounterPoller(api.path("interface"))
+        while True:
+            for sample in poller.poll():
+                rx_bps = sample.rates[0] * 8
+            time.sleep(5)
+
+    :param path: Path printed with stats. e.g. api.path('interface')
+    :param counters: Counter names to compute deltas of.
+    :param wrap: Counter range. Use 2**32 for 32 bit counters.
+    """
+
+    def __init__(self, path: Path, *, counters: Sequence[str] = COUNTERS, wrap: int = WRAP) -> None:
+        self.path: Path = path
+        self.counters: tuple[str, ...] = tuple(counters)
+        self.wrap: int = wrap
+        self.cmd: str = str(path.join("print"))
+        self.words: tuple[str, ...] = ("=stats=", f"=.proplist=.id,name,{','.join(self.counters)}")
+        self.ids: tuple[str, ...] = ()
+        self.names: tuple[str, ...] = ()
+        self.columns: list[array[int]] = []
+        self.polled: float | None = None
+
+    def read(self) -> Response:
+        return list(self.path.api.rawCmd(self.cmd, *self.words))
+
+    def poll(self) -> list[Sample]:
+        """
+        Read counters and compare them with previous ones.
+        First poll only stores counters. Interfaces seen for the first time are reported in next poll.
+        """
+        rows: Response = self.read()
+        now: float = monotonic()
+        return self.update(rows, now)
+
+    def update(self, rows: Response, now: float) -> list[Sample]:
+        ids: tuple[str, ...] = tuple(str(row[".id"]) for row in rows)
+        names: tuple[str, ...] = tuple(str(row.get("name", "")) for row in rows)
+        columns: list[array[int]] = [array("Q", (int(row.get(name, 0)) for row in rows)) for name in self.counters]
+        previous: list[array[int]] = self.previous_columns(ids, columns)
+        interval: float = now - self.polled if self.polled is not None else 0.0
+        self.ids, self.names, self.columns, self.polled = ids, names, columns, now
+        if interval <= 0:
+            return []
+
+        changes: list[list[int]] = [
+            deltas(current, old, self.wrap) for current, old in zip(columns, previous, strict=True)
+        ]
+        samples: list[Sample] = []
+        for index, row_deltas in enumerate(zip(*changes, strict=True)):
+            if any(row_deltas):
+                samples.append(
+                    Sample(
+                        id=ids[index],
+                        name=names[index],
+                        interval=interval,
+                        deltas=row_deltas,
+                        rates=tuple(delta / interval for delta in row_deltas),
+                    )
+                )
+        return samples
+
+    def previous_columns(self, ids: tuple[str, ...], columns: list[array[int]]) -> list[array[int]]:
+        """
+        Previous counters aligned with current rows.
+        Rows without previous counters (new interfaces) get current ones, so their deltas are 0.
+        """
+        if ids == self.ids:
+            return self.columns
+        slots: dict[str, int] = {row_id: index for index, row_id in enumerate(self.ids)}
+        positions: list[int] = [slots.get(row_id, -1) for row_id in ids]
+        return [
+            array(
+                "Q", (old[position] if position >= 0 else cur for position, cur in zip(positions, current, strict=True))
+            )
+            for old, current in zip(self.columns or [array("Q")] * len(columns), columns, strict=True)
+        ]
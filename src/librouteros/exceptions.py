@@ -53,3 +53,20 @@ class MultiTrapError(ProtocolError):
 
     def __str__(self) -> str:
         return ", ".join(str(trap) for trap in self.traps)
+
+
+class FleetError(LibRouterosError):
+    """
+    Exception raised when one or more hosts failed during fleet wide call.
+
+    :param errors: Mapping of host to exception raised for that host.
+    :param results: Mapping of host to result for every host that succeeded.
+    """
+
+    def __init__(self, errors: dict[str, Exception], results: dict[str, object]) -> None:
+        self.errors: dict[str, Exception] = errors
+        self.results: dict[str, object] = results
+        super().__init__()
+
+    def __str__(self) -> str:
+        return ", ".join(f"{host}: {error!r}" for host, error in self.errors.items())
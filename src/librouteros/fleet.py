@@ -0,0 +1,120 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from threading import Lock
+from typing import Any, NamedTuple, TypeVar
+
+from librouteros.api import Api
+from librouteros.exceptions import ConnectionClosed, FatalError, FleetError
+from librouteros.types import Response, ROSType
+
+T = TypeVar("T")
+
+# Exceptions after which cached connection can not be used any more.
+CONNECTION_ERRORS: tuple[type[Exception], ...] = (ConnectionClosed, FatalError, OSError)
+
+
+class HostResult(NamedTuple):
+    host: str
+    result: Any
+    error: Exception | None
+
+
+class Fleet:
+    """
+    Run callables against many routers in a bounded thread pool.
+
+    Each host gets one cached Api instance. Only one thread at a time may use it.
+
+    :param connect: Callable returning logged in Api for given host.
+                    e.g. functools.partial(librouteros.connect, username='admin', password='abc')
+    :param max_workers: Maximum number of concurrently running threads.
+    """
+
+    def __init__(self, connect: Callable[[str], Api], *, max_workers: int = 16) -> None:
+        self.connect: Callable[[str], Api] = connect
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="librouteros",
+        )
+        self.connections: dict[str, Api] = {}
+        self.locks: dict[str, Lock] = {}
+        self.lock: Lock = Lock()
+
+    def __enter__(self) -> Fleet:  # noqa PYI034
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def map(self, func: Callable[[Api], T], hosts: Iterable[str], *, ordered: bool = True) -> Iterator[HostResult]:
+        """
+        Call func with each host Api.
+        Yield HostResult for each host.
+
+        :param func: Callable which receives Api as only argument.
+        :param hosts: Hosts to run func against.
+        :param ordered: If True, yield results in hosts order. Else yield as soon as they complete.
+        """
+        futures: dict[Future[T], str] = {self.executor.submit(self.run, host, func): host for host in hosts}
+        pending: Iterable[Future[T]] = futures if ordered else as_completed(futures)
+        for future in pending:
+            host = futures[future]
+            try:
+                yield HostResult(host=host, result=future.result(), error=None)
+            except Exception as error:  # noqa BLE001  # reported to caller
+                yield HostResult(host=host, result=None, error=error)
+
+    def gather(self, func: Callable[[Api], T], hosts: Iterable[str]) -> dict[str, T]:
+        """
+        Call func with each host Api and wait for all of them.
+
+        :returns: Mapping of host to func result.
+        :throws FleetError: If func failed for any host. Contains all errors and partial results.
+        """
+        results: dict[str, T] = {}
+        errors: dict[str, Exception] = {}
+        for item in self.map(func, hosts):
+            if item.error is not None:
+                errors[item.host] = item.error
+            else:
+                results[item.host] = item.result
+        if errors:
+            raise FleetError(errors=errors, results=results)  # type: ignore[arg-type]  # invariant dict
+        return results
+
+    def __call__(self, hosts: Iterable[str], cmd: str, /, **kwargs: ROSType) -> dict[str, Response]:
+        """
+        Call given command on every host.
+
+        :param hosts: Hosts to run command on.
+        :param cmd: Command word. eg. /ip/address/print
+        :param kwargs: Dictionary with optional arguments.
+        :throws FleetError: If command failed on any host.
+        """
+        return self.gather(lambda api: list(api(cmd, **kwargs)), hosts)
+
+    def run(self, host: str, func: Callable[[Api], T]) -> T:
+        """Call func with cached Api for given host. Reconnect if previous connection was broken."""
+        with self.lock:
+            lock = self.locks.setdefault(host, Lock())
+        with lock:
+            api = self.connections.get(host)
+            if api is None:
+                api = self.connections[host] = self.connect(host)
+            try:
+                return func(api)
+            except CONNECTION_ERRORS:
+                del self.connections[host]
+                api.close()
+                raise
+
+    def close(self) -> None:
+        """Wait for running calls and close every cached connection."""
+        self.executor.shutdown(wait=True)
+        for api in self.connections.values():
+            api.close()
+        self.connections.clear()
@@ -1,13 +1,14 @@
 # -*- coding: UTF-8 -*-
 
-from binascii import hexlify, unhexlify
-from hashlib import md5
-
 from librouteros.api import Api, AsyncApi
 from librouteros.types import ReplyDict, ResponseIter
 
 
 def encode_password(token: str, password: str) -> str:
+    # Only pre 6.43 login needs these. Do not import them when not used.
+    from binascii import hexlify, unhexlify
+    from hashlib import md5
+
     token_bytes: bytes = token.encode("ascii", "strict")
     token_bytes = unhexlify(token)
     password_bytes: bytes = password.encode("ascii", "strict")
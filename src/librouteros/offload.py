@@ -0,0 +1,124 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future
+from contextlib import suppress
+from queue import Empty, Queue
+from threading import Event, Thread
+
+from librouteros.api import Api
+from librouteros.charset import ERRORS, decode_text
+from librouteros.exceptions import MultiTrapError, TrapError
+from librouteros.protocol import ApiProtocol, parse_word
+from librouteros.types import ReplyDict, ResponseIter
+
+RawSentence = tuple[str, tuple[bytes, ...]]
+DecodedBatch = list[tuple[str, ReplyDict]]
+# Items passed from reader thread to consumer. None marks end of response.
+Pending = Future[DecodedBatch] | BaseException | None
+
+
+def decode_batch(batch: list[RawSentence], encoding: str, errors: str = ERRORS) -> DecodedBatch:
+    """
+    Decode and parse words of each raw sentence.
+    Must stay a module level function in order to be picklable for process pools.
+
+    :param batch: Reply word, raw words pairs.
+    :param encoding: Encoding used to decode each word.
+    :param errors: Error handler used to decode each word.
+    :returns: Reply word, dict with attribute words.
+    """
+    return [
+        (reply_word, dict(parse_word(word) for word in decode_text(words, encoding, errors)))
+        for reply_word, words in batch
+    ]
+
+
+def offload(
+    api: Api,
+    executor: Executor,
+    cmd: str,
+    *words: str,
+    batch_size: int = 1000,
+    max_pending: int = 8,
+) -> ResponseIter:
+    """
+    Call Api with given command and raw words. Decode response in executor.
+    Yield each row in order in which it was received.
+
+    Reader thread only frames sentences and sends batches of them to executor
+    (e.g. ProcessPoolExecutor) for decoding. Consumer receives rows as soon as each batch is decoded.
+
+    :param api: Api instance. Must not be used by anything else until response is consumed.
+    :param executor: Executor used to decode batches.
+    :param cmd: Command word. eg. /ip/route/print
+    :param words: Raw api words.
+    :param batch_size: Number of sentences sent to executor at once.
+    :param max_pending: Maximum number of batches being decoded at once.
+    :throws TrapError: If one !trap is received.
+    :throws MultiTrapError: If > 1 !trap is received.
+    """
+    api.protocol.writeSentence(cmd, *words)
+    pending: Queue[Pending] = Queue(maxsize=max_pending)
+    stop: Event = Event()
+    reader: Thread = Thread(
+        target=read_batches,
+        kwargs={
+            "protocol": api.protocol,
+            "executor": executor,
+            "pending": pending,
+            "stop": stop,
+            "batch_size": batch_size,
+        },
+        name="librouteros-reader",
+        daemon=True,
+    )
+    reader.start()
+    traps: list[TrapError] = []
+    try:
+        while (item := pending.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            for reply_word, row in item.result():
+                if reply_word == "!trap":
+                    traps.append(TrapError(**row))  # type: ignore[arg-type]  # must be correct types
+                elif row:
+                    yield row
+    finally:
+        # Let reader drain the rest of response, even when consumer stopped early.
+        stop.set()
+        while reader.is_alive():
+            with suppress(Empty):
+                pending.get(timeout=0.1)
+        reader.join()
+
+    if len(traps) > 1:
+        raise MultiTrapError(*traps)
+    if len(traps) == 1:
+        raise traps[0]
+
+
+def read_batches(
+    protocol: ApiProtocol,
+    executor: Executor,
+    pending: Queue[Pending],
+    stop: Event,
+    batch_size: int,
+) -> None:
+    """Read raw sentences untill !done is received. Submit each batch for decoding."""
+    batch: list[RawSentence] = []
+    reply_word: str | None = None
+    try:
+        while reply_word != "!done":
+            reply_word, words = protocol.readRawSentence()
+            if stop.is_set() or reply_word not in ("!re", "!done", "!trap"):
+                continue
+            batch.append((reply_word, words))
+            if len(batch) == batch_size or reply_word == "!done":
+                pending.put(executor.submit(decode_batch, batch, protocol.encoding, protocol.errors))
+                batch = []
+    except BaseException as error:  # noqa BLE001  # reraised in consumer thread
+        pending.put(error)
+        return
+    pending.put(None)
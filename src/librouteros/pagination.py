@@ -0,0 +1,181 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, TypeVar
+
+from librouteros.query import Key, Not
+from librouteros.types import AsyncResponseIter, ReplyDict, Response, ResponseIter, ROSType
+
+if TYPE_CHECKING:
+    from asyncio import Task
+    from concurrent.futures import Future
+
+    from librouteros.api import Api, AsyncApi
+    from librouteros.query import AsyncQuery, Query
+
+T = TypeVar("T")
+
+ID: Key = Key(".id")
+
+
+def id_number(value: str) -> int:
+    """Convert .id (e.g. *1A) to integer."""
+    return int(value.lstrip("*"), 16)
+
+
+def row_id(row: ReplyDict) -> int:
+    return id_number(str(row[".id"]))
+
+
+def id_string(number: int) -> str:
+    """Convert integer back to .id (e.g. 26 to *1A)."""
+    return f"*{number:X}"
+
+
+def ranges(ids: Sequence[T], page_size: int) -> list[tuple[T, T]]:
+    """Split sorted ids into (first, last) pairs. Each pair covers at most page_size ids."""
+    return [(ids[start], ids[min(start + page_size, len(ids)) - 1]) for start in range(0, len(ids), page_size)]
+
+
+class Pages:
+    """Compose words used by paginators."""
+
+    def __init__(self, keys: Sequence[Key], query: Sequence[str], page_size: int, after: str | None) -> None:
+        self.keys: Sequence[Key] = keys
+        self.query: Sequence[str] = query
+        self.page_size: int = page_size
+        self.last_id: str | None = after
+
+    def ids_words(self) -> tuple[str, ...]:
+        """Words selecting only .id of every row after last seen one."""
+        after: tuple[str, ...] = tuple(ID > self.last_id) if self.last_id is not None else ()
+        return ("=.proplist=.id", *self.query, *after)
+
+    def page_words(self, first: int, last: int) -> tuple[str, ...]:
+        """Words selecting rows with .id in [first, last] range."""
+        proplist: tuple[str, ...] = ()
+        if len(self.keys) > 0:
+            names: list[str] = [str(key) for key in self.keys]
+            if ".id" not in names:
+                names.append(".id")
+            proplist = (f"=.proplist={','.join(names)}",)
+        # Every row has .id. Plain negations are enough, no need for <= and >= checking presence.
+        return (*proplist, *self.query, *Not(ID < id_string(first)), *Not(ID > id_string(last)))
+
+    def consume(self, rows: Response) -> ResponseIter:
+        """Yield each row and remember its .id as last seen one."""
+        for row in rows:
+            self.last_id = str(row[".id"])
+            yield row
+
+
+def sorted_ids(ids: Iterable[ROSType]) -> array[int]:
+    """
+    Sorted .id numbers. Kept as 8 byte integers, since all of them are held until last page is read.
+    e.g. 2 million rows take 16MB instead of over 100MB as list of strings.
+    """
+    return array("Q", sorted(id_number(str(row_id)) for row_id in ids))
+
+
+class Paginator(Pages):
+    """
+    Iterate over big table in pages.
+
+    At first only .id of every matching row is read. After that, rows are read in pages using .id range queries.
+    Rows are yielded in ascending .id order. last_id is the .id of last yielded row.
+    Pass it as after to new Paginator in order to resume.
+
+    Next page is read when current one is consumed, so api may be used inside the loop.
+    With prefetch, next page is read in background thread with that connection while current one is consumed.
+    It must not be used by anything else at the same time.
+
+    :param query: Query to paginate.
+    :param page_size: Maximum number of rows in one page.
+    :param after: Only rows with .id greater than this one are read.
+    :param prefetch: Separate connection (or ThreadSafeApi) used to read next page in background.
+    """
+
+    def __init__(
+        self, query: Query, *, page_size: int = 1000, after: str | None = None, prefetch: Api | None = None
+    ) -> None:
+        super().__init__(keys=query.keys, query=query.query, page_size=page_size, after=after)
+        self.api: Api = query.api
+        self.prefetch: Api | None = prefetch
+        self.cmd: str = str(query.path.join("print"))
+
+    def ids(self) -> array[int]:
+        return sorted_ids(row[".id"] for row in self.api.rawCmd(self.cmd, *self.ids_words()))
+
+    def page(self, api: Api, first: int, last: int) -> Response:
+        return sorted(api.rawCmd(self.cmd, *self.page_words(first, last)), key=row_id)
+
+    def __iter__(self) -> ResponseIter:
+        pages: list[tuple[int, int]] = ranges(self.ids(), self.page_size)
+        if self.prefetch is None:
+            for pair in pages:
+                yield from self.consume(self.page(self.api, *pair))
+        elif pages:
+            yield from self.prefetched(self.prefetch, pages)
+
+    def prefetched(self, api: Api, pages: list[tuple[int, int]]) -> ResponseIter:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Exiting executor waits for prefetched page. Connection is left in usable state.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="librouteros") as executor:
+            pending: Future[Response] = executor.submit(self.page, api, *pages[0])
+            for pair in pages[1:]:
+                rows: Response = pending.result()
+                pending = executor.submit(self.page, api, *pair)
+                yield from self.consume(rows)
+            yield from self.consume(pending.result())
+
+
+class AsyncPaginator(Pages):
+    """
+    Async version of Paginator.
+    With prefetch, next page is read in separate task with that connection while current one is consumed.
+    """
+
+    def __init__(
+        self, query: AsyncQuery, *, page_size: int = 1000, after: str | None = None, prefetch: AsyncApi | None = None
+    ) -> None:
+        super().__init__(keys=query.keys, query=query.query, page_size=page_size, after=after)
+        self.api: AsyncApi = query.api
+        self.prefetch: AsyncApi | None = prefetch
+        self.cmd: str = str(query.path.join("print"))
+
+    async def ids(self) -> array[int]:
+        return sorted_ids([row[".id"] async for row in self.api.rawCmd(self.cmd, *self.ids_words())])
+
+    async def page(self, api: AsyncApi, first: int, last: int) -> Response:
+        return sorted([row async for row in api.rawCmd(self.cmd, *self.page_words(first, last))], key=row_id)
+
+    async def __aiter__(self) -> AsyncResponseIter:
+        pages: list[tuple[int, int]] = ranges(await self.ids(), self.page_size)
+        if self.prefetch is None:
+            for pair in pages:
+                for row in self.consume(await self.page(self.api, *pair)):
+                    yield row
+        elif pages:
+            async for row in self.prefetched(self.prefetch, pages):
+                yield row
+
+    async def prefetched(self, api: AsyncApi, pages: list[tuple[int, int]]) -> AsyncResponseIter:
+        import asyncio
+
+        pending: Task[Response] = asyncio.ensure_future(self.page(api, *pages[0]))
+        try:
+            for pair in pages[1:]:
+                rows: Response = await pending
+                # Only one page may be read at a time.
+                pending = asyncio.ensure_future(self.page(api, *pair))
+                for row in self.consume(rows):
+                    yield row
+            for row in self.consume(await pending):
+                yield row
+        finally:
+            # Wait for prefetched page. Connection is left in usable state.
+            await asyncio.wait((pending,))
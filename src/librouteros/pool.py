@@ -0,0 +1,151 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from librouteros.api import AsyncApi
+from librouteros.exceptions import MultiTrapError, TrapError
+
+if TYPE_CHECKING:
+    from asyncio import Future
+
+# Exceptions after which connection is still usable. Any other one closes it.
+REUSABLE_AFTER: tuple[type[Exception], ...] = (TrapError, MultiTrapError)
+
+
+class FairLimiter:
+    """
+    Semaphore which wakes waiters strictly in order in which they started waiting.
+    Released slot is handed over directly to first waiter, so that newly arriving tasks can not overtake it.
+
+    :param capacity: Maximum number of concurrent holders.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f"Capacity must be >= 1, got {capacity!r}")
+        self.capacity: int = capacity
+        self.in_use: int = 0
+        self.waiters: deque[Future[None]] = deque()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} in_use={self.in_use}/{self.capacity} waiting={len(self.waiters)}>"
+
+    async def acquire(self) -> None:
+        import asyncio
+
+        if self.in_use < self.capacity and not self.waiters:
+            self.in_use += 1
+            return
+        waiter: Future[None] = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was already handed over. Pass it on.
+                self.release()
+            elif waiter in self.waiters:
+                # release() may have already dropped it, when cancelled right before.
+                self.waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter: Future[None] = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+
+
+class AsyncPool:
+    """
+    Share AsyncApi connections between many coroutines.
+
+    Number of sessions opened to each host is limited by per_host, since RouterOS limits number of api sessions
+    and low end devices slow down with many of them. Number of sessions used at once across all hosts is limited
+    by limit. Waiting tasks are served in order in which they arrived. Idle connections are reused.
+
+    :param connect: Coroutine function returning logged in AsyncApi for given host.
+                    e.g. functools.partial(librouteros.async_connect, username='admin', password='abc')
+    :param per_host: Maximum number of concurrently used connections per host.
+    :param limit: Maximum number of concurrently used connections across all hosts.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[str], Awaitable[AsyncApi]],
+        *,
+        per_host: int = 2,
+        limit: int = 100,
+    ) -> None:
+        self.connect: Callable[[str], Awaitable[AsyncApi]] = connect
+        self.per_host: int = per_host
+        self.limiter: FairLimiter = FairLimiter(limit)
+        self.host_limiters: dict[str, FairLimiter] = {}
+        self.idle: dict[str, list[AsyncApi]] = {}
+        self.closed: bool = False
+
+    def __repr__(self) -> str:
+        idle: int = sum(len(connections) for connections in self.idle.values())
+        return f"<{self.__class__.__name__} hosts={len(self.host_limiters)} {self.limiter!r} idle={idle}>"
+
+    async def __aenter__(self) -> AsyncPool:  # noqa PYI034
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def acquire(self, host: str) -> AsyncIterator[AsyncApi]:
+        """
+        Wait for free slot and yield connection to given host.
+        Connection is returned to pool on exit. It is closed if an exception other than TrapError was raised.
+
+        .. code-block:: python
+
+            async with pool.acquire("192.168.1.1") as api:
+                rows = [row async for row in api.path("interface")]
+        """
+        if self.closed:
+            raise RuntimeError("Pool is closed.")
+        host_limiter: FairLimiter = self.host_limiters.setdefault(host, FairLimiter(self.per_host))
+        # Host slot first. Waiting for busy host must not hold a global slot which other hosts could use.
+        await host_limiter.acquire()
+        try:
+            await self.limiter.acquire()
+            try:
+                idle: list[AsyncApi] = self.idle.setdefault(host, [])
+                api: AsyncApi = idle.pop() if idle else await self.connect(host)
+                try:
+                    yield api
+                except REUSABLE_AFTER:
+                    await self.put_back(host, api)
+                    raise
+                except BaseException:
+                    await api.close()
+                    raise
+                await self.put_back(host, api)
+            finally:
+                self.limiter.release()
+        finally:
+            host_limiter.release()
+
+    async def put_back(self, host: str, api: AsyncApi) -> None:
+        """Keep connection for later use. Closed pool does not keep any."""
+        if self.closed:
+            await api.close()
+        else:
+            self.idle.setdefault(host, []).append(api)
+
+    async def close(self) -> None:
+        """Close every idle connection. Connections in use are closed when released."""
+        self.closed = True
+        for connections in self.idle.values():
+            while connections:
+                await connections.pop().close()
@@ -0,0 +1,165 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from librouteros.charset import decode_text
+from librouteros.codec import decode_sentence
+from librouteros.exceptions import ProtocolError
+from librouteros.protocol import parse_word
+from librouteros.types import ReplyDict
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from librouteros.api import Api
+    from librouteros.connections import Transport
+
+
+class CommandStats:
+    """
+    Time spent on one command path, in seconds.
+
+    wire: Waiting for transport read/write.
+    framing: Splitting received bytes into words and sentences.
+    decoding: Decoding words and parsing attribute words.
+    consumer: Rest of wall time. Spent by code consuming rows, until next command is sent.
+    """
+
+    __slots__ = ("calls", "decoding", "framing", "rows", "total", "wire")
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.rows: int = 0
+        self.wire: float = 0.0
+        self.framing: float = 0.0
+        self.decoding: float = 0.0
+        self.total: float = 0.0
+
+    @property
+    def consumer(self) -> float:
+        return max(self.total - self.wire - self.framing - self.decoding, 0.0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} calls={self.calls} rows={self.rows} wire={self.wire:.6f} "
+            f"framing={self.framing:.6f} decoding={self.decoding:.6f} consumer={self.consumer:.6f}>"
+        )
+
+
+class TimingTransport:
+    """Measure time spent in wrapped transport. Sent sentences mark start of new command."""
+
+    __slots__ = ("profile", "transport")
+
+    def __init__(self, transport: Transport, profile: Profile) -> None:
+        self.transport: Transport = transport
+        self.profile: Profile = profile
+
+    def write(self, data: bytes) -> None:
+        self.profile.start(data)
+        start: float = perf_counter()
+        self.transport.write(data)
+        self.profile.add_wire(perf_counter() - start)
+
+    def read(self, length: int) -> bytes:
+        start: float = perf_counter()
+        data: bytes = self.transport.read(length)
+        self.profile.add_wire(perf_counter() - start)
+        return data
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class Profile:
+    """
+    Attribute wall time of each command to wire, framing, decoding and consumer time.
+
+    .. code-block:: python
+
+        with api.profile() as profile:
+            tuple(api.path("ip", "route"))
+        print(profile.report())
+
+    :param api: Api instance to profile.
+    """
+
+    def __init__(self, api: Api) -> None:
+        self.api: Api = api
+        self.stats: dict[str, CommandStats] = {}
+        self.current: CommandStats | None = None
+        self.started: float = 0.0
+        # Total wire time. Used to subtract wire time from framing.
+        self.wire: float = 0.0
+        self.transport: Transport | None = None
+        self.read_sentence: Callable[[], tuple[str, ReplyDict]] | None = None
+
+    def __enter__(self) -> Profile:  # noqa PYI034
+        protocol = self.api.protocol
+        self.transport = protocol.transport
+        protocol.transport = TimingTransport(protocol.transport, self)
+        self.read_sentence = vars(self.api).get("readSentence")
+        self.api.readSentence = self.readSentence  # type: ignore[method-assign]
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.finish()
+        if self.transport is not None:
+            self.api.protocol.transport = self.transport
+        if self.read_sentence is None:
+            del self.api.readSentence
+        else:
+            self.api.readSentence = self.read_sentence  # type: ignore[method-assign]
+
+    def start(self, data: bytes) -> None:
+        """Finish current command. Start new one with command word of given encoded sentence."""
+        self.finish()
+        try:
+            decoded = decode_sentence(data)
+        except ProtocolError:
+            decoded = None
+        cmd: str = decoded[0][0].decode(self.api.protocol.encoding, errors="ignore") if decoded else "?"
+        self.current = self.stats.setdefault(cmd, CommandStats())
+        self.current.calls += 1
+        self.started = perf_counter()
+
+    def finish(self) -> None:
+        if self.current is not None:
+            self.current.total += perf_counter() - self.started
+            self.current = None
+
+    def add_wire(self, elapsed: float) -> None:
+        self.wire += elapsed
+        if self.current is not None:
+            self.current.wire += elapsed
+
+    def readSentence(self) -> tuple[str, ReplyDict]:  # noqa N802
+        """Same as Api.readSentence() but measures framing and decoding separately."""
+        protocol = self.api.protocol
+        start: float = perf_counter()
+        wire: float = self.wire
+        reply_word, raw_words = protocol.readRawSentence()
+        framed: float = perf_counter()
+        words: ReplyDict = dict(parse_word(word) for word in decode_text(raw_words, protocol.encoding, protocol.errors))
+        if self.current is not None:
+            self.current.framing += framed - start - (self.wire - wire)
+            self.current.decoding += perf_counter() - framed
+            self.current.rows += reply_word == "!re"
+        return reply_word, words
+
+    def report(self) -> str:
+        """Table with time spent per command path, in milliseconds. Slowest commands first."""
+        header: str = (
+            f"{'command':<40} {'calls':>6} {'rows':>8} {'wire':>10} {'framing':>10} "
+            f"{'decoding':>10} {'consumer':>10} {'total':>10}"
+        )
+        lines: list[str] = [header]
+        for cmd, stats in sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True):
+            lines.append(
+                f"{cmd:<40} {stats.calls:>6} {stats.rows:>8} {stats.wire * 1000:>10.3f} {stats.framing * 1000:>10.3f} "
+                f"{stats.decoding * 1000:>10.3f} {stats.consumer * 1000:>10.3f} {stats.total * 1000:>10.3f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,182 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from librouteros.exceptions import ProtocolError
+from librouteros.query import Key, PreparedQuery, prepare
+from librouteros.types import ReplyDict, ResponseIter, ROSType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import FrameType
+
+    from librouteros.api import Api
+    from librouteros.query import Query
+
+ID: str = ".id"
+
+
+class Site:
+    """
+    Keys read from rows returned at one call site.
+
+    :param keys: Every key read so far.
+    :param whole: Whole rows were used (iterated, copied, compared, ...). Rows are never narrowed.
+    :param runs: Number of runs.
+    :param widened: Number of runs which read a key not in .proplist and fetched whole rows again.
+    """
+
+    __slots__ = ("keys", "runs", "whole", "widened")
+
+    def __init__(self) -> None:
+        self.keys: set[str] = set()
+        self.whole: bool = False
+        self.runs: int = 0
+        self.widened: int = 0
+
+    def proplist(self) -> tuple[str, ...] | None:
+        """Keys to ask for. None means every key."""
+        if self.whole or not self.runs:
+            return None
+        return tuple(sorted(self.keys | {ID}))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} keys={sorted(self.keys)} whole={self.whole} runs={self.runs}>"
+
+
+# (code, line, command) of caller to learned keys.
+SITES: dict[tuple[Any, int, str], Site] = {}
+
+
+class Run:
+    """
+    One execution of a query at a site.
+    Reading a key outside of .proplist fetches whole rows again, once per run.
+    """
+
+    __slots__ = ("api", "proplist", "query", "rows", "site")
+
+    def __init__(self, api: Api, query: PreparedQuery, site: Site, proplist: tuple[str, ...] | None) -> None:
+        self.api: Api = api
+        self.query: PreparedQuery = query
+        self.site: Site = site
+        self.proplist: frozenset[str] | None = frozenset(proplist) if proplist is not None else None
+        self.rows: list[TrackingRow] = []
+
+    def touch(self, key: str) -> None:
+        self.site.keys.add(key)
+        if self.proplist is not None and key not in self.proplist:
+            self.widen()
+
+    def touch_all(self) -> None:
+        self.site.whole = True
+        if self.proplist is not None:
+            self.widen()
+
+    def widen(self) -> None:
+        """Fill every row of this run with all keys."""
+        self.proplist = None
+        self.site.widened += 1
+        full: list[ReplyDict] = list(self.query(self.api))
+        if all(ID in row for row in self.rows):
+            by_id: dict[ROSType, ReplyDict] = {row.get(ID, ""): row for row in full}
+            matched: list[ReplyDict | None] = [by_id.get(dict.__getitem__(row, ID)) for row in self.rows]
+        elif len(full) == len(self.rows):
+            matched = list(full)
+        else:
+            raise ProtocolError(f"Rows of {self.query.cmd} changed, unable to fill them with all keys.")
+        for row, full_row in zip(self.rows, matched, strict=True):
+            if full_row is not None:
+                dict.update(row, full_row)
+
+
+class TrackingRow(dict[str, ROSType]):
+    """
+    Row which records every key read from it.
+    Any use of row as a whole (iteration, len(), ==, copy, repr, ...) means all keys are needed.
+    """
+
+    __slots__ = ("run",)
+
+    def __init__(self, row: ReplyDict, run: Run) -> None:
+        super().__init__(row)
+        self.run: Run = run
+
+    def __getitem__(self, key: str) -> ROSType:
+        self.run.touch(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.run.touch(key)
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            self.run.touch(key)
+        return super().__contains__(key)
+
+    def __iter__(self) -> Iterator[str]:
+        self.run.touch_all()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self.run.touch_all()
+        return super().__len__()
+
+    def __eq__(self, other: object) -> bool:
+        self.run.touch_all()
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]  # dicts are not hashable
+
+    def __repr__(self) -> str:
+        self.run.touch_all()
+        return super().__repr__()
+
+    def keys(self) -> Any:
+        self.run.touch_all()
+        return super().keys()
+
+    def values(self) -> Any:
+        self.run.touch_all()
+        return super().values()
+
+    def items(self) -> Any:
+        self.run.touch_all()
+        return super().items()
+
+    def copy(self) -> dict[str, ROSType]:
+        self.run.touch_all()
+        return dict(super().items())
+
+    def __reduce__(self) -> Any:
+        self.run.touch_all()
+        return dict, (dict(super().items()),)
+
+
+def auto_select(query: Query, frame: FrameType) -> ResponseIter:
+    """
+    Run query with .proplist learned from keys read at calling site in previous runs.
+
+    :param query: Query without selected keys.
+    :param frame: Frame of caller. Identifies calling site. Not referenced after this call.
+    """
+    if query.keys:
+        return iter(query)
+    site: Site = SITES.setdefault((frame.f_code, frame.f_lineno, str(query.path)), Site())
+    return tracked(query, site)
+
+
+def tracked(query: Query, site: Site) -> ResponseIter:
+    proplist: tuple[str, ...] | None = site.proplist()
+    full: PreparedQuery = query.prepare()
+    narrowed: PreparedQuery = full
+    if proplist is not None:
+        narrowed = prepare(query.path, [Key(key) for key in proplist], query.query)
+    site.runs += 1
+    run: Run = Run(query.api, full, site, proplist)
+    # Api reads whole response before first row is returned. Wrap all rows so a miss fills every one of them.
+    run.rows = [TrackingRow(row, run) for row in narrowed(query.api)]
+    yield from run.rows
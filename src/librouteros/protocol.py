@@ -2,22 +2,32 @@
 
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Awaitable, Callable, Sequence
 from logging import NullHandler, getLogger
-from typing import Final, Literal
-
-from librouteros.connections import AsyncSocketTransport, SocketTransport
-from librouteros.exceptions import (
-    FatalError,
-    ProtocolError,
+from typing import BinaryIO, TypeVar
+
+from librouteros.charset import ERRORS, decode_text, encode_errors
+from librouteros.codec import (
+    API_BYTE_ORDER,  # noqa F401  # kept importable from here
+    EXTRA_BYTES,
+    decode_length,
+    decode_words,
+    determine_length,  # noqa F401  # kept importable from here
+    encode_length,
 )
+from librouteros.connections import AsyncTransport, Transport
+from librouteros.exceptions import FatalError, ProtocolError
 from librouteros.types import ROSType
 
+T = TypeVar("T")
+
 LOGGER = getLogger("librouteros")
 LOGGER.addHandler(NullHandler())
 
-# big is network byte order
-API_BYTE_ORDER: Final[Literal["big"]] = "big"
+# Value of oversized word is replaced with this prefix and number of sink() call which received it.
+SINK_MARKER: str = "\x00sink:"
+# Called with attribute name of each oversized word. Returns file object receiving its value.
+Sink = Callable[[str], BinaryIO]
 
 
 def parse_word(word: str) -> tuple[str, ROSType]:
@@ -57,108 +67,192 @@ def compose_word(key: str, value: ROSType) -> str:
     return f"={key}={cast_to_api(value)}"
 
 
-def encode_sentence(*words: str, encoding: str) -> bytes:
+def encode_sentence(*words: str, encoding: str, errors: str = "strict") -> bytes:
     """
     Encode given sentence in API format.
 
     :param words: Words to encode.
+    :param errors: Error handler. See charset.encode_errors().
     :returns: Encoded sentence.
     """
-    encoded: bytes = b"".join(encode_word(word, encoding) for word in words)
+    encoded: bytes = b"".join(encode_word(word, encoding, errors) for word in words)
     # append EOS (end of sentence) byte
     encoded += b"\x00"
     return encoded
 
 
-def encode_word(word: str, encoding: str) -> bytes:
+def encode_word(word: str, encoding: str, errors: str = "strict") -> bytes:
     """
     Encode word in API format.
 
     :param word: Word to encode.
     :returns: Encoded word.
     """
-    encoded_word: bytes = word.encode(encoding=encoding, errors="strict")
+    encoded_word: bytes = word.encode(encoding=encoding, errors=errors)
     return encode_length(len(encoded_word)) + encoded_word
 
 
-def encode_length(length: int) -> bytes:
+def attribute_prefix(head: bytes) -> bytes:
     """
-    Encode given length in mikrotik api format.
+    Return =name= part of attribute word.
 
-    :param length: Integer < 0x10000000
-    :returns: Encoded length
-    """
-    if length < 0x80:
-        return length.to_bytes(1, API_BYTE_ORDER)
-    elif length < 0x4000:
-        val = length | 0x8000
-        return val.to_bytes(2, API_BYTE_ORDER)
-    elif length < 0x200000:
-        val = length | 0xC00000
-        return val.to_bytes(3, API_BYTE_ORDER)
-    elif length < 0x10000000:
-        val = length | 0xE0000000
-        return val.to_bytes(4, API_BYTE_ORDER)
-    else:
-        raise ProtocolError(f"Unable to encode length {length!r}")
-
-
-def decode_length(length: bytes) -> int:
+    :param head: Beginning of attribute word.
+    :throws ProtocolError: If head is not a beginning of attribute word.
     """
-    Decode api length based on given bytes.
+    name_end: int = head.find(b"=", 1)
+    if not head.startswith(b"=") or name_end == -1:
+        raise ProtocolError(f"Oversized word is not an attribute word: {head[:32]!r}")
+    return head[: name_end + 1]
 
-    :param length: Bytes string to decode
-    :return: Decoded length
-    """
-    ctl_byte: int = length[0]
-
-    if ctl_byte < 0x80:
-        return int.from_bytes(length, API_BYTE_ORDER)
-    elif ctl_byte < 0xC0:
-        val = int.from_bytes(length[:2], API_BYTE_ORDER)
-        return val ^ 0x8000
-    elif ctl_byte < 0xE0:
-        val = int.from_bytes(length[:3], API_BYTE_ORDER)
-        return val ^ 0xC00000
-    elif ctl_byte < 0xF0:
-        val = int.from_bytes(length[:4], API_BYTE_ORDER)
-        return val ^ 0xE0000000
-    else:
-        raise ProtocolError(f"Unable to decode length {length!r}")
-
-
-def determine_length(length: bytes) -> int:
+
+def log(direction_string: str, *sentence: str | bytes) -> None:
+    for word in sentence:
+        LOGGER.debug(f"{direction_string} {word!r}")
+    LOGGER.debug(f"{direction_string} EOS")
+
+
+class SentenceParser:
     """
-    Given first read byte, determine how many more bytes
-    needs to be known in order to get fully encoded length.
+    Sans-IO parser of received sentences. Feed it bytes, take complete sentences.
+    It does no IO, so blocking, async and replay transports all share it.
 
-    :param length: First read byte.
-    :return: How many bytes to read.
+    Transports which read exactly given number of bytes should read parser.needed bytes.
+    That is rest of current word and first byte of next one, which is never past sentence end.
+
+    .. code-block:: python
+
+        parser = SentenceParser()
+        while (sentence := parser.next_sentence()) is None:
+            parser.feed(transport.read(parser.needed))
     """
-    ctl_byte: int = length[0]
 
-    if ctl_byte < 128:
-        return 0
-    elif ctl_byte < 192:
-        return 1
-    elif ctl_byte < 224:
-        return 2
-    elif ctl_byte < 240:
-        return 3
+    __slots__ = ("buffer", "needed", "position", "word_length", "words")
+
+    def __init__(self) -> None:
+        # bytes while whole previous chunk was decoded. bytearray while a word spans chunks.
+        self.buffer: bytes | bytearray = b""
+        # Position in buffer of first not yet decoded word.
+        self.position: int = 0
+        # Decoded words of incomplete sentence.
+        self.words: list[bytes] = []
+        # Number of bytes to feed before next_sentence() can make progress.
+        self.needed: int = 1
+        # Length of incomplete word. None if its length is not fully received yet.
+        self.word_length: int | None = None
+
+    def feed(self, data: bytes) -> None:
+        """Add received bytes. They may end anywhere, even in the middle of length."""
+        buffer: bytes | bytearray = self.buffer
+        position: int = self.position
+        pending: int = len(buffer) - position
+        if pending <= 0:
+            self.buffer, self.position = data, 0
+        elif isinstance(buffer, bytearray):
+            # Drop decoded prefix only now and then. Doing it on every feed would copy
+            # pending bytes each time, and large words fed in many chunks would take quadratic time.
+            if position > len(buffer) // 2:
+                del buffer[:position]
+                self.position = 0
+            buffer += data
+        elif pending <= len(data):
+            # Copying as much as was fed keeps exact reads (pending control byte) cheap.
+            self.buffer, self.position = buffer[position:] + data, 0
+        else:
+            self.buffer, self.position = bytearray(buffer[position:]) + data, 0
+
+    def next_sentence(self) -> list[bytes] | None:
+        """
+        :returns: Raw words of next complete sentence. None if more bytes are needed.
+        :throws ProtocolError: If length of a word can not be decoded.
+        """
+        buffer: bytes | bytearray = self.buffer
+        words: list[bytes] = self.words
+        decoded: int = len(words)
+        position, complete = decode_words(buffer, self.position, words)
+        self.position = position
+        if isinstance(buffer, bytearray) and len(words) > decoded:
+            words[decoded:] = map(bytes, words[decoded:])
+        if complete:
+            sentence, self.words = self.words, []
+            self.needed, self.word_length = 1, None
+            return sentence
+        available: int = len(buffer) - position
+        if available == 0:
+            self.needed, self.word_length = 1, None
+            return None
+        ctl_byte: int = buffer[position]
+        if ctl_byte < 0x80:
+            # Most words are short. Their length is the control byte.
+            self.needed, self.word_length = ctl_byte + 2 - available, ctl_byte
+            return None
+        header_size: int = EXTRA_BYTES[ctl_byte] + 1
+        if available < header_size:
+            self.needed, self.word_length = header_size - available, None
+            return None
+        length: int = decode_length(buffer[position : position + header_size])
+        self.needed, self.word_length = header_size + length + 1 - available, length
+        return None
+
+    def next_word(self) -> bytes | None:
+        """
+        Same as next_sentence() but returns one raw word at a time.
 
-    raise ProtocolError(f"Unknown controll byte {length!r}")
+        :returns: Next word. Empty word at sentence end. None if more bytes are needed.
+        """
+        if not self.words and (sentence := self.next_sentence()) is not None:
+            self.words = [*sentence, b""]
+        return self.words.pop(0) if self.words else None
 
+    def take_word(self) -> bytes:
+        """
+        Drop incomplete word, whose length is known, from buffer.
+        Used to read huge words directly from transport.
 
-def log(direction_string: str, *sentence: str) -> None:
-    for word in sentence:
-        LOGGER.debug(f"{direction_string} {word!r}")
-    LOGGER.debug(f"{direction_string} EOS")
+        :returns: Already received part of word.
+        """
+        header_size: int = EXTRA_BYTES[self.buffer[self.position]] + 1
+        received: bytes = bytes(self.buffer[self.position + header_size :])
+        self.buffer, self.position = b"", 0
+        self.needed, self.word_length = 1, None
+        return received
+
+    def add_word(self, word: bytes) -> None:
+        """Add word, read outside of parser, to incomplete sentence."""
+        self.words.append(word)
 
 
 class ApiProtocol:
-    def __init__(self, transport: SocketTransport, encoding: str) -> None:
-        self.transport: SocketTransport = transport
+    """
+    :param transport: Transport to read from and write to.
+    :param encoding: Encoding used to encode and decode words.
+    :param max_word_size: Maximum length of received word. None means no limit.
+                          Longer words raise ProtocolError and close connection,
+                          unless sink is set.
+    :param sink: Callable taking attribute name and returning file like object. It is called for each word
+                 longer than max_word_size. Value is written to returned file in chunks of max_word_size bytes.
+                 Word itself is returned as =name=\x00sink:N where N is number of sink() call, starting at 0.
+    :param errors: Error handler used when decoding words. "ignore" (default) drops undecodable bytes,
+                   "surrogateescape" keeps them, so that words can be written back unchanged.
+    """
+
+    __slots__ = ("encoding", "errors", "max_word_size", "parser", "sink", "sunk", "transport")
+
+    def __init__(
+        self,
+        transport: Transport,
+        encoding: str,
+        max_word_size: int | None = None,
+        sink: Sink | None = None,
+        errors: str = ERRORS,
+    ) -> None:
+        self.transport: Transport = transport
         self.encoding: str = encoding
+        self.errors: str = errors
+        self.max_word_size: int | None = max_word_size
+        self.sink: Sink | None = sink
+        # Number of words passed to sink so far.
+        self.sunk: int = 0
+        self.parser: SentenceParser = SentenceParser()
 
     def writeSentence(self, cmd: str, *words: str) -> None:  # noqa N802
         """
@@ -167,17 +261,31 @@ class ApiProtocol:
         :param cmd: Command word.
         :param words: Additional words.
         """
-        encoded: bytes = encode_sentence(cmd, *words, encoding=self.encoding)
+        encoded: bytes = encode_sentence(cmd, *words, encoding=self.encoding, errors=encode_errors(self.errors))
         log("<---", cmd, *words)
         self.transport.write(encoded)
 
+    def writeSentences(self, *sentences: Sequence[str]) -> None:  # noqa N802
+        """
+        Write many encoded sentences at once.
+
+        :param sentences: Each one is command word followed by additional words.
+        """
+        encoded: bytes = b"".join(
+            encode_sentence(*sentence, encoding=self.encoding, errors=encode_errors(self.errors))
+            for sentence in sentences
+        )
+        for sentence in sentences:
+            log("<---", *sentence)
+        self.transport.write(encoded)
+
     def readSentence(self) -> tuple[str, tuple[str, ...]]:  # noqa N802
         """
         Read every word until empty word (NULL byte) is received.
 
         :return: Reply word, tuple with read words.
         """
-        sentence: tuple[str, ...] = tuple(word for word in iter(self.readWord, ""))
+        sentence: tuple[str, ...] = decode_text(self.receive(), self.encoding, self.errors)
         log("--->", *sentence)
         reply_word, words = sentence[0], sentence[1:]
         if reply_word == "!fatal":
@@ -185,26 +293,121 @@ class ApiProtocol:
             raise FatalError(words[0])
         return reply_word, words
 
+    def readRawSentence(self) -> tuple[str, tuple[bytes, ...]]:  # noqa N802
+        """
+        Read every word until empty word (NULL byte) is received.
+        Only reply word is decoded.
+
+        :return: Reply word, tuple with read, not decoded words.
+        """
+        sentence: tuple[bytes, ...] = tuple(self.receive())
+        log("--->", *sentence)
+        reply_word, words = sentence[0].decode(encoding=self.encoding, errors=self.errors), sentence[1:]
+        if reply_word == "!fatal":
+            self.transport.close()
+            raise FatalError(words[0].decode(encoding=self.encoding, errors=self.errors))
+        return reply_word, words
+
     def readWord(self) -> str:  # noqa N802
-        byte: bytes = self.transport.read(1)
-        # Early return check for null byte
-        if byte == b"\x00":
-            return ""
-        to_read: int = determine_length(byte)
-        byte += self.transport.read(to_read)
-        length: int = decode_length(byte)
-        word: bytes = self.transport.read(length)
-        return word.decode(encoding=self.encoding, errors="ignore")
+        """
+        Read single word. Empty word marks end of sentence.
+        Kept for backwards compatibility, readSentence() reads whole sentence at once.
+        """
+        return self.readRawWord().decode(encoding=self.encoding, errors=self.errors)
+
+    def readRawWord(self) -> bytes:  # noqa N802
+        """Same as readWord() but word is not decoded."""
+        return self.feed_until(self.parser.next_word)
+
+    def receive(self) -> list[bytes]:
+        """Feed parser until it returns whole sentence."""
+        return self.feed_until(self.parser.next_sentence)
+
+    def feed_until(self, take: Callable[[], T | None]) -> T:
+        """
+        Feed parser until take() returns something.
+
+        :param take: Parser method returning None while more bytes are needed.
+        """
+        parser: SentenceParser = self.parser
+        limit: int | None = self.max_word_size
+        while (result := take()) is None:
+            if limit is not None and (length := parser.word_length) is not None and length > limit:
+                parser.add_word(self.readOversizedWord(length, limit, parser.take_word()))
+            else:
+                parser.feed(self.transport.read(parser.needed))
+        return result
+
+    def readOversizedWord(self, length: int, chunk_size: int, received: bytes = b"") -> bytes:  # noqa N802
+        """
+        Write value of word to sink in chunks. Never hold whole word in memory.
+
+        :param received: Already received beginning of word.
+        :returns: =name= part of word followed by marker.
+        :throws ProtocolError: If there is no sink. Connection is closed since rest of word is not read.
+        """
+        if self.sink is None:
+            self.transport.close()
+            raise ProtocolError(f"Word length {length} exceeds maximum of {self.max_word_size}")
+        head: bytes = received
+        if (missing := min(length, chunk_size) - len(head)) > 0:
+            head += self.transport.read(missing)
+        try:
+            prefix: bytes = attribute_prefix(head)
+        except ProtocolError:
+            self.transport.close()
+            raise
+        file: BinaryIO = self.sink(prefix[1:-1].decode(self.encoding, self.errors))
+        file.write(head[len(prefix) :])
+        remaining: int = length - len(head)
+        while remaining:
+            chunk: bytes = self.transport.read(min(remaining, chunk_size))
+            file.write(chunk)
+            remaining -= len(chunk)
+        return self.marker(prefix)
+
+    def marker(self, prefix: bytes) -> bytes:
+        """Word returned in place of oversized one. Tells which sink() call received its value."""
+        number: int = self.sunk
+        self.sunk += 1
+        return prefix + f"{SINK_MARKER}{number}".encode()
 
     def close(self) -> None:
         self.transport.close()
 
 
 class AsyncApiProtocol:
-    def __init__(self, transport: AsyncSocketTransport, encoding: str, timeout: float | None = None):
-        self.transport: AsyncSocketTransport = transport
+    """Async version of ApiProtocol."""
+
+    __slots__ = ("encoding", "errors", "max_word_size", "parser", "sink", "sunk", "timeout", "transport")
+
+    def __init__(
+        self,
+        transport: AsyncTransport,
+        encoding: str,
+        timeout: float | None = None,
+        max_word_size: int | None = None,
+        sink: Sink | None = None,
+        errors: str = ERRORS,
+    ):
+        self.transport: AsyncTransport = transport
         self.encoding: str = encoding
+        self.errors: str = errors
         self.timeout: float | None = timeout
+        self.max_word_size: int | None = max_word_size
+        self.sink: Sink | None = sink
+        # Number of words passed to sink so far.
+        self.sunk: int = 0
+        self.parser: SentenceParser = SentenceParser()
+
+    async def wait(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await with timeout, if any.
+        Timeout is implemented by transport, so that protocol does not depend on any event loop.
+        """
+        if self.timeout is None:
+            return await awaitable
+        return await self.transport.wait_for(awaitable, self.timeout)
 
     async def writeSentence(self, cmd: str, *words: str) -> None:  # noqa N802
         """
@@ -213,9 +416,23 @@ class AsyncApiProtocol:
         :param cmd: Command word.
         :param words: Additional words.
         """
-        encoded: bytes = encode_sentence(cmd, *words, encoding=self.encoding)
+        encoded: bytes = encode_sentence(cmd, *words, encoding=self.encoding, errors=encode_errors(self.errors))
         log("<---", cmd, *words)
-        await asyncio.wait_for(self.transport.write(encoded), self.timeout)
+        await self.wait(self.transport.write(encoded))
+
+    async def writeSentences(self, *sentences: Sequence[str]) -> None:  # noqa N802
+        """
+        Write many encoded sentences at once.
+
+        :param sentences: Each one is command word followed by additional words.
+        """
+        encoded: bytes = b"".join(
+            encode_sentence(*sentence, encoding=self.encoding, errors=encode_errors(self.errors))
+            for sentence in sentences
+        )
+        for sentence in sentences:
+            log("<---", *sentence)
+        await self.wait(self.transport.write(encoded))
 
     async def readSentence(self) -> tuple[str, tuple[str, ...]]:  # noqa N802
         """
@@ -223,31 +440,81 @@ class AsyncApiProtocol:
 
         :return: Reply word, tuple with read words.
         """
-
-        async def inner() -> tuple[str, ...]:
-            sentence: list[str] = []
-            while (word := await self.readWord()) != "":
-                sentence.append(word)
-            return tuple(sentence)
-
-        sentence: tuple[str, ...] = await asyncio.wait_for(inner(), self.timeout)
+        raw: list[bytes] = await self.wait(self.receive())
+        sentence: tuple[str, ...] = decode_text(raw, self.encoding, self.errors)
         log("--->", *sentence)
         reply_word, words = sentence[0], sentence[1:]
         if reply_word == "!fatal":
             await self.transport.close()
             raise FatalError(words[0])
-        return reply_word, tuple(words)
+        return reply_word, words
+
+    async def readRawSentence(self) -> tuple[str, tuple[bytes, ...]]:  # noqa N802
+        """
+        Read every word until empty word (NULL byte) is received.
+        Only reply word is decoded.
+
+        :return: Reply word, tuple with read, not decoded words.
+        """
+        sentence: tuple[bytes, ...] = tuple(await self.wait(self.receive()))
+        log("--->", *sentence)
+        reply_word, words = sentence[0].decode(encoding=self.encoding, errors=self.errors), sentence[1:]
+        if reply_word == "!fatal":
+            await self.transport.close()
+            raise FatalError(words[0].decode(encoding=self.encoding, errors=self.errors))
+        return reply_word, words
 
     async def readWord(self) -> str:  # noqa N802
-        byte: bytes = await self.transport.read(1)
-        # Early return check for null byte
-        if byte == b"\x00":
-            return ""
-        to_read: int = determine_length(byte)
-        byte += await self.transport.read(to_read)
-        length: int = decode_length(byte)
-        word: bytes = await self.transport.read(length)
-        return word.decode(encoding=self.encoding, errors="ignore")
+        """Same as ApiProtocol.readWord()."""
+        word: bytes = await self.readRawWord()
+        return word.decode(encoding=self.encoding, errors=self.errors)
+
+    async def readRawWord(self) -> bytes:  # noqa N802
+        """Same as ApiProtocol.readRawWord()."""
+        return await self.feed_until(self.parser.next_word)
+
+    async def receive(self) -> list[bytes]:
+        """Same as ApiProtocol.receive()."""
+        return await self.feed_until(self.parser.next_sentence)
+
+    async def feed_until(self, take: Callable[[], T | None]) -> T:
+        """Same as ApiProtocol.feed_until()."""
+        parser: SentenceParser = self.parser
+        limit: int | None = self.max_word_size
+        while (result := take()) is None:
+            if limit is not None and (length := parser.word_length) is not None and length > limit:
+                parser.add_word(await self.readOversizedWord(length, limit, parser.take_word()))
+            else:
+                parser.feed(await self.transport.read(parser.needed))
+        return result
+
+    async def readOversizedWord(self, length: int, chunk_size: int, received: bytes = b"") -> bytes:  # noqa N802
+        """Same as ApiProtocol.readOversizedWord()."""
+        if self.sink is None:
+            await self.transport.close()
+            raise ProtocolError(f"Word length {length} exceeds maximum of {self.max_word_size}")
+        head: bytes = received
+        if (missing := min(length, chunk_size) - len(head)) > 0:
+            head += await self.transport.read(missing)
+        try:
+            prefix: bytes = attribute_prefix(head)
+        except ProtocolError:
+            await self.transport.close()
+            raise
+        file: BinaryIO = self.sink(prefix[1:-1].decode(self.encoding, self.errors))
+        file.write(head[len(prefix) :])
+        remaining: int = length - len(head)
+        while remaining:
+            chunk: bytes = await self.transport.read(min(remaining, chunk_size))
+            file.write(chunk)
+            remaining -= len(chunk)
+        return self.marker(prefix)
+
+    def marker(self, prefix: bytes) -> bytes:
+        """Same as ApiProtocol.marker()."""
+        number: int = self.sunk
+        self.sunk += 1
+        return prefix + f"{SINK_MARKER}{number}".encode()
 
     async def close(self) -> None:
         await self.transport.close()
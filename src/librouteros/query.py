@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from itertools import chain
-from typing import TYPE_CHECKING
+from sys import _getframe
+from typing import TYPE_CHECKING, NamedTuple, overload
 
 from librouteros.protocol import (
     cast_to_api,
@@ -12,58 +13,237 @@ from librouteros.protocol import (
 from librouteros.types import (
     AsyncResponseIter,
     QueryGen,
+    Response,
     ResponseIter,
+    ROSType,
 )
 
 if TYPE_CHECKING:
     from librouteros.api import Api, AsyncApi, AsyncPath, Path
+    from librouteros.pagination import AsyncPaginator, Paginator
+
+
+class Param:
+    """Placeholder for a value which is bound later with PreparedQuery.bind()."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+class ParamWord(str):
+    """Query word with value not yet known."""
+
+    prefix: str
+    param: str
+
+    def __new__(cls, prefix: str, param: str) -> ParamWord:  # noqa PYI034
+        word = super().__new__(cls, f"{prefix}{{{param}}}")
+        word.prefix = prefix
+        word.param = param
+        return word
+
+
+def query_word(prefix: str, value: ROSType | Param) -> str:
+    if isinstance(value, Param):
+        return ParamWord(prefix, value.name)
+    return f"{prefix}{cast_to_api(value)}"
 
 
 class Key:
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
         self.name: str = name
 
     def __eq__(self, other) -> QueryGen:  # type: ignore[override]  # magic method
-        yield f"?={self}={cast_to_api(other)}"
+        yield query_word(f"?={self}=", other)
 
     def __ne__(self, other) -> QueryGen:  # type: ignore[override]  # magic method
         yield from self == other
         yield "?#!"
 
     def __lt__(self, other) -> QueryGen:
-        yield f"?<{self}={cast_to_api(other)}"
+        yield query_word(f"?<{self}=", other)
 
     def __gt__(self, other) -> QueryGen:
-        yield f"?>{self}={cast_to_api(other)}"
+        yield query_word(f"?>{self}=", other)
+
+    def __le__(self, other) -> QueryGen:
+        # Not(>) alone would also match rows without this key. Router omits empty and default properties.
+        yield from And(self.has(), Not(self > other))
+
+    def __ge__(self, other) -> QueryGen:
+        yield from And(self.has(), Not(self < other))
 
     def __str__(self) -> str:
         return self.name
 
     def In(self, one, *elems) -> QueryGen:  # noqa N802
         yield from self == one
-        yield from chain.from_iterable(self == str(elem) for elem in elems)
+        yield from chain.from_iterable(self == elem for elem in elems)
         yield from ("?#|",) * len(elems)
 
+    def has(self) -> QueryGen:
+        """Key is present."""
+        yield f"?{self}"
+
+    def absent(self) -> QueryGen:
+        """Key is not present."""
+        yield f"?-{self}"
+
+    def startswith(self, prefix: str) -> QueryGen:
+        """
+        Value starts with given prefix.
+        Api has no pattern matching. Query is a range [prefix, next prefix) which relies on string ordering in router.
+        """
+        if not prefix:
+            yield from self.has()
+            return
+        upper: str = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        yield from And(self >= prefix, self < upper)
+
 
 class Query:
+    __slots__ = ("api", "keys", "path", "prepared", "query")
+
     def __init__(self, path: Path, keys: Sequence[Key], api: Api) -> None:
         self.path: Path = path
         self.keys: Sequence[Key] = keys
         self.api: Api = api
         self.query: tuple[str, ...] = ()
+        self.prepared: PreparedQuery | None = None
 
     def where(self, *args: str | QueryGen) -> Query:
-        self.query = tuple(chain.from_iterable(args))
+        self.query = compact(chain.from_iterable(args))
+        self.prepared = None
         return self
 
+    def prepare(self) -> PreparedQuery:
+        """Compile query words once. Result is cached until where() is called again."""
+        if self.prepared is None:
+            self.prepared = prepare(self.path, self.keys, self.query)
+        return self.prepared
+
     def __iter__(self) -> ResponseIter:
-        cmd: str = str(self.path.join("print"))
-        words: tuple[str, ...] = tuple(self.query)
-        if len(self.keys) > 0:
-            keys: str = ",".join(str(key) for key in self.keys)
-            keys = f"=.proplist={keys}"
-            words = (keys, *words)
-        return iter(self.api.rawCmd(cmd, *words))
+        return iter(self.prepare()(self.api))
+
+    def count(self) -> int:
+        """Count matching rows. Only the number is transferred."""
+        response: Response = list(self.api.rawCmd(*count_words(self.path, self.query)))
+        return int(response[0]["ret"])
+
+    def exists(self) -> bool:
+        """Check if any row matches."""
+        return self.count() > 0
+
+    def paginate(self, *, page_size: int = 1000, after: str | None = None, prefetch: Api | None = None) -> Paginator:
+        """
+        Read query results in pages of at most page_size rows.
+
+        :param after: Resume after row with this .id.
+        :param prefetch: Separate connection used to read next page while current one is consumed.
+        """
+        from librouteros.pagination import Paginator
+
+        return Paginator(self, page_size=page_size, after=after, prefetch=prefetch)
+
+    def auto_select(self) -> ResponseIter:
+        """
+        Iterate rows, asking only for keys which calling code read in previous runs.
+        First run returns all keys. Reading a key which was not asked for fetches all keys again.
+        Has no effect if keys were selected.
+        """
+        from librouteros.projection import auto_select
+
+        return auto_select(self, _getframe(1))
+
+
+class PreparedQuery(NamedTuple):
+    """
+    Immutable, hashable print command with all words already composed.
+    Not bound to any Api instance. May be shared between many of them.
+
+    :param cmd: Command word. eg. /interface/print
+    :param words: Query and .proplist words.
+    :param params: (word index, word prefix, param name) for each Param placeholder.
+    """
+
+    cmd: str
+    words: tuple[str, ...]
+    params: tuple[tuple[int, str, str], ...] = ()
+    bound: bool = True
+
+    def bind(self, **values: ROSType) -> PreparedQuery:
+        """
+        Substitute every Param placeholder with given value.
+        Only words with placeholders are recomposed.
+        """
+        words: list[str] = list(self.words)
+        for index, prefix, name in self.params:
+            words[index] = f"{prefix}{cast_to_api(values[name])}"
+        return PreparedQuery(cmd=self.cmd, words=tuple(words), params=self.params, bound=True)
+
+    @overload
+    def __call__(self, api: Api) -> ResponseIter: ...
+
+    @overload
+    def __call__(self, api: AsyncApi) -> AsyncResponseIter: ...
+
+    def __call__(self, api: Api | AsyncApi) -> ResponseIter | AsyncResponseIter:
+        """Run query with given Api or AsyncApi."""
+        if not self.bound:
+            names: str = ", ".join(name for _, _, name in self.params)
+            raise ValueError(f"Query has unbound params: {names}")
+        return api.rawCmd(self.cmd, *self.words)
+
+
+def prepare(path: Path | AsyncPath, keys: Sequence[Key], query: Iterable[str]) -> PreparedQuery:
+    cmd: str = str(path.join("print"))
+    words: tuple[str, ...] = tuple(query)
+    if len(keys) > 0:
+        proplist: str = ",".join(str(key) for key in keys)
+        words = (f"=.proplist={proplist}", *words)
+    params: tuple[tuple[int, str, str], ...] = tuple(
+        (index, word.prefix, word.param) for index, word in enumerate(words) if isinstance(word, ParamWord)
+    )
+    return PreparedQuery(cmd=cmd, words=words, params=params, bound=not params)
+
+
+def count_words(path: Path | AsyncPath, query: Iterable[str]) -> tuple[str, ...]:
+    """Command and words which return only the number of matching rows."""
+    return (str(path.join("print")), "=count-only=", *query)
+
+
+# Characters which represent operations in ?# word.
+OPERATIONS: frozenset[str] = frozenset("|&!.")
+
+
+def is_operation(word: object) -> bool:
+    return isinstance(word, str) and word.startswith("?#") and len(word) > 2 and OPERATIONS.issuperset(word[2:])
+
+
+def compact(words: Iterable[str]) -> tuple[str, ...]:
+    """
+    Merge consecutive ?# operation words into one word.
+    e.g. "?#|", "?#|", "?#&" becomes "?#||&" since ?# applies each operation in order.
+    """
+    result: list[str] = []
+    for word in words:
+        if result and is_operation(word) and is_operation(result[-1]):
+            result[-1] += word[2:]
+        else:
+            result.append(word)
+    return tuple(result)
+
+
+def Not(expr: QueryGen) -> QueryGen:  # noqa N802
+    yield from expr
+    yield "?#!"
 
 
 def And(left: QueryGen, right: QueryGen, *rest: QueryGen) -> QueryGen:  # noqa N802
@@ -83,24 +263,50 @@ def Or(left: QueryGen, right: QueryGen, *rest: QueryGen) -> QueryGen:  # noqa N8
 
 
 class AsyncQuery:
+    __slots__ = ("api", "keys", "path", "prepared", "query")
+
     def __init__(self, path: AsyncPath, keys: Sequence[Key], api: AsyncApi) -> None:
         self.path: AsyncPath = path
         self.keys: Sequence[Key] = keys
         self.api: AsyncApi = api
         self.query: tuple[str, ...] = ()
+        self.prepared: PreparedQuery | None = None
 
     def where(self, *args: str | QueryGen) -> AsyncQuery:
-        self.query = tuple(chain.from_iterable(args))
+        self.query = compact(chain.from_iterable(args))
+        self.prepared = None
         return self
 
+    def prepare(self) -> PreparedQuery:
+        """Compile query words once. Result is cached until where() is called again."""
+        if self.prepared is None:
+            self.prepared = prepare(self.path, self.keys, self.query)
+        return self.prepared
+
     def __aiter__(self) -> AsyncResponseIter:
-        cmd: str = str(self.path.join("print"))
-        words: tuple[str, ...] = tuple(self.query)
-        if len(self.keys) > 0:
-            keys: str = ",".join(str(key) for key in self.keys)
-            keys = f"=.proplist={keys}"
-            words = (keys, *words)
-        return self.api.rawCmd(cmd, *words)
+        return self.prepare()(self.api)
+
+    async def count(self) -> int:
+        """Count matching rows. Only the number is transferred."""
+        response: Response = [row async for row in self.api.rawCmd(*count_words(self.path, self.query))]
+        return int(response[0]["ret"])
+
+    async def exists(self) -> bool:
+        """Check if any row matches."""
+        return await self.count() > 0
+
+    def paginate(
+        self, *, page_size: int = 1000, after: str | None = None, prefetch: AsyncApi | None = None
+    ) -> AsyncPaginator:
+        """
+        Read query results in pages of at most page_size rows.
+
+        :param after: Resume after row with this .id.
+        :param prefetch: Separate connection used to read next page while current one is consumed.
+        """
+        from librouteros.pagination import AsyncPaginator
+
+        return AsyncPaginator(self, page_size=page_size, after=after, prefetch=prefetch)
 
     def __iter__(self) -> None:
         raise AttributeError("Use 'async for' instead of 'for' to iterate over Query results.")
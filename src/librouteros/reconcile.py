@@ -0,0 +1,224 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+from librouteros.api import Path, join_path
+from librouteros.batch import BatchResult
+from librouteros.exceptions import ProtocolError
+from librouteros.protocol import cast_to_api, compose_word
+from librouteros.query import Key
+from librouteros.types import QueryGen, ReplyDict, Response, ROSType
+
+NaturalKey = tuple[str, ...]
+
+
+class Change(NamedTuple):
+    """
+    Single change needed to reach desired state.
+
+    :param action: One of add, set, remove, move.
+    :param key: Natural key of affected row.
+    :param params: Words passed with command.
+    :param destination: Only for move. Natural key of row to move before. None moves to the end.
+    """
+
+    action: str
+    key: NaturalKey
+    params: dict[str, ROSType]
+    destination: NaturalKey | None = None
+
+    def __str__(self) -> str:
+        params: str = " ".join(f"{name}={cast_to_api(value)}" for name, value in self.params.items())
+        if self.action == "move":
+            where: str = "end" if self.destination is None else f"before {self.destination}"
+            return f"move {self.key} to {where}"
+        return f"{self.action} {self.key} {params}".rstrip()
+
+
+class Plan:
+    """Ordered list of changes. str() of plan is a dry run output."""
+
+    def __init__(self, path: Path, changes: list[Change], ids: dict[NaturalKey, str]) -> None:
+        self.path: Path = path
+        self.changes: list[Change] = changes
+        # Natural key to .id of every existing row.
+        self.ids: dict[NaturalKey, str] = ids
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __str__(self) -> str:
+        return "\n".join(str(change) for change in self.changes)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path} changes={len(self.changes)}>"
+
+    def apply(self) -> None:
+        """
+        Execute every change. Rows are removed at once. Updates and additions are sent in one batch,
+        then moves in another one, once .id of added rows are known.
+        """
+        ids: dict[NaturalKey, str] = dict(self.ids)
+        removed: list[str] = [str(change.params[".id"]) for change in self.changes if change.action == "remove"]
+        if removed:
+            self.path.remove(*removed)
+        edits: list[Change] = [change for change in self.changes if change.action in ("set", "add")]
+        responses: list[Response] = self.batch(self.sentence(change, ids) for change in edits)
+        for change, response in zip(edits, responses, strict=True):
+            if change.action == "add":
+                ids[change.key] = str(response[0]["ret"])
+        self.batch(self.sentence(change, ids) for change in self.changes if change.action == "move")
+
+    def sentence(self, change: Change, ids: dict[NaturalKey, str]) -> tuple[str, ...]:
+        params: dict[str, ROSType] = dict(change.params)
+        if change.action == "set":
+            params[".id"] = ids[change.key]
+        elif change.action == "move":
+            params = {"numbers": ids[change.key]}
+            if change.destination is not None:
+                params["destination"] = ids[change.destination]
+        return (
+            join_path(self.path.path, change.action),
+            *(compose_word(name, value) for name, value in params.items()),
+        )
+
+    def batch(self, sentences: Iterable[tuple[str, ...]]) -> list[Response]:
+        """Send all sentences at once. Raise first error after all of them were processed."""
+        results: list[BatchResult] = self.path.api.batch(sentences)
+        for result in results:
+            if isinstance(result, ProtocolError):
+                raise result
+        return results  # type: ignore[return-value]  # errors were raised
+
+
+def natural_key(row: ReplyDict, key: Sequence[str]) -> NaturalKey:
+    return tuple(cast_to_api(row.get(name, "")) for name in key)
+
+
+def differs(current: ReplyDict, name: str, value: ROSType) -> bool:
+    return name not in current or cast_to_api(current[name]) != cast_to_api(value)
+
+
+def longest_increasing(positions: Sequence[int]) -> set[int]:
+    """Return indexes of positions which form longest increasing subsequence."""
+    tails: list[int] = []
+    tail_indexes: list[int] = []
+    previous: list[int] = [-1] * len(positions)
+    for index, position in enumerate(positions):
+        at: int = bisect_left(tails, position)
+        if at == len(tails):
+            tails.append(position)
+            tail_indexes.append(index)
+        else:
+            tails[at] = position
+            tail_indexes[at] = index
+        previous[index] = tail_indexes[at - 1] if at > 0 else -1
+    result: set[int] = set()
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index != -1:
+        result.add(index)
+        index = previous[index]
+    return result
+
+
+def moves(current: Sequence[NaturalKey], desired: Sequence[NaturalKey]) -> list[Change]:
+    """
+    Compute minimal number of moves which order current rows as desired.
+    Rows already in correct relative order (longest increasing subsequence) are not moved.
+    """
+    order: dict[NaturalKey, int] = {key: position for position, key in enumerate(current)}
+    stay: set[int] = longest_increasing([order[key] for key in desired])
+    changes: list[Change] = []
+    for index in reversed(range(len(desired))):
+        if index not in stay:
+            destination: NaturalKey | None = desired[index + 1] if index + 1 < len(desired) else None
+            changes.append(Change(action="move", key=desired[index], params={}, destination=destination))
+    return changes
+
+
+def plan(
+    path: Path,
+    desired: Iterable[ReplyDict],
+    *,
+    key: Sequence[str] = ("name",),
+    where: Sequence[str | QueryGen] = (),
+    ordered: bool = False,
+    remove: bool = True,
+) -> Plan:
+    """
+    Compare current rows with desired ones. Return changes needed to reach desired state.
+
+    Only .id, natural key and columns present in desired rows are read.
+
+    :param path: Path with rows. e.g. api.path('ip', 'firewall', 'filter')
+    :param desired: Desired rows.
+    :param key: Column names which identify a row.
+    :param where: Limit current rows to matching ones. e.g. Key('list') == 'blacklist'
+    :param ordered: Move rows so that their order matches desired one.
+    :param remove: Remove rows which are not desired.
+    """
+    desired = list(desired)
+    columns: dict[str, None] = dict.fromkeys((".id", *key))
+    for row in desired:
+        columns.update(dict.fromkeys(row))
+    current: dict[NaturalKey, ReplyDict] = {}
+    duplicates: list[ReplyDict] = []
+    for row in path.select(*(Key(name) for name in columns)).where(*where):
+        row_key: NaturalKey = natural_key(row, key)
+        if row_key in current:
+            duplicates.append(row)
+        else:
+            current[row_key] = row
+    ids: dict[NaturalKey, str] = {row_key: str(row[".id"]) for row_key, row in current.items()}
+
+    changes: list[Change] = []
+    wanted: dict[NaturalKey, ReplyDict] = {natural_key(row, key): row for row in desired}
+    if remove:
+        for row_key in (row_key for row_key in current if row_key not in wanted):
+            changes.append(Change(action="remove", key=row_key, params={".id": ids[row_key]}))
+        # Duplicates share natural key with a kept row. They are removed by .id in params only.
+        for row in duplicates:
+            changes.append(Change(action="remove", key=natural_key(row, key), params={".id": str(row[".id"])}))
+    for row_key, row in wanted.items():
+        if row_key not in current:
+            changes.append(Change(action="add", key=row_key, params=dict(row)))
+            continue
+        changed: dict[str, ROSType] = {
+            name: value for name, value in row.items() if name != ".id" and differs(current[row_key], name, value)
+        }
+        if changed:
+            changes.append(Change(action="set", key=row_key, params=changed))
+    if ordered:
+        # Added rows land at the end.
+        kept: list[NaturalKey] = [row_key for row_key in current if row_key in wanted]
+        kept += [row_key for row_key in wanted if row_key not in current]
+        changes += moves(kept, list(wanted))
+    return Plan(path=path, changes=changes, ids=ids)
+
+
+def reconcile(
+    path: Path,
+    desired: Iterable[ReplyDict],
+    *,
+    key: Sequence[str] = ("name",),
+    where: Sequence[str | QueryGen] = (),
+    ordered: bool = False,
+    remove: bool = True,
+    dry_run: bool = False,
+) -> Plan:
+    """
+    Bring rows in path to desired state. Apply only needed changes.
+
+    Arguments are the same as in plan().
+
+    :param dry_run: Only compute changes, do not apply them.
+    :returns: Computed (and applied unless dry_run) plan.
+    """
+    result: Plan = plan(path, desired, key=key, where=where, ordered=ordered, remove=remove)
+    if not dry_run:
+        result.apply()
+    return result
@@ -0,0 +1,254 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from inspect import isawaitable
+from random import uniform
+from typing import NamedTuple
+
+from librouteros.api import join_path
+from librouteros.pool import AsyncPool
+from librouteros.query import PreparedQuery
+from librouteros.types import Response
+
+
+class PollResult(NamedTuple):
+    """
+    Outcome of one scheduled poll.
+
+    :param host: Polled host.
+    :param query: Polled query.
+    :param rows: Returned rows. Empty on error.
+    :param error: Exception raised by query, if any.
+    :param lag: Seconds between time poll was due and time it started.
+    """
+
+    host: str
+    query: PreparedQuery
+    rows: Response
+    error: Exception | None
+    lag: float
+
+
+Callback = Callable[[PollResult], Awaitable[None] | None]
+
+
+class Stats:
+    """
+    Counters of one schedule.
+
+    :param runs: Finished polls.
+    :param skipped: Polls not started because previous one was still running, or timer fell behind.
+    :param coalesced: Polls which shared result of an identical query already running on same host.
+    :param errors: Polls which failed.
+    :param callback_errors: Exceptions raised by callbacks. Last one is kept in last_error.
+    :param last_lag: Lag of last poll in seconds.
+    :param max_lag: Largest lag seen.
+    :param total_lag: Sum of all lags.
+    :param last_duration: Seconds from start of last poll until rows were received, including wait for pool.
+    """
+
+    __slots__ = (
+        "callback_errors",
+        "coalesced",
+        "errors",
+        "last_duration",
+        "last_error",
+        "last_lag",
+        "max_lag",
+        "runs",
+        "skipped",
+        "total_lag",
+    )
+
+    def __init__(self) -> None:
+        self.runs: int = 0
+        self.skipped: int = 0
+        self.coalesced: int = 0
+        self.errors: int = 0
+        self.callback_errors: int = 0
+        self.last_error: Exception | None = None
+        self.last_lag: float = 0.0
+        self.max_lag: float = 0.0
+        self.total_lag: float = 0.0
+        self.last_duration: float = 0.0
+
+    @property
+    def mean_lag(self) -> float:
+        return self.total_lag / self.runs if self.runs else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} runs={self.runs} skipped={self.skipped} coalesced={self.coalesced} "
+            f"errors={self.errors} mean_lag={self.mean_lag:.3f} max_lag={self.max_lag:.3f}>"
+        )
+
+
+class Schedule:
+    """
+    Recurring poll of one query on one host. Jobs with same host, query and interval share one schedule.
+
+    :param base: Due time without jitter. Advances by exactly interval, so schedule does not drift.
+    """
+
+    __slots__ = ("base", "callbacks", "handle", "host", "interval", "query", "running", "stats")
+
+    def __init__(self, host: str, query: PreparedQuery, interval: float) -> None:
+        self.host: str = host
+        self.query: PreparedQuery = query
+        self.interval: float = interval
+        self.callbacks: list[Callback] = []
+        self.stats: Stats = Stats()
+        self.base: float = 0.0
+        self.handle: asyncio.TimerHandle | None = None
+        self.running: asyncio.Task[None] | None = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.host} {self.query.cmd} every {self.interval}s {self.stats!r}>"
+
+
+class Scheduler:
+    """
+    Run recurring polls on many hosts through AsyncPool.
+
+    First run of each schedule starts at random point within its interval, so that polls added at once
+    do not hit routers at once. Every run is moved by up to +-jitter * interval. Schedules do not drift.
+    A run is skipped while previous run of same schedule is still in flight. Identical queries on same host,
+    which are due at the same time, share one api call.
+
+    .. code-block:: python
+
+        async with AsyncPool(connect) as pool, Scheduler(pool) as scheduler:
+            for host in hosts:
+                scheduler.add(host, "/interface", 30, store)
+            await asyncio.sleep(3600)
+
+    :param pool: Pool used to run queries.
+    :param jitter: Fraction of interval by which each run is randomly moved.
+    :param spread: Start first run of each schedule at random point within interval instead of right away.
+    """
+
+    def __init__(self, pool: AsyncPool, *, jitter: float = 0.1, spread: bool = True) -> None:
+        if not 0 <= jitter < 0.5:
+            raise ValueError(f"Jitter must be >= 0 and < 0.5, got {jitter!r}")
+        self.pool: AsyncPool = pool
+        self.jitter: float = jitter
+        self.spread: bool = spread
+        self.schedules: dict[tuple[str, PreparedQuery, float], Schedule] = {}
+        self.inflight: dict[tuple[str, PreparedQuery], asyncio.Task[Response]] = {}
+        self.started: bool = False
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} schedules={len(self.schedules)} inflight={len(self.inflight)}>"
+
+    async def __aenter__(self) -> Scheduler:  # noqa PYI034
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    def add(self, host: str, query: PreparedQuery | str, interval: float, callback: Callback) -> Schedule:
+        """
+        Poll query on host every interval seconds and pass each PollResult to callback.
+        Callback may be a coroutine function.
+
+        :param query: Prepared query or path to print. e.g. "/interface"
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval must be > 0, got {interval!r}")
+        if isinstance(query, str):
+            query = PreparedQuery(cmd=join_path(query, "print"), words=())
+        key: tuple[str, PreparedQuery, float] = (host, query, interval)
+        schedule: Schedule | None = self.schedules.get(key)
+        if schedule is None:
+            schedule = self.schedules[key] = Schedule(host, query, interval)
+            if self.started:
+                self.arm(schedule)
+        schedule.callbacks.append(callback)
+        return schedule
+
+    def start(self) -> None:
+        """Arm timers of all schedules. Must be called from running event loop."""
+        self.started = True
+        for schedule in self.schedules.values():
+            if schedule.handle is None:
+                self.arm(schedule)
+
+    def arm(self, schedule: Schedule) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        offset: float = uniform(0, schedule.interval) if self.spread else 0.0  # noqa S311  # not security related
+        schedule.base = loop.time() + offset
+        schedule.handle = loop.call_at(schedule.base, self.fire, schedule, schedule.base)
+
+    def fire(self, schedule: Schedule, due: float) -> None:
+        """Start poll unless previous one is still running. Set timer for next one."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if schedule.running is not None and not schedule.running.done():
+            schedule.stats.skipped += 1
+        else:
+            schedule.running = loop.create_task(self.poll(schedule, due))
+        now: float = loop.time()
+        schedule.base += schedule.interval
+        # Timer fell behind by whole intervals (e.g. blocked event loop). Do not fire missed runs in burst.
+        while schedule.base <= now:
+            schedule.base += schedule.interval
+            schedule.stats.skipped += 1
+        moved: float = schedule.base + uniform(-self.jitter, self.jitter) * schedule.interval  # noqa S311
+        schedule.handle = loop.call_at(moved, self.fire, schedule, moved)
+
+    async def fetch(self, host: str, query: PreparedQuery) -> Response:
+        async with self.pool.acquire(host) as api:
+            return [row async for row in query(api)]
+
+    async def poll(self, schedule: Schedule, due: float) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        started: float = loop.time()
+        stats: Stats = schedule.stats
+        key: tuple[str, PreparedQuery] = (schedule.host, schedule.query)
+        fetch: asyncio.Task[Response] | None = self.inflight.get(key)
+        if fetch is None:
+            fetch = self.inflight[key] = loop.create_task(self.fetch(schedule.host, schedule.query))
+            fetch.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            stats.coalesced += 1
+        rows: Response = []
+        error: Exception | None = None
+        try:
+            # Shared by other polls. Cancelling this one must not cancel them.
+            rows = await asyncio.shield(fetch)
+        except Exception as exc:  # noqa BLE001  # passed to callbacks
+            error = exc
+            stats.errors += 1
+        lag: float = max(0.0, started - due)
+        stats.runs += 1
+        stats.last_lag = lag
+        stats.max_lag = max(stats.max_lag, lag)
+        stats.total_lag += lag
+        stats.last_duration = loop.time() - started
+        result: PollResult = PollResult(host=schedule.host, query=schedule.query, rows=rows, error=error, lag=lag)
+        for callback in tuple(schedule.callbacks):
+            try:
+                outcome = callback(result)
+                if isawaitable(outcome):
+                    await outcome
+            except Exception as exc:  # noqa BLE001  # one failing callback must not stop schedule
+                stats.callback_errors += 1
+                stats.last_error = exc
+
+    async def close(self) -> None:
+        """Stop all timers. Cancel running polls and wait for them."""
+        self.started = False
+        tasks: list[asyncio.Task] = [*self.inflight.values()]
+        for schedule in self.schedules.values():
+            if schedule.handle is not None:
+                schedule.handle.cancel()
+                schedule.handle = None
+            if schedule.running is not None:
+                tasks.append(schedule.running)
+                schedule.running = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,121 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from librouteros.exceptions import MultiTrapError, TrapError
+from librouteros.types import AsyncResponseIter, ReplyDict
+
+if TYPE_CHECKING:
+    from asyncio import Queue, Task
+
+    from librouteros.api import AsyncApi
+
+# Items passed from reader task to consumer. None marks end of response.
+Pending = tuple[str, ReplyDict] | BaseException | None
+
+
+class AsyncStream:
+    """
+    Yield rows of one response while they are being received.
+
+    Reader task puts sentences into bounded queue. When queue is full, reading from socket is paused,
+    so that router stops sending instead of rows piling up in memory. Reading is resumed when consumer
+    drains queue down to low_watermark.
+
+    :param api: AsyncApi instance. Must not be used by anything else until response is consumed.
+    :param cmd: Command word. eg. /ip/route/print
+    :param words: Raw api words.
+    :param maxsize: Maximum number of sentences waiting for consumer.
+    :param low_watermark: Resume reading when this many sentences are waiting. Defaults to half of maxsize.
+    """
+
+    def __init__(
+        self,
+        api: AsyncApi,
+        cmd: str,
+        *words: str,
+        maxsize: int = 1000,
+        low_watermark: int | None = None,
+    ) -> None:
+        self.api: AsyncApi = api
+        self.cmd: str = cmd
+        self.words: tuple[str, ...] = words
+        self.maxsize: int = maxsize
+        self.low_watermark: int = maxsize // 2 if low_watermark is None else low_watermark
+        # Metrics
+        self.depth: int = 0
+        self.max_depth: int = 0
+        self.pauses: int = 0
+        self.paused: bool = False
+        self.stopped: bool = False
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.cmd} depth={self.depth} max_depth={self.max_depth} pauses={self.pauses}>"
+        )
+
+    def pause(self) -> None:
+        if not self.paused:
+            self.paused = True
+            self.pauses += 1
+            self.api.protocol.transport.pause_reading()
+
+    def resume(self) -> None:
+        if self.paused:
+            self.paused = False
+            self.api.protocol.transport.resume_reading()
+
+    async def read(self, queue: Queue[Pending]) -> None:
+        """Read sentences untill !done is received. Pause reading when queue is full."""
+        reply_word: str | None = None
+        try:
+            while reply_word != "!done":
+                reply_word, row = await self.api.readSentence()
+                if self.stopped:
+                    continue
+                if queue.full():
+                    self.pause()
+                await queue.put((reply_word, row))
+                self.depth = queue.qsize()
+                self.max_depth = max(self.max_depth, self.depth)
+        except Exception as error:  # noqa BLE001  # reraised in consumer
+            if not self.stopped:
+                await queue.put(error)
+            return
+        if not self.stopped:
+            await queue.put(None)
+
+    async def __aiter__(self) -> AsyncResponseIter:
+        import asyncio
+
+        await self.api.protocol.writeSentence(self.cmd, *self.words)
+        queue: Queue[Pending] = asyncio.Queue(maxsize=self.maxsize)
+        reader: Task[None] = asyncio.ensure_future(self.read(queue))
+        traps: list[TrapError] = []
+        try:
+            while (item := await queue.get()) is not None:
+                self.depth = queue.qsize()
+                if self.depth <= self.low_watermark:
+                    self.resume()
+                if isinstance(item, BaseException):
+                    raise item
+                reply_word, row = item
+                if reply_word == "!trap":
+                    traps.append(TrapError(**row))  # type: ignore[arg-type]  # must be correct types
+                elif reply_word in ("!re", "!done") and row:
+                    yield row
+        finally:
+            # Let reader drain the rest of response, even when consumer stopped early.
+            self.stopped = True
+            while not queue.empty():
+                queue.get_nowait()
+            self.depth = 0
+            self.resume()
+            await asyncio.wait((reader,))
+
+        if len(traps) > 1:
+            raise MultiTrapError(*traps)
+        if len(traps) == 1:
+            raise traps[0]
@@ -0,0 +1,159 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future
+from itertools import count
+from threading import Lock, Thread
+
+from librouteros.api import Api
+from librouteros.batch import BatchResult, split_tag
+from librouteros.exceptions import ConnectionClosed, MultiTrapError, TrapError
+from librouteros.protocol import ApiProtocol, compose_word, parse_word
+from librouteros.types import ReplyDict, Response, ResponseIter, ROSType
+
+
+class Call:
+    """Response being collected for one tagged command."""
+
+    __slots__ = ("future", "response", "traps")
+
+    def __init__(self) -> None:
+        self.future: Future[Response] = Future()
+        # Command is sent right away. It can not be cancelled any more.
+        self.future.set_running_or_notify_cancel()
+        self.response: Response = []
+        self.traps: list[TrapError] = []
+
+    def feed(self, reply_word: str, row: ReplyDict) -> bool:
+        """
+        Add one received sentence.
+
+        :returns: True if response is complete.
+        """
+        if reply_word == "!trap":
+            self.traps.append(TrapError(**row))  # type: ignore[arg-type]  # must be correct types
+        elif reply_word in ("!re", "!done") and row:
+            self.response.append(row)
+        if reply_word != "!done":
+            return False
+        if len(self.traps) > 1:
+            self.future.set_exception(MultiTrapError(*self.traps))
+        elif len(self.traps) == 1:
+            self.future.set_exception(self.traps[0])
+        else:
+            self.future.set_result(self.response)
+        return True
+
+
+class ThreadSafeApi(Api):
+    """
+    Api which may be shared by many threads at once.
+
+    Every command is sent with unique .tag. One background thread reads all replies and
+    hands them over to the calling thread by tag. Threads never wait for each other's responses,
+    so many commands may be in flight on one session at the same time.
+
+    Helpers which use api.protocol directly (offload(), download(), profile()) are not supported.
+
+    .. code-block:: python
+
+        api = connect(host, username="admin", password="abc", subclass=ThreadSafeApi)
+        with ThreadPoolExecutor(16) as executor:
+            results = list(executor.map(lambda path: tuple(api.path(path)), paths))
+    """
+
+    def __init__(self, protocol: ApiProtocol) -> None:
+        super().__init__(protocol=protocol)
+        self.tags: count[int] = count()
+        self.calls: dict[str, Call] = {}
+        # Guards calls, reader and error.
+        self.lock: Lock = Lock()
+        # Only one thread at a time may write.
+        self.write_lock: Lock = Lock()
+        self.reader: Thread | None = None
+        # Set once connection broke. Raised for every new command.
+        self.error: Exception | None = None
+
+    def __call__(self, cmd: str, /, **kwargs: ROSType) -> ResponseIter:
+        words: tuple[str, ...] = tuple(compose_word(key, value) for key, value in kwargs.items())
+        yield from self.submit(cmd, *words).result()
+
+    def rawCmd(self, cmd: str, *words: str) -> ResponseIter:  # noqa N802
+        yield from self.submit(cmd, *words).result()
+
+    def submit(self, cmd: str, *words: str) -> Future[Response]:
+        """
+        Send command with raw words without waiting for response.
+
+        :returns: Future with response. Its result() raises TrapError or MultiTrapError if command failed.
+        """
+        return self.send([(cmd, *words)])[0]
+
+    def batch(self, sentences: Iterable[Sequence[str]]) -> list[BatchResult]:
+        """Same as Api.batch()."""
+        results: list[BatchResult] = []
+        for future in self.send(sentences):
+            try:
+                results.append(future.result())
+            except (TrapError, MultiTrapError) as error:
+                results.append(error)
+        return results
+
+    def send(self, sentences: Iterable[Sequence[str]]) -> list[Future[Response]]:
+        """Register a call for each sentence and write all of them at once."""
+        tagged: list[tuple[str, ...]] = []
+        futures: list[Future[Response]] = []
+        with self.write_lock:
+            with self.lock:
+                if self.error is not None:
+                    raise self.error
+                for sentence in sentences:
+                    tag: str = str(next(self.tags))
+                    call: Call = Call()
+                    # Registered before writing, so that reader never sees reply to unknown tag.
+                    self.calls[tag] = call
+                    futures.append(call.future)
+                    tagged.append((*sentence, f".tag={tag}"))
+                if self.reader is None and tagged:
+                    self.reader = Thread(target=self.read, name="librouteros-reader", daemon=True)
+                    self.reader.start()
+            if tagged:
+                try:
+                    self.protocol.writeSentences(*tagged)
+                except Exception as error:
+                    self.fail(error)
+                    raise
+        return futures
+
+    def read(self) -> None:
+        """Read replies untill connection breaks. Complete call which each reply belongs to."""
+        try:
+            while True:
+                reply_word, words = self.protocol.readSentence()
+                tag, rest = split_tag(words)
+                if tag is None:
+                    continue
+                row: ReplyDict = dict(parse_word(word) for word in rest)
+                with self.lock:
+                    call: Call | None = self.calls.get(tag)
+                    if call is not None and call.feed(reply_word, row):
+                        del self.calls[tag]
+        except Exception as error:  # noqa BLE001  # passed to every waiting thread
+            self.fail(error)
+
+    def fail(self, error: Exception) -> None:
+        """Fail every waiting call. First error (e.g. from close()) wins."""
+        with self.lock:
+            if self.error is None:
+                self.error = error
+            calls, self.calls = self.calls, {}
+        for call in calls.values():
+            call.future.set_exception(self.error)
+
+    def close(self) -> None:
+        with self.lock:
+            if self.error is None:
+                self.error = ConnectionClosed("Connection closed.")
+        super().close()
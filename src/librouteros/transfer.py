@@ -0,0 +1,284 @@
+# -*- coding: UTF-8 -*-
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import deque
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from librouteros.batch import TAG_PREFIX
+from librouteros.exceptions import MultiTrapError, ProtocolError, TrapError
+from librouteros.protocol import parse_word
+from librouteros.query import Key
+from librouteros.types import ReplyDict
+
+if TYPE_CHECKING:
+    from _hashlib import HASH
+
+    from librouteros.api import Api, AsyncApi
+
+# Maximum chunk size accepted by /file/read.
+CHUNK_SIZE: int = 32768
+DATA_PREFIX: bytes = b"=data="
+RAW_TAG_PREFIX: bytes = TAG_PREFIX.encode()
+
+NAME: Key = Key("name")
+SIZE: Key = Key("size")
+# Read to tell whether remote file changed since partial download. RouterOS 7 reports last-modified.
+IDENTITY: tuple[Key, ...] = (SIZE, Key("creation-time"), Key("last-modified"))
+
+
+class Download:
+    """
+    Keep track of /file/read chunk requests.
+
+    Up to concurrency requests, each with own .tag, are in flight at once.
+    Replies may arrive in any order. Chunks are released in file order.
+    When router returns less than requested, the rest is requested again.
+
+    :param name: Name of file on router.
+    :param size: Size of file on router.
+    :param offset: Position where download starts (size of already downloaded part).
+    :param chunk_size: Bytes requested at once.
+    :param concurrency: Maximum number of requests in flight.
+    """
+
+    def __init__(self, name: str, size: int, offset: int, chunk_size: int, concurrency: int) -> None:
+        self.name: str = name
+        self.size: int = size
+        self.chunk_size: int = chunk_size
+        self.concurrency: int = concurrency
+        # Offset of next chunk to request.
+        self.requested: int = offset
+        # Offset of next chunk to release.
+        self.written: int = offset
+        # Tag to (offset, length) of requested chunk.
+        self.in_flight: dict[str, tuple[int, int]] = {}
+        # Parts of short chunks which need to be requested again.
+        self.retries: deque[tuple[int, int]] = deque()
+        # Received, not yet released chunks keyed by offset.
+        self.received: dict[int, bytes] = {}
+        # Tag to number of bytes received for that request.
+        self.got: dict[str, int] = {}
+        self.traps: list[TrapError] = []
+
+    @property
+    def done(self) -> bool:
+        if self.in_flight:
+            return False
+        return bool(self.traps) or (not self.retries and self.written >= self.size)
+
+    def next_chunk(self) -> tuple[int, int] | None:
+        if self.retries:
+            return self.retries.popleft()
+        if self.requested < self.size:
+            offset: int = self.requested
+            self.requested += self.chunk_size
+            return offset, self.chunk_size
+        return None
+
+    def requests(self) -> list[tuple[str, ...]]:
+        """Tagged /file/read sentences filling up free request slots. Nothing is requested after failure."""
+        sentences: list[tuple[str, ...]] = []
+        while not self.traps and len(self.in_flight) < self.concurrency and (chunk := self.next_chunk()):
+            offset, length = chunk
+            self.in_flight[str(offset)] = chunk
+            sentences.append(
+                (
+                    "/file/read",
+                    f"=file={self.name}",
+                    f"=offset={offset}",
+                    f"=chunk-size={length}",
+                    f"{TAG_PREFIX}{offset}",
+                )
+            )
+        return sentences
+
+    def feed(self, reply_word: str, words: Sequence[bytes]) -> list[bytes]:
+        """
+        Process one raw reply sentence.
+
+        :returns: Chunks which can be written, in file order.
+        """
+        tag: str | None = None
+        data: bytes = b""
+        attributes: list[str] = []
+        for word in words:
+            if word.startswith(RAW_TAG_PREFIX):
+                tag = word[len(RAW_TAG_PREFIX) :].decode()
+            elif word.startswith(DATA_PREFIX):
+                data = word[len(DATA_PREFIX) :]
+            else:
+                attributes.append(word.decode(errors="ignore"))
+        if tag is None or tag not in self.in_flight:
+            return []
+        offset, length = self.in_flight[tag]
+        if reply_word == "!trap":
+            self.traps.append(TrapError(**dict(parse_word(word) for word in attributes)))  # type: ignore[arg-type]
+        elif data:
+            got: int = self.got.get(tag, 0)
+            self.received[offset + got] = data
+            self.got[tag] = got + len(data)
+        if reply_word == "!done":
+            del self.in_flight[tag]
+            got = self.got.pop(tag, 0)
+            if got == 0:
+                # File shrank on router.
+                self.size = min(self.size, offset)
+            elif got < length and offset + got < self.size:
+                self.retries.append((offset + got, length - got))
+        return self.release()
+
+    def release(self) -> list[bytes]:
+        chunks: list[bytes] = []
+        while self.written < self.size and self.written in self.received:
+            chunk: bytes = self.received.pop(self.written)
+            chunks.append(chunk)
+            self.written += len(chunk)
+        return chunks
+
+    def check(self) -> None:
+        """
+        :throws TrapError: If one chunk failed.
+        :throws MultiTrapError: If > 1 chunk failed.
+        :throws ProtocolError: If number of received bytes does not match file size.
+        """
+        if len(self.traps) > 1:
+            raise MultiTrapError(*self.traps)
+        if len(self.traps) == 1:
+            raise self.traps[0]
+        if self.written != self.size:
+            raise ProtocolError(f"Received {self.written} bytes of {self.name}, expected {self.size}")
+
+
+def remote_identity(row: ReplyDict) -> dict[str, str]:
+    """Properties which change when file on router is replaced or modified."""
+    return {str(key): str(row[str(key)]) for key in IDENTITY if str(key) in row}
+
+
+def state_path(destination: str) -> str:
+    """File next to destination which describes remote file the local part came from."""
+    return f"{destination}.remote"
+
+
+def local_state(destination: str, resume: bool, algorithm: str, identity: dict[str, str]) -> tuple[int, HASH]:
+    """
+    Return size of already downloaded part and checksum of it.
+    Start from scratch if not resuming, file does not exist, or it was downloaded from a different remote file
+    (other size or modification time). Identity of remote file is saved for next resume.
+    """
+    import json
+
+    digest = hashlib.new(algorithm)
+    offset: int = 0
+    if resume and os.path.exists(destination) and os.path.exists(state_path(destination)):
+        with open(state_path(destination)) as state:
+            saved: object = json.load(state)
+        if saved == identity:
+            with open(destination, "rb") as file:
+                while chunk := file.read(1024 * 1024):
+                    digest.update(chunk)
+                offset = file.tell()
+    if offset > int(identity["size"]):
+        offset, digest = 0, hashlib.new(algorithm)
+    with open(state_path(destination), "w") as state:
+        json.dump(identity, state)
+    return offset, digest
+
+
+def verify(destination: str, digest: HASH, expected: str | None) -> str:
+    """
+    Compare digest of whole local file with expected one.
+    On mismatch saved remote identity is removed, so next download starts from scratch.
+
+    :throws ProtocolError: If digests differ.
+    """
+    result: str = digest.hexdigest()
+    if expected is not None and result != expected.lower():
+        os.remove(state_path(destination))
+        raise ProtocolError(f"Checksum of {destination} is {result}, expected {expected}")
+    return result
+
+
+def download(
+    api: Api,
+    name: str,
+    destination: str,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    concurrency: int = 8,
+    resume: bool = True,
+    algorithm: str = "sha256",
+    expected: str | None = None,
+) -> str:
+    """
+    Download file from router using /file/read (RouterOS >= 7.13).
+
+    Many chunks are requested at once, so that throughput is not limited by round trip time.
+    When destination already exists and resume is True, only the missing end of file is downloaded.
+    Size and modification time of remote file are saved next to destination (destination.remote).
+    Download is resumed only if remote file still has the same ones.
+
+    :param api: Api instance.
+    :param name: Name of file on router. e.g. backup.rsc
+    :param destination: Local path.
+    :param chunk_size: Bytes requested at once.
+    :param concurrency: Maximum number of chunk requests in flight.
+    :param resume: Continue download of partially downloaded file.
+    :param algorithm: Checksum algorithm. Any supported by hashlib.
+    :param expected: Expected hex digest of whole file.
+    :returns: Hex digest of whole local file.
+    :throws FileNotFoundError: If file does not exist on router.
+    :throws TrapError: If reading chunk failed.
+    :throws ProtocolError: If digest differs from expected one.
+    """
+    rows = tuple(api.path("file").select(*IDENTITY).where(NAME == name))
+    if not rows:
+        raise FileNotFoundError(name)
+    size: int = int(rows[0]["size"])
+    offset, digest = local_state(destination, resume, algorithm, remote_identity(rows[0]))
+    transfer: Download = Download(name, size=size, offset=offset, chunk_size=chunk_size, concurrency=concurrency)
+    with open(destination, "ab" if offset else "wb") as file:
+        while not transfer.done:
+            if sentences := transfer.requests():
+                api.protocol.writeSentences(*sentences)
+            if not transfer.in_flight:
+                break
+            for chunk in transfer.feed(*api.protocol.readRawSentence()):
+                file.write(chunk)
+                digest.update(chunk)
+    transfer.check()
+    return verify(destination, digest, expected)
+
+
+async def async_download(
+    api: AsyncApi,
+    name: str,
+    destination: str,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    concurrency: int = 8,
+    resume: bool = True,
+    algorithm: str = "sha256",
+    expected: str | None = None,
+) -> str:
+    """Async version of download()."""
+    rows = [row async for row in api.path("file").select(*IDENTITY).where(NAME == name)]
+    if not rows:
+        raise FileNotFoundError(name)
+    size: int = int(rows[0]["size"])
+    offset, digest = local_state(destination, resume, algorithm, remote_identity(rows[0]))
+    transfer: Download = Download(name, size=size, offset=offset, chunk_size=chunk_size, concurrency=concurrency)
+    with open(destination, "ab" if offset else "wb") as file:  # noqa ASYNC230  # local file, small writes
+        while not transfer.done:
+            if sentences := transfer.requests():
+                await api.protocol.writeSentences(*sentences)
+            if not transfer.in_flight:
+                break
+            for chunk in transfer.feed(*await api.protocol.readRawSentence()):
+                file.write(chunk)
+                digest.update(chunk)
+    transfer.check()
+    return verify(destination, digest, expected)
@@ -0,0 +1,74 @@
+# -*- coding: UTF-8 -*-
+"""
+Fuzz target for sentence decoding. Compares optimized decoder and parser with tests/reference.py.
+
+Usage (needs atheris): python -m tests.fuzz.fuzz_sentence [libFuzzer options]
+Without atheris, the same target runs with hypothesis in tests/unit/test_codec_properties.py.
+"""
+
+import sys
+
+from librouteros.codec import decode_sentence, encode_length
+from librouteros.exceptions import ProtocolError
+from librouteros.protocol import SentenceParser
+from tests import reference
+
+
+def decode_all(data):
+    """Decode sentences one by one with decode_sentence()."""
+    sentences = []
+    offset = 0
+    while (result := decode_sentence(data, offset)) is not None:
+        words, offset = result
+        sentences.append(words)
+    return sentences, data[offset:]
+
+
+def parse_in_parts(data, split):
+    """Feed parser with two parts of data."""
+    parser = SentenceParser()
+    sentences = []
+    for part in (data[:split], data[split:]):
+        parser.feed(part)
+        while (sentence := parser.next_sentence()) is not None:
+            sentences.append(sentence)
+    return sentences
+
+
+def TestOneInput(data: bytes) -> None:
+    try:
+        expected = reference.decode_sentences(data)
+    except ProtocolError:
+        expected = None
+
+    try:
+        got = decode_all(data)
+    except ProtocolError:
+        got = None
+    if got != expected:
+        raise AssertionError(f"decode_sentence() {got!r} != reference {expected!r}")
+
+    split = data[0] % (len(data) + 1) if data else 0
+    try:
+        parsed = parse_in_parts(data, split)
+    except ProtocolError:
+        parsed = None
+    if parsed != (expected[0] if expected is not None else None):
+        raise AssertionError(f"SentenceParser {parsed!r} != reference {expected!r}")
+
+    for sentence in expected[0] if expected is not None else ():
+        for word in sentence:
+            if encode_length(len(word)) != reference.encode_length(len(word)):
+                raise AssertionError(f"encode_length({len(word)}) differs from reference")
+
+
+def main() -> None:
+    import atheris
+
+    atheris.instrument_all()
+    atheris.Setup(sys.argv, TestOneInput)
+    atheris.Fuzz()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: UTF-8 -*-
+"""
+Slow, obviously correct implementation of API framing, written straight from the protocol description.
+Optimized code in librouteros.codec and librouteros.protocol is checked against it.
+
+Length encoding:
+    0x00000000 - 0x0000007F  1 byte   0xxxxxxx
+    0x00000080 - 0x00003FFF  2 bytes  10xxxxxx xxxxxxxx
+    0x00004000 - 0x001FFFFF  3 bytes  110xxxxx xxxxxxxx xxxxxxxx
+    0x00200000 - 0x0FFFFFFF  4 bytes  1110xxxx xxxxxxxx xxxxxxxx xxxxxxxx
+    first byte >= 0xF0 is reserved (invalid)
+"""
+
+import re
+
+from librouteros.exceptions import ProtocolError
+
+# (upper bound of length, number of bytes, marker bits)
+RANGES = (
+    (0x80, 1, 0x00),
+    (0x4000, 2, 0x8000),
+    (0x200000, 3, 0xC00000),
+    (0x10000000, 4, 0xE0000000),
+)
+# Largest length of each encoded size.
+BOUNDARIES = (0x7F, 0x3FFF, 0x1FFFFF, 0xFFFFFFF)
+
+
+def encode_length(length):
+    for bound, size, marker in RANGES:
+        if 0 <= length < bound:
+            return (length | marker).to_bytes(size, "big")
+    raise ProtocolError(f"Unable to encode length {length!r}")
+
+
+def length_size(first_byte):
+    """Number of bytes of encoded length, given its first byte."""
+    if first_byte & 0x80 == 0:
+        return 1
+    if first_byte & 0xC0 == 0x80:
+        return 2
+    if first_byte & 0xE0 == 0xC0:
+        return 3
+    if first_byte & 0xF0 == 0xE0:
+        return 4
+    raise ProtocolError(f"Unknown controll byte {bytes((first_byte,))!r}")
+
+
+def decode_length(encoded):
+    size = length_size(encoded[0])
+    # Length encoded in n bytes has 7 * n bits.
+    return int.from_bytes(encoded[:size], "big") & ((1 << 7 * size) - 1)
+
+
+def decode_sentences(data):
+    """
+    Decode every complete sentence in data, one byte at a time.
+
+    :returns: List of sentences (lists of words) and rest of data which does not make a whole sentence.
+    :throws ProtocolError: On invalid length, if it comes before end of data.
+    """
+    sentences = []
+    words = []
+    position = 0
+    sentence_start = 0
+    while position < len(data):
+        size = length_size(data[position])
+        if position + size > len(data):
+            break
+        length = decode_length(data[position : position + size])
+        position += size
+        if length == 0:
+            sentences.append(words)
+            words = []
+            sentence_start = position
+            continue
+        if position + length > len(data):
+            break
+        words.append(bytes(data[position : position + length]))
+        position += length
+    return sentences, bytes(data[sentence_start:])
+
+
+def parse_word(word):
+    _, key, value = word.split("=", 2)
+    if value in ("yes", "true"):
+        return key, True
+    if value in ("no", "false"):
+        return key, False
+    # Only canonical integers. "00", "-0", "+1", " 1" or "1_0" stay strings.
+    if re.fullmatch("0|-?[1-9][0-9]*", value):
+        return key, int(value)
+    return key, value
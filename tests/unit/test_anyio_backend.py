@@ -0,0 +1,102 @@
+# -*- coding: UTF-8 -*-
+
+from functools import partial
+
+import pytest
+
+anyio = pytest.importorskip("anyio")
+
+from librouteros.anyio_backend import AnyioTransport, connect  # noqa E402
+from librouteros.exceptions import ConnectionClosed  # noqa E402
+from librouteros.protocol import AsyncApiProtocol  # noqa E402
+
+
+def available(backend):
+    try:
+        anyio.run(anyio.sleep, 0, backend=backend)
+    except (ImportError, LookupError):
+        return False
+    return True
+
+
+BACKENDS = [
+    pytest.param(name, marks=pytest.mark.skipif(not available(name), reason=name)) for name in ("asyncio", "trio")
+]
+
+
+async def fake_router(stream):
+    """Accept any login. Reply to print with 3 rows."""
+    protocol = AsyncApiProtocol(transport=AnyioTransport(stream), encoding="ASCII")
+    try:
+        while True:
+            cmd, _ = await protocol.readSentence()
+            if cmd.endswith("/print"):
+                for number in range(3):
+                    await protocol.writeSentence("!re", f"=name=ether{number}")
+            await protocol.writeSentence("!done")
+    except ConnectionClosed:
+        pass
+
+
+async def run_client(**kwargs):
+    async with await anyio.create_tcp_listener(local_host="127.0.0.1") as listener, anyio.create_task_group() as tg:
+        tg.start_soon(listener.serve, fake_router)
+        port = listener.extra(anyio.abc.SocketAttribute.local_port)  # noqa S610
+        api = await connect("127.0.0.1", username="admin", password="", port=port, **kwargs)
+        try:
+            return [row async for row in api.path("interface")]
+        finally:
+            await api.close()
+            tg.cancel_scope.cancel()
+
+
+class FakeStream:
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+        self.sent = []
+
+    async def send(self, data):
+        self.sent.append(data)
+
+    async def receive(self, max_bytes=65536):
+        if not self.chunks:
+            raise anyio.EndOfStream
+        return self.chunks.pop(0)
+
+    async def aclose(self):
+        pass
+
+
+class Test_AnyioTransport:
+    @pytest.mark.asyncio
+    async def test_read_joins_chunks(self):
+        transport = AnyioTransport(FakeStream(b"ab", b"cd", b"ef"))
+        assert await transport.read(3) == b"abc"
+        assert await transport.read(3) == b"def"
+
+    @pytest.mark.asyncio
+    async def test_read_raises_when_closed(self):
+        transport = AnyioTransport(FakeStream(b"ab"))
+        with pytest.raises(ConnectionClosed):
+            await transport.read(3)
+
+    @pytest.mark.asyncio
+    async def test_wait_for_timeout(self):
+        transport = AnyioTransport(FakeStream())
+        with pytest.raises(TimeoutError):
+            await transport.wait_for(anyio.sleep(1), 0.01)
+
+    @pytest.mark.asyncio
+    async def test_protocol_timeout_uses_transport(self):
+        protocol = AsyncApiProtocol(transport=AnyioTransport(FakeStream()), encoding="ASCII", timeout=0.01)
+
+        async def result():
+            return "result"
+
+        assert await protocol.wait(result()) == "result"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_connect_and_print(backend):
+    rows = anyio.run(partial(run_client, timeout=5), backend=backend)
+    assert rows == [{"name": f"ether{number}"} for number in range(3)]
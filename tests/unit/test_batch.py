@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from librouteros.api import Api, AsyncApi
+from librouteros.batch import Batch, split_tag, tag_sentences
+from librouteros.exceptions import MultiTrapError, TrapError
+
+REPLIES = (
+    ("!re", ("=name=ether1", ".tag=1")),
+    ("!re", ("=cpu-load=3", ".tag=0")),
+    ("!trap", ("=message=no such command", ".tag=2")),
+    ("!done", (".tag=0",)),
+    ("!re", ("=name=ether2", ".tag=1")),
+    ("!done", (".tag=2",)),
+    ("!done", (".tag=1",)),
+)
+
+
+def test_tag_sentences():
+    assert tag_sentences([("/system/resource/print",), ("/ip/route/print", "=count-only=")]) == [
+        ("/system/resource/print", ".tag=0"),
+        ("/ip/route/print", "=count-only=", ".tag=1"),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("words", "expected"),
+    (
+        (("=name=ether1", ".tag=3"), ("3", ("=name=ether1",))),
+        ((".tag=3", "=name=ether1"), ("3", ("=name=ether1",))),
+        (("=name=ether1",), (None, ("=name=ether1",))),
+    ),
+)
+def test_split_tag(words, expected):
+    assert split_tag(words) == expected
+
+
+class Test_Batch:
+    def setup_method(self):
+        self.batch = Batch(count=3)
+
+    def test_demultiplexes_replies(self):
+        for reply in REPLIES:
+            self.batch.feed(*reply)
+        assert self.batch.done
+        resource, interfaces, error = self.batch.results()
+        assert resource == [{"cpu-load": 3}]
+        assert interfaces == [{"name": "ether1"}, {"name": "ether2"}]
+        assert isinstance(error, TrapError)
+        assert error.message == "no such command"
+
+    def test_multiple_traps(self):
+        self.batch.feed("!trap", ("=message=first", ".tag=0"))
+        self.batch.feed("!trap", ("=message=second", ".tag=0"))
+        assert isinstance(self.batch.results()[0], MultiTrapError)
+
+    def test_done_only_after_every_done(self):
+        for reply in REPLIES[:-1]:
+            self.batch.feed(*reply)
+        assert not self.batch.done
+
+    @pytest.mark.parametrize("words", ((), (".tag=7",), (".tag=abc",)))
+    def test_ignores_unknown_tags(self, words):
+        self.batch.feed("!done", words)
+        assert self.batch.pending == {"0", "1", "2"}
+
+
+COMMANDS = (
+    ("/system/resource/print",),
+    ("/interface/print", "=.proplist=name"),
+    ("/nonexistent",),
+)
+
+
+def test_api_batch():
+    api = Api(protocol=Mock())
+    api.protocol.readSentence.side_effect = REPLIES
+    results = api.batch(COMMANDS)
+    api.protocol.writeSentences.assert_called_once_with(
+        ("/system/resource/print", ".tag=0"),
+        ("/interface/print", "=.proplist=name", ".tag=1"),
+        ("/nonexistent", ".tag=2"),
+    )
+    assert results[:2] == [[{"cpu-load": 3}], [{"name": "ether1"}, {"name": "ether2"}]]
+    assert isinstance(results[2], TrapError)
+
+
+def test_api_batch_empty():
+    api = Api(protocol=Mock())
+    assert api.batch([]) == []
+    api.protocol.writeSentences.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_api_batch():
+    api = AsyncApi(protocol=AsyncMock())
+    api.protocol.readSentence.side_effect = REPLIES
+    results = await api.batch(COMMANDS)
+    api.protocol.writeSentences.assert_awaited_once()
+    assert results[:2] == [[{"cpu-load": 3}], [{"name": "ether1"}, {"name": "ether2"}]]
+    assert isinstance(results[2], TrapError)
@@ -0,0 +1,66 @@
+# -*- coding: UTF-8 -*-
+
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from librouteros.charset import ascii_compatible, decode_text, encode_errors
+from librouteros.codec import decode_sentence
+from librouteros.connections import SocketTransport
+from librouteros.protocol import ApiProtocol, encode_sentence
+
+COMMENT = "=comment=zażółć".encode()
+
+
+@pytest.mark.parametrize(
+    ("encoding", "expected"),
+    (("ASCII", True), ("utf-8", True), ("latin-1", True), ("cp1250", True), ("utf-16", False)),
+)
+def test_ascii_compatible(encoding, expected):
+    assert ascii_compatible(encoding) is expected
+
+
+@given(
+    st.lists(st.binary(max_size=50), max_size=10),
+    st.sampled_from(("ASCII", "utf-8", "latin-1", "cp1250")),
+    st.sampled_from(("ignore", "surrogateescape", "replace")),
+)
+def test_same_as_decoding_each_word(words, encoding, errors):
+    assert decode_text(words, encoding, errors) == tuple(word.decode(encoding, errors) for word in words)
+
+
+def test_ascii_ignores_by_default():
+    assert decode_text((b"!re", COMMENT), "ASCII") == ("!re", "=comment=za")
+
+
+def test_utf8():
+    assert decode_text((b"!re", COMMENT), "utf-8") == ("!re", "=comment=zażółć")
+
+
+def test_strict_raises():
+    with pytest.raises(UnicodeDecodeError):
+        decode_text((b"!re", b"=comment=\xff"), "utf-8", "strict")
+
+
+def test_surrogateescape_round_trip():
+    words = (b"!re", b"=comment=\xff\xfe" + COMMENT)
+    decoded = decode_text(words, "utf-8", "surrogateescape")
+    encoded = encode_sentence(*decoded, encoding="utf-8", errors=encode_errors("surrogateescape"))
+    assert decode_sentence(encoded) == (list(words), len(encoded))
+
+
+@pytest.mark.parametrize(("errors", "expected"), (("surrogateescape", "surrogateescape"), ("ignore", "strict")))
+def test_encode_errors(errors, expected):
+    assert encode_errors(errors) == expected
+
+
+def test_protocol_writes_back_what_it_read():
+    data = b"\x03!re" + bytes((len(COMMENT) + 1,)) + COMMENT + b"\xff\x00"
+    protocol = ApiProtocol(transport=MagicMock(spec=SocketTransport), encoding="utf-8", errors="surrogateescape")
+    protocol.transport.read.side_effect = BytesIO(data).read
+    reply_word, words = protocol.readSentence()
+    protocol.writeSentence(reply_word, *words)
+    protocol.transport.write.assert_called_once_with(data)
@@ -0,0 +1,41 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+
+from librouteros.codec import decode_sentence, encode_length
+from librouteros.exceptions import ProtocolError
+from librouteros.protocol import encode_sentence
+
+
+@pytest.mark.parametrize("length", (-1, 0x10000000))
+def test_encode_length_raises(length):
+    with pytest.raises(ProtocolError):
+        encode_length(length)
+
+
+def test_decode_sentence(valid_word_length):
+    # Zero length word is the sentence end.
+    word = b"x" * max(min(valid_word_length.integer, 0x4000), 1)
+    data = encode_length(len(word)) + word + b"\x00"
+    assert decode_sentence(data) == ([word], len(data))
+
+
+def test_decode_sentence_at_offset():
+    first = encode_sentence("!re", "=name=ether1", encoding="ASCII")
+    second = encode_sentence("!done", encoding="ASCII")
+    data = bytearray(first + second)
+    words, offset = decode_sentence(data)
+    assert words == [b"!re", b"=name=ether1"]
+    assert decode_sentence(data, offset) == ([b"!done"], len(data))
+
+
+@pytest.mark.parametrize("word_length", (5, 200, 20000, 0x200000))
+def test_decode_sentence_incomplete(word_length):
+    data = encode_sentence("x" * word_length, encoding="ASCII")
+    for end in (0, 1, 2, 3, len(data) - 1):
+        assert decode_sentence(data[:end]) is None
+
+
+def test_decode_sentence_raises(bad_first_length_bytes):
+    with pytest.raises(ProtocolError):
+        decode_sentence(bad_first_length_bytes + b"\x00")
@@ -0,0 +1,107 @@
+# -*- coding: UTF-8 -*-
+"""Optimized codec must behave exactly like tests/reference.py."""
+
+import pytest
+from hypothesis import assume, example, given
+from hypothesis import strategies as st
+
+from librouteros.codec import decode_length, decode_sentence, determine_length, encode_length
+from librouteros.exceptions import ProtocolError
+from librouteros.protocol import SentenceParser, compose_word, encode_sentence, parse_word
+from tests import reference
+from tests.fuzz.fuzz_sentence import TestOneInput
+
+EDGES = sorted({edge + delta for edge in (0, *reference.BOUNDARIES) for delta in (-1, 0, 1)} - {-1})
+LENGTHS = st.one_of(st.sampled_from(EDGES), st.integers(0, 0xFFFFFFF)).filter(lambda length: length <= 0xFFFFFFF)
+WORDS = st.lists(st.binary(min_size=1, max_size=300), max_size=8)
+
+
+@pytest.mark.parametrize("length", EDGES)
+def test_length_round_trip_at_boundaries(length):
+    if length > 0xFFFFFFF:
+        with pytest.raises(ProtocolError):
+            encode_length(length)
+        return
+    encoded = encode_length(length)
+    assert encoded == reference.encode_length(length)
+    assert decode_length(encoded) == length
+    assert determine_length(encoded[:1]) == len(encoded) - 1
+
+
+@given(LENGTHS)
+def test_length_matches_reference(length):
+    encoded = encode_length(length)
+    assert encoded == reference.encode_length(length)
+    assert decode_length(encoded) == reference.decode_length(encoded) == length
+
+
+@given(st.binary(min_size=4, max_size=4))
+def test_decode_length_of_any_bytes(data):
+    try:
+        expected = reference.decode_length(data)
+    except ProtocolError:
+        with pytest.raises(ProtocolError):
+            decode_length(data)
+        with pytest.raises(ProtocolError):
+            determine_length(data)
+        return
+    assert decode_length(data) == expected
+    assert determine_length(data) == reference.length_size(data[0]) - 1
+
+
+@given(st.one_of(st.integers(max_value=-1), st.integers(min_value=0x10000000)))
+def test_encode_length_out_of_range(length):
+    with pytest.raises(ProtocolError):
+        encode_length(length)
+
+
+@pytest.mark.parametrize("length", (0x7F, 0x80, 0x3FFF, 0x4000, 0x1FFFFF, 0x200000))
+def test_sentence_round_trip_at_boundaries(length):
+    word = b"x" * length
+    data = encode_length(length) + word + b"\x00"
+    assert decode_sentence(data) == ([word], len(data))
+    assert reference.decode_sentences(data) == ([[word]], b"")
+
+
+@given(st.lists(WORDS, max_size=5))
+def test_sentences_round_trip(sentences):
+    data = b"".join(b"".join(encode_length(len(word)) + word for word in words) + b"\x00" for words in sentences)
+    assert reference.decode_sentences(data) == (sentences, b"")
+    parser = SentenceParser()
+    parser.feed(data)
+    assert [parser.next_sentence() for _ in sentences] == sentences
+    assert parser.next_sentence() is None
+
+
+@given(st.lists(st.text(min_size=1), min_size=1, max_size=8))
+def test_encode_sentence_round_trip(words):
+    data = encode_sentence(*words, encoding="UTF-8")
+    assert decode_sentence(data) == ([word.encode("UTF-8") for word in words], len(data))
+
+
+@given(st.binary(max_size=600))
+@example(b"")
+@example(b"\x00")
+@example(b"\x03!re\x00\xf0")
+@example(b"\x81\x00" + b"x" * 0x100 + b"\x00")
+def test_fuzz_target(data):
+    TestOneInput(data)
+
+
+@given(st.text().filter(lambda key: "=" not in key), st.text())
+@example("key", "00")
+@example("key", "-0")
+@example("key", "+1")
+@example("key", " 1")
+@example("key", "1_0")
+@example("key", "\u0661")
+def test_parse_word_matches_reference(key, value):
+    word = f"={key}={value}"
+    assert parse_word(word) == reference.parse_word(word)
+
+
+@given(st.text().filter(lambda key: "=" not in key), st.one_of(st.integers(), st.booleans(), st.text()))
+def test_compose_parse_round_trip(key, value):
+    if isinstance(value, str):
+        assume(reference.parse_word(f"={key}={value}")[1] == value)
+    assert parse_word(compose_word(key, value)) == (key, value)
@@ -2,14 +2,26 @@
 
 import socket
 from asyncio import StreamReader, StreamWriter
-from unittest.mock import MagicMock, call
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
-from librouteros.connections import AsyncSocketTransport, SocketTransport
+from librouteros.api import Api
+from librouteros.connections import (
+    AsyncRecordingTransport,
+    AsyncReplayTransport,
+    AsyncSocketTransport,
+    RecordingTransport,
+    ReplayTransport,
+    SocketTransport,
+    read_records,
+)
 from librouteros.exceptions import (
     ConnectionClosed,
+    ProtocolError,
 )
+from librouteros.protocol import ApiProtocol, encode_sentence
 
 
 class Test_SocketTransport:
@@ -119,3 +131,115 @@ class Test_AsyncSocketTransport:
         self.transport.reader.read.side_effect = exception
         with pytest.raises(exception):
             await self.transport.read(2)
+
+    def test_pause_reading(self):
+        transport = self.transport.writer.transport
+        transport.is_reading.return_value = True
+        self.transport.pause_reading()
+        transport.pause_reading.assert_called_once_with()
+
+    def test_pause_reading_when_paused(self):
+        transport = self.transport.writer.transport
+        transport.is_reading.return_value = False
+        self.transport.pause_reading()
+        transport.pause_reading.assert_not_called()
+
+    def test_resume_reading(self):
+        transport = self.transport.writer.transport
+        transport.is_reading.return_value = False
+        transport.is_closing.return_value = False
+        self.transport.resume_reading()
+        transport.resume_reading.assert_called_once_with()
+
+    def test_resume_reading_when_closing(self):
+        transport = self.transport.writer.transport
+        transport.is_reading.return_value = False
+        transport.is_closing.return_value = True
+        self.transport.resume_reading()
+        transport.resume_reading.assert_not_called()
+
+
+RESPONSE = encode_sentence("!re", "=name=ether1", encoding="ASCII") + encode_sentence("!done", encoding="ASCII")
+
+
+def record_session():
+    inner = MagicMock(spec=SocketTransport)
+    stream = BytesIO(RESPONSE)
+    inner.read.side_effect = stream.read
+    trace = BytesIO()
+    # Frozen clock. All reads fall within coalescing window, no matter how slow test runs.
+    with patch("librouteros.connections.monotonic", return_value=0):
+        api = Api(protocol=ApiProtocol(transport=RecordingTransport(inner, trace), encoding="ASCII"))
+        rows = tuple(api("/interface/print"))
+        api.close()
+    trace.seek(0)
+    return rows, trace
+
+
+class Test_RecordingTransport:
+    def test_records_are_coalesced(self):
+        rows, trace = record_session()
+        assert rows == ({"name": "ether1"},)
+        records = tuple(read_records(trace))
+        assert [record.direction for record in records] == [b"w", b"r"]
+        assert records[0].data == encode_sentence("/interface/print", encoding="ASCII")
+        assert records[1].data == RESPONSE
+
+    @pytest.mark.asyncio
+    async def test_async_records(self):
+        inner = AsyncMock()
+        inner.read.return_value = b"data"
+        trace = BytesIO()
+        transport = AsyncRecordingTransport(inner, trace)
+        await transport.write(b"cmd")
+        assert await transport.read(4) == b"data"
+        await transport.close()
+        trace.seek(0)
+        assert [record.data for record in read_records(trace)] == [b"cmd", b"data"]
+        inner.close.assert_awaited_once_with()
+
+
+class Test_ReplayTransport:
+    def test_replays_session(self):
+        rows, trace = record_session()
+        api = Api(protocol=ApiProtocol(transport=ReplayTransport(trace), encoding="ASCII"))
+        assert tuple(api("/interface/print")) == rows
+
+    def test_does_not_keep_written_data(self):
+        rows, trace = record_session()
+        transport = ReplayTransport(trace)
+        api = Api(protocol=ApiProtocol(transport=transport, encoding="ASCII"))
+        assert tuple(api("/interface/print")) == rows
+        assert transport.replay.expected == b""
+
+    def test_raises_when_session_ends(self):
+        transport = ReplayTransport(BytesIO())
+        with pytest.raises(ConnectionClosed):
+            transport.read(1)
+
+    def test_strict_checks_written_data(self):
+        _, trace = record_session()
+        transport = ReplayTransport(trace, strict=True)
+        with pytest.raises(ProtocolError):
+            transport.write(encode_sentence("/ip/address/print", encoding="ASCII"))
+
+    @patch("librouteros.connections.blocking_sleep")
+    @patch("librouteros.connections.monotonic", return_value=0)
+    def test_timing(self, monotonic_mock, sleep_mock):
+        trace = BytesIO()
+        recorder = RecordingTransport(MagicMock(**{"read.return_value": b"x"}), trace)
+        recorder.trace.started = 0
+        monotonic_mock.return_value = 2.5
+        recorder.read(1)
+        recorder.close()
+        trace.seek(0)
+        monotonic_mock.return_value = 0
+        ReplayTransport(trace, timing=True).read(1)
+        sleep_mock.assert_called_once_with(2.5)
+
+    @pytest.mark.asyncio
+    async def test_async_replays_session(self):
+        _, trace = record_session()
+        transport = AsyncReplayTransport(trace, strict=True)
+        await transport.write(encode_sentence("/interface/print", encoding="ASCII"))
+        assert await transport.read(len(RESPONSE)) == RESPONSE
@@ -0,0 +1,70 @@
+# -*- coding: UTF-8 -*-
+
+from array import array
+from unittest.mock import Mock
+
+import pytest
+
+from librouteros.api import Api
+from librouteros.counters import CounterPoller, deltas
+
+
+def rows(*counters):
+    return [
+        {".id": f"*{index}", "name": f"ether{index}", "rx-byte": rx, "tx-byte": tx}
+        for index, (rx, tx) in enumerate(counters, start=1)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("current", "previous", "wrap", "expected"),
+    (
+        ((150,), (100,), 2**64, [50]),
+        ((10,), (2**32 - 10,), 2**32, [20]),
+        # Implausible wrap. Counter was reset.
+        ((5,), (1000,), 2**64, [5]),
+    ),
+)
+def test_deltas(current, previous, wrap, expected):
+    assert deltas(array("Q", current), array("Q", previous), wrap) == expected
+
+
+class Test_CounterPoller:
+    def setup_method(self):
+        self.api = Api(protocol=Mock())
+        self.api.rawCmd = Mock()
+        self.poller = CounterPoller(self.api.path("interface"), counters=("rx-byte", "tx-byte"))
+
+    def test_read(self):
+        self.api.rawCmd.return_value = iter(())
+        self.poller.read()
+        self.api.rawCmd.assert_called_once_with("/interface/print", "=stats=", "=.proplist=.id,name,rx-byte,tx-byte")
+
+    def test_first_update_only_stores(self):
+        assert self.poller.update(rows((100, 200)), now=10.0) == []
+        assert self.poller.columns == [array("Q", [100]), array("Q", [200])]
+
+    def test_emits_only_changed(self):
+        self.poller.update(rows((100, 200), (5, 5)), now=10.0)
+        (sample,) = self.poller.update(rows((300, 200), (5, 5)), now=12.0)
+        assert sample.id == "*1"
+        assert sample.name == "ether1"
+        assert sample.interval == 2.0
+        assert sample.deltas == (200, 0)
+        assert sample.rates == (100.0, 0.0)
+
+    def test_new_and_removed_interfaces(self):
+        self.poller.update(rows((100, 100), (100, 100)), now=1.0)
+        current = [
+            {".id": "*2", "name": "ether2", "rx-byte": 150, "tx-byte": 100},
+            {".id": "*3", "name": "ether3", "rx-byte": 999, "tx-byte": 999},
+        ]
+        samples = self.poller.update(current, now=2.0)
+        assert [(sample.id, sample.deltas) for sample in samples] == [("*2", (50, 0))]
+
+    def test_poll(self):
+        self.api.rawCmd.side_effect = (iter(rows((100, 200))), iter(rows((150, 200))))
+        assert self.poller.poll() == []
+        (sample,) = self.poller.poll()
+        assert sample.deltas == (50, 0)
+        assert sample.interval > 0
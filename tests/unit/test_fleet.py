@@ -0,0 +1,76 @@
+# -*- coding: UTF-8 -*-
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from librouteros.exceptions import ConnectionClosed, FleetError, TrapError
+from librouteros.fleet import Fleet, HostResult
+
+
+class Test_Fleet:
+    def setup_method(self):
+        self.connect = MagicMock(side_effect=lambda host: MagicMock(name=host))
+        self.fleet = Fleet(connect=self.connect, max_workers=4)
+
+    def teardown_method(self):
+        self.fleet.close()
+
+    def test_map_ordered(self):
+        hosts = [f"10.0.0.{i}" for i in range(10)]
+        results = list(self.fleet.map(lambda api: api._mock_name, hosts))
+        assert [r.host for r in results] == hosts
+        assert [r.result for r in results] == hosts
+
+    def test_map_as_completed_yields_every_host(self):
+        hosts = [f"10.0.0.{i}" for i in range(10)]
+        results = list(self.fleet.map(lambda api: 1, hosts, ordered=False))
+        assert sorted(r.host for r in results) == sorted(hosts)
+
+    def test_reuses_connection(self):
+        tuple(self.fleet.map(lambda api: 1, ["host"]))
+        tuple(self.fleet.map(lambda api: 1, ["host"]))
+        self.connect.assert_called_once_with("host")
+
+    def test_reconnects_after_connection_error(self):
+        def func(api):
+            raise ConnectionClosed("closed")
+
+        result = next(self.fleet.map(func, ["host"]))
+        assert isinstance(result.error, ConnectionClosed)
+        tuple(self.fleet.map(lambda api: 1, ["host"]))
+        assert self.connect.call_count == 2
+
+    def test_trap_keeps_connection(self):
+        def func(api):
+            raise TrapError(message="no such item")
+
+        result = next(self.fleet.map(func, ["host"]))
+        assert result == HostResult(host="host", result=None, error=result.error)
+        tuple(self.fleet.map(lambda api: 1, ["host"]))
+        self.connect.assert_called_once_with("host")
+
+    def test_gather_aggregates_errors(self):
+        def func(api):
+            if api._mock_name == "bad":
+                raise TrapError(message="failure")
+            return 1
+
+        with pytest.raises(FleetError) as error:
+            self.fleet.gather(func, ["good", "bad"])
+        assert error.value.results == {"good": 1}
+        assert tuple(error.value.errors) == ("bad",)
+        assert str(error.value) == "bad: TrapError(failure)"
+
+    def test_call(self):
+        self.fleet.connect = MagicMock()
+        self.fleet.connect.return_value.return_value = iter(({"name": "ether1"},))
+        assert self.fleet(["host"], "/interface/print", stats=True) == {"host": [{"name": "ether1"}]}
+        self.fleet.connect.return_value.assert_called_once_with("/interface/print", stats=True)
+
+    def test_close_closes_connections(self):
+        tuple(self.fleet.map(lambda api: 1, ["host"]))
+        api = self.fleet.connections["host"]
+        self.fleet.close()
+        api.close.assert_called_once_with()
+        assert self.fleet.connections == {}
@@ -0,0 +1,28 @@
+# -*- coding: UTF-8 -*-
+
+import subprocess
+import sys
+
+import pytest
+
+
+def import_librouteros():
+    return subprocess.run(
+        [sys.executable, "-c", "import sys, librouteros; print(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+@pytest.mark.parametrize("module", ("asyncio", "ssl", "socket", "hashlib", "binascii", "concurrent.futures"))
+def test_import_does_not_load(module):
+    assert module not in import_librouteros().stdout.split()
+
+
+def test_login_methods_are_exported():
+    import librouteros
+    from librouteros.login import async_token, token
+
+    assert librouteros.token is token
+    assert librouteros.async_token is async_token
@@ -38,6 +38,8 @@ TRANSPORT_PARAMS = ("timeout", "port", "saddr", "ssl_wrapper")
         ("encoding", "ASCII"),
         ("login_method", plain),
         ("ssl_wrapper", None),
+        ("max_word_size", None),
+        ("sink", None),
     ),
 )
 def test_defaults(key, value):
@@ -54,6 +56,8 @@ def test_defaults(key, value):
         ("encoding", "ASCII"),
         ("login_method", async_plain),
         ("ssl_wrapper", None),
+        ("max_word_size", None),
+        ("sink", None),
     ),
 )
 def test_async_defaults(key, value):
@@ -67,6 +71,9 @@ def test_default_keys():
         "saddr",
         "subclass",
         "encoding",
+        "errors",
+        "max_word_size",
+        "sink",
         "login_method",
         "ssl_wrapper",
     }
@@ -79,6 +86,9 @@ def test_async_default_keys():
         "saddr",
         "subclass",
         "encoding",
+        "errors",
+        "max_word_size",
+        "sink",
         "login_method",
         "ssl_wrapper",
     }
@@ -107,7 +117,7 @@ def test_create_transport_passes_src_addr(conn_mock):
 
 
 @pytest.mark.asyncio
-@patch("librouteros.asyncio.open_connection")
+@patch("asyncio.open_connection")
 async def test_async_create_transport_passes_src_addr(conn_mock):
     params = {k: v for k, v in ASYNC_DEFAULTS.items() if k in TRANSPORT_PARAMS}
     conn_mock.return_value = (Mock(), Mock())
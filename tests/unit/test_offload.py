@@ -0,0 +1,77 @@
+# -*- coding: UTF-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from librouteros.api import Api
+from librouteros.exceptions import MultiTrapError, TrapError
+from librouteros.offload import decode_batch, offload
+from librouteros.protocol import ApiProtocol
+
+
+def make_api(*sentences):
+    protocol = MagicMock(spec=ApiProtocol)
+    protocol.encoding = "ASCII"
+    protocol.errors = "ignore"
+    protocol.readRawSentence.side_effect = sentences
+    return Api(protocol=protocol)
+
+
+ROWS = tuple(("!re", (b"=.id=*" + str(i).encode(), b"=disabled=false")) for i in range(25))
+
+
+def test_decode_batch():
+    assert decode_batch([("!re", (b"=mtu=1500", b"=name=ether1"))], "ASCII") == [
+        ("!re", {"mtu": 1500, "name": "ether1"}),
+    ]
+
+
+@pytest.mark.parametrize("batch_size", (1, 7, 1000))
+def test_offload_preserves_order(batch_size):
+    api = make_api(*ROWS, ("!done", ()))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        rows = tuple(offload(api, executor, "/ip/route/print", "=detail=", batch_size=batch_size, max_pending=2))
+    assert rows == tuple({".id": f"*{i}", "disabled": False} for i in range(25))
+    api.protocol.writeSentence.assert_called_once_with("/ip/route/print", "=detail=")
+
+
+def test_offload_skips_empty_sentences():
+    api = make_api(("!empty", ()), ("!done", ()))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert tuple(offload(api, executor, "/ip/route/print")) == ()
+
+
+def test_offload_process_pool():
+    api = make_api(*ROWS, ("!done", ()))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        rows = tuple(offload(api, executor, "/ip/route/print", batch_size=10))
+    assert len(rows) == 25
+
+
+def test_offload_raises_trap():
+    api = make_api(*ROWS, ("!trap", (b"=message=failure",)), ("!done", ()))
+    with ThreadPoolExecutor(max_workers=1) as executor, pytest.raises(TrapError):
+        tuple(offload(api, executor, "/ip/route/print"))
+
+
+def test_offload_raises_multi_trap():
+    api = make_api(("!trap", (b"=message=one",)), ("!trap", (b"=message=two",)), ("!done", ()))
+    with ThreadPoolExecutor(max_workers=1) as executor, pytest.raises(MultiTrapError):
+        tuple(offload(api, executor, "/ip/route/print"))
+
+
+def test_offload_reraises_reader_errors():
+    api = make_api(*ROWS[:2], ConnectionResetError())
+    with ThreadPoolExecutor(max_workers=1) as executor, pytest.raises(ConnectionResetError):
+        tuple(offload(api, executor, "/ip/route/print", batch_size=1))
+
+
+def test_offload_drains_response_when_closed_early():
+    api = make_api(*ROWS, ("!done", ()))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        rows = offload(api, executor, "/ip/route/print", batch_size=1, max_pending=1)
+        next(rows)
+        rows.close()
+    assert api.protocol.readRawSentence.call_count == len(ROWS) + 1
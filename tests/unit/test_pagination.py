@@ -0,0 +1,132 @@
+# -*- coding: UTF-8 -*-
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from librouteros.api import Api, AsyncApi
+from librouteros.pagination import AsyncPaginator, Paginator, id_number, id_string, ranges, sorted_ids
+from librouteros.query import Key
+
+IDS = ("*A", "*2", "*1", "*B", "*3")
+
+
+def rows_for(words):
+    """Emulate router. Return rows matching .id range words."""
+    if "=.proplist=.id" in words:
+        after = next((word[len("?>.id=") :] for word in words if word.startswith("?>.id=")), "*0")
+        return [{".id": row_id} for row_id in IDS if id_number(row_id) > id_number(after)]
+    first = next(word for word in words if word.startswith("?<.id="))[len("?<.id=") :]
+    last = next(word for word in words if word.startswith("?>.id="))[len("?>.id=") :]
+    selected = [row_id for row_id in IDS if id_number(first) <= id_number(row_id) <= id_number(last)]
+    return [{".id": row_id, "name": f"name{row_id}"} for row_id in reversed(selected)]
+
+
+def test_id_number():
+    assert id_number("*1A") == 26
+
+
+def test_id_string():
+    assert id_string(26) == "*1A"
+    assert id_string(id_number("*FFFFFFFF")) == "*FFFFFFFF"
+
+
+def test_sorted_ids():
+    ids = sorted_ids(["*A", "*2", "*1"])
+    assert ids.typecode == "Q"
+    assert list(ids) == [1, 2, 10]
+
+
+def test_ranges():
+    assert ranges(("*1", "*2", "*3", "*4", "*5"), 2) == [("*1", "*2"), ("*3", "*4"), ("*5", "*5")]
+    assert ranges((), 2) == []
+
+
+class Test_Paginator:
+    def setup_method(self):
+        self.api = Api(protocol=MagicMock())
+        self.api.rawCmd = MagicMock(side_effect=lambda cmd, *words: iter(rows_for(words)))
+
+    def test_yields_rows_in_id_order(self):
+        rows = tuple(self.api.path("ip", "address").paginate(page_size=2))
+        assert tuple(row[".id"] for row in rows) == ("*1", "*2", "*3", "*A", "*B")
+        # One call for ids and one for each page.
+        assert self.api.rawCmd.call_count == 4
+
+    def test_page_words(self):
+        name = Key("name")
+        paginator = self.api.path("ip", "address").select(name).where(name == "x").paginate(page_size=2)
+        tuple(paginator)
+        assert self.api.rawCmd.call_args_list[0].args == ("/ip/address/print", "=.proplist=.id", "?=name=x")
+        assert self.api.rawCmd.call_args_list[1].args == (
+            "/ip/address/print",
+            "=.proplist=name,.id",
+            "?=name=x",
+            "?<.id=*1",
+            "?#!",
+            "?>.id=*2",
+            "?#!",
+        )
+
+    def test_resume(self):
+        paginator = self.api.path("ip", "address").paginate(page_size=2)
+        rows = iter(paginator)
+        next(rows)
+        next(rows)
+        rows.close()
+        assert paginator.last_id == "*2"
+        self.api.rawCmd.reset_mock()
+        resumed = Paginator(self.api.path("ip", "address").select(), page_size=2, after=paginator.last_id)
+        assert tuple(row[".id"] for row in resumed) == ("*3", "*A", "*B")
+        assert self.api.rawCmd.call_args_list[0].args == ("/ip/address/print", "=.proplist=.id", "?>.id=*2")
+
+    def test_empty_table(self):
+        self.api.rawCmd = MagicMock(return_value=iter(()))
+        assert tuple(self.api.path("ip", "address").paginate()) == ()
+
+    def test_api_usable_inside_loop(self):
+        printed = self.api.rawCmd.side_effect
+        self.api.rawCmd.side_effect = lambda cmd, *words: printed(cmd, *words) if cmd.endswith("print") else iter(())
+        for row in self.api.path("ip", "address").paginate(page_size=2):
+            self.api.rawCmd("/ip/address/set", f"=.id={row['.id']}")
+        cmds = [call.args[0] for call in self.api.rawCmd.call_args_list]
+        # Next page is read only after current one was consumed.
+        assert cmds == ["/ip/address/print"] + (["/ip/address/print"] + ["/ip/address/set"] * 2) * 2 + [
+            "/ip/address/print",
+            "/ip/address/set",
+        ]
+
+    def test_prefetch_uses_separate_api(self):
+        prefetch = Api(protocol=MagicMock())
+        prefetch.rawCmd = MagicMock(side_effect=lambda cmd, *words: iter(rows_for(words)))
+        rows = tuple(self.api.path("ip", "address").paginate(page_size=2, prefetch=prefetch))
+        assert tuple(row[".id"] for row in rows) == ("*1", "*2", "*3", "*A", "*B")
+        assert self.api.rawCmd.call_count == 1
+        assert prefetch.rawCmd.call_count == 3
+
+
+class Test_AsyncPaginator:
+    def setup_method(self):
+        async def raw_cmd(cmd, *words):
+            for row in rows_for(words):
+                yield row
+
+        self.api = AsyncApi(protocol=MagicMock())
+        self.api.rawCmd = MagicMock(side_effect=raw_cmd)
+
+    @pytest.mark.asyncio
+    async def test_yields_rows_in_id_order(self):
+        paginator = self.api.path("ip", "address").paginate(page_size=2)
+        assert isinstance(paginator, AsyncPaginator)
+        rows = [row async for row in paginator]
+        assert tuple(row[".id"] for row in rows) == ("*1", "*2", "*3", "*A", "*B")
+        assert paginator.last_id == "*B"
+
+    @pytest.mark.asyncio
+    async def test_prefetch_uses_separate_api(self):
+        prefetch = AsyncApi(protocol=MagicMock())
+        prefetch.rawCmd = MagicMock(side_effect=self.api.rawCmd.side_effect)
+        rows = [row async for row in self.api.path("ip", "address").paginate(page_size=2, prefetch=prefetch)]
+        assert tuple(row[".id"] for row in rows) == ("*1", "*2", "*3", "*A", "*B")
+        assert self.api.rawCmd.call_count == 1
+        assert prefetch.rawCmd.call_count == 3
@@ -3,8 +3,8 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from librouteros.api import Api, AsyncApi, AsyncPath, Path
-from librouteros.query import AsyncQuery, Query
+from librouteros.api import Api, AsyncApi, AsyncPath, Path, join_path
+from librouteros.query import AsyncQuery, Key, Query
 
 
 def test_api_path_returns_Path():
@@ -151,3 +151,53 @@ class Test_Path:
         # Async
         query = self.async_path.select()
         assert isinstance(query, AsyncQuery)
+
+
+def test_count():
+    api = Api(protocol=MagicMock())
+    api.rawCmd = MagicMock(return_value=iter(({"ret": 3},)))
+    name = Key("name")
+    assert api.path("interface").count(name == "ether1") == 3
+    api.rawCmd.assert_called_once_with("/interface/print", "=count-only=", "?=name=ether1")
+
+
+@pytest.mark.parametrize(("ret", "expected"), ((0, False), (2, True)))
+def test_exists(ret, expected):
+    api = Api(protocol=MagicMock())
+    api.rawCmd = MagicMock(return_value=iter(({"ret": ret},)))
+    assert api.path("interface").exists() is expected
+    api.rawCmd.assert_called_once_with("/interface/print", "=count-only=")
+
+
+@pytest.mark.asyncio
+async def test_async_count_and_exists():
+    async def raw_cmd(cmd, *words):
+        yield {"ret": 4}
+
+    api = AsyncApi(protocol=MagicMock())
+    api.rawCmd = MagicMock(side_effect=raw_cmd)
+    name = Key("name")
+    assert await api.path("interface").count() == 4
+    assert await api.path("interface").select(name).where(name == "ether1").exists() is True
+    api.rawCmd.assert_called_with("/interface/print", "=count-only=", "?=name=ether1")
+
+
+def test_join_path_is_cached():
+    join_path.cache_clear()
+    assert join_path("/", "ip", "address/") == "/ip/address"
+    assert join_path("/", "ip", "address/") is join_path("/", "ip", "address/")
+    assert join_path.cache_info().hits == 2
+
+
+@pytest.mark.parametrize(
+    "obj",
+    (
+        Path(path="/interface", api=MagicMock()),
+        AsyncPath(path="/interface", api=MagicMock()),
+        Key("name"),
+        Query(path=MagicMock(), keys=(), api=MagicMock()),
+        AsyncQuery(path=MagicMock(), keys=(), api=MagicMock()),
+    ),
+)
+def test_has_no_instance_dict(obj):
+    assert not hasattr(obj, "__dict__")
@@ -0,0 +1,137 @@
+# -*- coding: UTF-8 -*-
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from librouteros.api import AsyncApi
+from librouteros.exceptions import ConnectionClosed, TrapError
+from librouteros.pool import AsyncPool, FairLimiter
+
+
+class Test_FairLimiter:
+    @pytest.mark.asyncio
+    async def test_wakes_waiters_in_order(self):
+        limiter = FairLimiter(1)
+        order = []
+
+        async def worker(number):
+            await limiter.acquire()
+            order.append(number)
+            await asyncio.sleep(0)
+            limiter.release()
+
+        await asyncio.gather(*(worker(number) for number in range(5)))
+        assert order == [0, 1, 2, 3, 4]
+        assert limiter.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_new_task_does_not_overtake_waiter(self):
+        limiter = FairLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release()
+        # Slot is handed over to waiter, even before it runs.
+        late = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert waiter.done()
+        assert not late.done()
+        late.cancel()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = FairLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        limiter.release()
+        assert limiter.in_use == 0
+        assert not limiter.waiters
+
+    @pytest.mark.asyncio
+    async def test_waiter_cancelled_before_release(self):
+        limiter = FairLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        # Task has not resumed yet. release() drops cancelled future from deque.
+        limiter.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_use == 0
+        assert not limiter.waiters
+        await limiter.acquire()
+        assert limiter.in_use == 1
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError, match="Capacity"):
+            FairLimiter(0)
+
+
+class Test_AsyncPool:
+    def setup_method(self):
+        self.connections = []
+        self.pool = AsyncPool(self.connect, per_host=2, limit=3)
+
+    async def connect(self, host):
+        api = AsyncApi(protocol=AsyncMock())
+        self.connections.append((host, api))
+        return api
+
+    async def run(self, hosts, active, peak):
+        async def worker(host):
+            async with self.pool.acquire(host):
+                active[host] = active.get(host, 0) + 1
+                active["all"] = active.get("all", 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+                peak["all"] = max(peak.get("all", 0), active["all"])
+                await asyncio.sleep(0.001)
+                active[host] -= 1
+                active["all"] -= 1
+
+        await asyncio.gather(*(worker(host) for host in hosts))
+
+    @pytest.mark.asyncio
+    async def test_limits(self):
+        peak = {}
+        await self.run(["a"] * 10 + ["b"] * 10 + ["c"] * 10, {}, peak)
+        # Global limit is smaller than sum of per host ones. Which host reaches its limit depends on timing.
+        assert max(peak["a"], peak["b"], peak["c"]) == 2
+        assert peak["all"] == 3
+
+    @pytest.mark.asyncio
+    async def test_reuses_connections(self):
+        await self.run(["a"] * 10, {}, {})
+        assert len(self.connections) == 2
+        assert len(self.pool.idle["a"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_closes_broken_connection(self):
+        with pytest.raises(ConnectionClosed):
+            async with self.pool.acquire("a"):
+                raise ConnectionClosed("closed")
+        _, api = self.connections[0]
+        api.protocol.close.assert_awaited_once_with()
+        assert self.pool.idle["a"] == []
+
+    @pytest.mark.asyncio
+    async def test_keeps_connection_after_trap(self):
+        with pytest.raises(TrapError):
+            async with self.pool.acquire("a"):
+                raise TrapError(message="failure")
+        assert len(self.pool.idle["a"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        async with self.pool:
+            await self.run(["a", "b"], {}, {})
+        for _, api in self.connections:
+            api.protocol.close.assert_awaited_once_with()
+        with pytest.raises(RuntimeError):
+            async with self.pool.acquire("a"):
+                pass
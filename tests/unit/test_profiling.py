@@ -0,0 +1,87 @@
+# -*- coding: UTF-8 -*-
+
+from time import sleep
+from unittest.mock import MagicMock
+
+import pytest
+
+from librouteros.api import Api
+from librouteros.connections import SocketTransport
+from librouteros.profiling import CommandStats, Profile, TimingTransport
+from librouteros.protocol import ApiProtocol, encode_sentence
+
+
+class BufferTransport:
+    def __init__(self, data):
+        self.data = data
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+    def read(self, length):
+        data, self.data = self.data[:length], self.data[length:]
+        return data
+
+    def close(self):
+        pass
+
+
+def response(*rows):
+    return b"".join(encode_sentence("!re", *row, encoding="ASCII") for row in rows) + encode_sentence(
+        "!done", encoding="ASCII"
+    )
+
+
+class Test_Profile:
+    def setup_method(self):
+        data = response(("=name=ether1",), ("=name=ether2",)) + response(("=cpu-load=5",))
+        self.transport = BufferTransport(data)
+        self.api = Api(protocol=ApiProtocol(transport=self.transport, encoding="ASCII"))
+
+    def test_stats_per_command(self):
+        with self.api.profile() as profile:
+            rows = tuple(self.api.path("interface"))
+            resource = tuple(self.api("/system/resource/print"))
+        assert rows == ({"name": "ether1"}, {"name": "ether2"})
+        assert resource == ({"cpu-load": 5},)
+        interface = profile.stats["/interface/print"]
+        assert (interface.calls, interface.rows) == (1, 2)
+        assert profile.stats["/system/resource/print"].rows == 1
+        for stats in profile.stats.values():
+            assert stats.total >= stats.wire + stats.framing + stats.decoding
+
+    def test_consumer_time(self):
+        with self.api.profile() as profile:
+            for _ in self.api.path("interface"):
+                sleep(0.01)
+        assert profile.stats["/interface/print"].consumer >= 0.02
+
+    def test_restores_api(self):
+        with self.api.profile():
+            assert isinstance(self.api.protocol.transport, TimingTransport)
+        assert self.api.protocol.transport is self.transport
+        assert "readSentence" not in vars(self.api)
+
+    def test_report(self):
+        with self.api.profile() as profile:
+            tuple(self.api.path("interface"))
+        lines = profile.report().splitlines()
+        assert lines[0].split() == ["command", "calls", "rows", "wire", "framing", "decoding", "consumer", "total"]
+        assert lines[1].split()[:3] == ["/interface/print", "1", "2"]
+
+
+def test_timing_transport_measures_wire():
+    transport = MagicMock(spec=SocketTransport)
+    transport.read.side_effect = lambda length: sleep(0.01) or b"x" * length
+    profile = Profile(api=MagicMock())
+    timing = TimingTransport(transport, profile)
+    assert timing.read(3) == b"xxx"
+    assert profile.wire >= 0.01
+
+
+@pytest.mark.parametrize(("total", "expected"), ((1.0, 0.4), (0.5, 0.0)))
+def test_consumer_never_negative(total, expected):
+    stats = CommandStats()
+    stats.wire, stats.framing, stats.decoding, stats.total = 0.3, 0.2, 0.1, total
+    assert stats.consumer == pytest.approx(expected)
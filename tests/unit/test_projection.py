@@ -0,0 +1,117 @@
+# -*- coding: UTF-8 -*-
+
+import pickle
+from unittest.mock import MagicMock
+
+import pytest
+
+from librouteros.api import Api
+from librouteros.exceptions import ProtocolError
+from librouteros.projection import SITES
+from librouteros.query import Key
+
+ROWS = (
+    {".id": "*1", "name": "ether1", "mtu": 1500, "running": True},
+    {".id": "*2", "name": "ether2", "mtu": 9000, "running": False},
+)
+
+
+def rows_for(words, rows=ROWS):
+    """Emulate router. Return only keys listed in .proplist."""
+    proplist = next((word[len("=.proplist=") :].split(",") for word in words if word.startswith("=.proplist=")), None)
+    if proplist is None:
+        return [dict(row) for row in rows]
+    return [{key: value for key, value in row.items() if key in proplist} for row in rows]
+
+
+class Test_auto_select:
+    def setup_method(self):
+        SITES.clear()
+        self.api = Api(protocol=MagicMock())
+        self.api.rawCmd = MagicMock(side_effect=lambda cmd, *words: iter(rows_for(words)))
+
+    def proplists(self):
+        return [call.args[1:] for call in self.api.rawCmd.call_args_list]
+
+    def names(self, runs):
+        result = []
+        for _ in range(runs):
+            result.append([row["name"] for row in self.api.path("interface").auto_select()])
+        return result
+
+    def test_narrows_after_first_run(self):
+        assert self.names(3) == [["ether1", "ether2"]] * 3
+        assert self.proplists() == [(), ("=.proplist=.id,name",), ("=.proplist=.id,name",)]
+
+    def test_learns_every_read_key(self):
+        for _ in range(2):
+            for row in self.api.path("interface").auto_select():
+                row.get("mtu")
+                "running" in row  # noqa B015
+        assert self.proplists()[1] == ("=.proplist=.id,mtu,running",)
+
+    def test_miss_fetches_all_keys(self):
+        for run in range(3):
+            for row in self.api.path("interface").auto_select():
+                assert row["name"]
+                if run == 1:
+                    assert row["mtu"] in (1500, 9000)
+        assert self.proplists() == [(), ("=.proplist=.id,name",), (), ("=.proplist=.id,mtu,name",)]
+
+    def test_whole_row_disables_narrowing(self):
+        for _ in range(2):
+            for row in self.api.path("interface").auto_select():
+                assert row["name"]
+        for _ in range(2):
+            rows = [dict(row.items()) for row in self.api.path("interface").auto_select()]
+        assert rows == list(ROWS)
+        site = next(site for site in SITES.values() if site.whole)
+        assert site.proplist() is None
+
+    def test_whole_row_of_narrowed_run_is_complete(self):
+        tuple(row["name"] for row in self.api.path("interface").auto_select())
+        rows = tuple(self.api.path("interface").auto_select())
+        assert rows == ROWS
+
+    def test_call_sites_are_separate(self):
+        tuple(row["name"] for row in self.api.path("interface").auto_select())
+        tuple(row["mtu"] for row in self.api.path("interface").auto_select())
+        assert self.proplists() == [(), ()]
+        assert len(SITES) == 2
+
+    def test_query_keeps_where(self):
+        name = Key("name")
+        for _ in range(2):
+            tuple(row["mtu"] for row in self.api.path("interface").select().where(name == "ether1").auto_select())
+        assert self.proplists()[1] == ("=.proplist=.id,mtu", "?=name=ether1")
+
+    def test_selected_keys_are_not_changed(self):
+        for _ in range(2):
+            rows = tuple(self.api.path("interface").select(Key("name")).auto_select())
+        assert self.proplists() == [("=.proplist=name",)] * 2
+        assert type(rows[0]) is dict
+
+    def test_fills_rows_without_id_by_position(self):
+        rows = [{"uptime": "1d", "version": "7.1"}]
+        self.api.rawCmd.side_effect = lambda cmd, *words: iter(rows_for(words, rows))
+        for run in range(2):
+            for row in self.api.path("system", "resource").auto_select():
+                assert row["uptime"] == "1d"
+                if run:
+                    assert row["version"] == "7.1"
+        assert self.proplists() == [(), ("=.proplist=.id,uptime",), ()]
+
+    def test_changed_rows_raise(self):
+        rows = [{"name": "x"}]
+        self.api.rawCmd.side_effect = lambda cmd, *words: iter(rows if words else [])
+        for run in range(2):
+            for row in self.api.path("system", "resource").auto_select():
+                if run:
+                    with pytest.raises(ProtocolError):
+                        row["mtu"]
+                assert row["name"] == "x"
+
+    def test_copy_and_pickle_return_dict(self):
+        row = next(self.api.path("interface").auto_select())
+        assert type(row.copy()) is dict
+        assert pickle.loads(pickle.dumps(row)) == ROWS[0]  # noqa S301
@@ -1,5 +1,6 @@
 # -*- coding: UTF-8 -*-
 
+from io import BytesIO
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -14,6 +15,7 @@ from librouteros.exceptions import (
 from librouteros.protocol import (
     ApiProtocol,
     AsyncApiProtocol,
+    SentenceParser,
     decode_length,
     determine_length,
     encode_length,
@@ -108,13 +110,17 @@ class Test_ApiProtocol:
     @patch("librouteros.protocol.encode_sentence")
     async def test_writeSentence_calls_encodeSentence(self, encodeSentence_mock):
         self.protocol.writeSentence("/ip/address/print", "=key=value")
-        encodeSentence_mock.assert_called_once_with("/ip/address/print", "=key=value", encoding=self.protocol.encoding)
+        encodeSentence_mock.assert_called_once_with(
+            "/ip/address/print", "=key=value", encoding=self.protocol.encoding, errors="strict"
+        )
 
     @pytest.mark.asyncio
     @patch("librouteros.protocol.encode_sentence")
     async def test_async_writeSentence_calls_encodeSentence(self, encodeSentence_mock):
         await self.async_protocol.writeSentence("/ip/address/print", "=key=value")
-        encodeSentence_mock.assert_called_once_with("/ip/address/print", "=key=value", encoding=self.protocol.encoding)
+        encodeSentence_mock.assert_called_once_with(
+            "/ip/address/print", "=key=value", encoding=self.protocol.encoding, errors="strict"
+        )
 
     @pytest.mark.asyncio
     @patch("librouteros.protocol.encode_sentence")
@@ -127,18 +133,31 @@ class Test_ApiProtocol:
         await self.async_protocol.writeSentence("/ip/address/print", "=key=value")
         self.async_protocol.transport.write.assert_called_once_with(encodeSentence_mock.return_value)
 
-    @patch("librouteros.protocol.iter", return_value=("!fatal", "reason"))
-    async def test_readSentence_raises_FatalError(self, iter_mock):
+    @pytest.mark.asyncio
+    async def test_writeSentences_writes_once(self):
+        """Assert that all sentences are written in one call."""
+        sentences = (("/system/resource/print", ".tag=0"), ("/ip/route/print", ".tag=1"))
+        expected = b"".join(encode_sentence(*sentence, encoding="utf-8") for sentence in sentences)
+        self.protocol.writeSentences(*sentences)
+        self.protocol.transport.write.assert_called_once_with(expected)
+
+        # async
+        await self.async_protocol.writeSentences(*sentences)
+        self.async_protocol.transport.write.assert_called_once_with(expected)
+
+    async def test_readSentence_raises_FatalError(self):
         """Assert that FatalError is raised with its reason."""
+        self.protocol.transport.read.side_effect = BytesIO(encode_sentence("!fatal", "reason", encoding="utf-8")).read
         with pytest.raises(FatalError) as error:
             self.protocol.readSentence()
         assert str(error.value) == "reason"
         assert self.protocol.transport.close.call_count == 1
 
     @pytest.mark.asyncio
-    @patch("librouteros.protocol.AsyncApiProtocol.readWord", side_effect=["!fatal", "reason", ""])
-    async def test_async_readSentence_raises_FatalError(self, readWord_mock):
+    async def test_async_readSentence_raises_FatalError(self):
         """Assert that FatalError is raised with its reason."""
+        data = encode_sentence("!fatal", "reason", encoding="utf-8")
+        self.async_protocol.transport.read.side_effect = BytesIO(data).read
         with pytest.raises(FatalError) as error:
             await self.async_protocol.readSentence()
         assert str(error.value) == "reason"
@@ -149,14 +168,14 @@ class Test_ApiProtocol:
         word = b"\x11\xfb\x95" + "łąć".encode("utf-8")
         with pytest.raises(UnicodeDecodeError):
             word.decode()
-        length = encode_length(len(word))
+        data = encode_length(3) + b"!re" + encode_length(len(word)) + word + b"\x00"
 
-        self.protocol.transport.read.side_effect = (length, b"", word)
-        assert self.protocol.readWord() == "\x11łąć"
+        self.protocol.transport.read.side_effect = BytesIO(data).read
+        assert self.protocol.readSentence() == ("!re", ("\x11łąć",))
 
         # async
-        self.async_protocol.transport.read.side_effect = (length, b"", word)
-        assert await self.async_protocol.readWord() == "\x11łąć"
+        self.async_protocol.transport.read.side_effect = BytesIO(data).read
+        assert await self.async_protocol.readSentence() == ("!re", ("\x11łąć",))
 
     @pytest.mark.asyncio
     async def test_close(self):
@@ -166,3 +185,222 @@ class Test_ApiProtocol:
         # async
         await self.async_protocol.close()
         self.async_protocol.transport.close.assert_called_once_with()
+
+
+class Test_ApiProtocol_raw:
+    def setup_method(self):
+        self.protocol = ApiProtocol(
+            transport=MagicMock(spec=SocketTransport),
+            encoding="utf-8",
+        )
+
+    def test_readRawSentence_does_not_decode(self):
+        data = encode_sentence("!re", "=comment=łąć", encoding="utf-8")
+        self.protocol.transport.read.side_effect = BytesIO(data).read
+        assert self.protocol.readRawSentence() == ("!re", ("=comment=łąć".encode(),))
+
+    def test_readRawSentence_raises_FatalError(self):
+        self.protocol.transport.read.side_effect = BytesIO(encode_sentence("!fatal", "reason", encoding="utf-8")).read
+        with pytest.raises(FatalError) as error:
+            self.protocol.readRawSentence()
+        assert str(error.value) == "reason"
+        assert self.protocol.transport.close.call_count == 1
+
+    def test_readWord(self):
+        data = encode_sentence("!re", "=comment=łąć", encoding="utf-8") + encode_sentence("!done", encoding="utf-8")
+        self.protocol.transport.read.side_effect = BytesIO(data).read
+        words = [self.protocol.readWord() for _ in range(5)]
+        assert words == ["!re", "=comment=łąć", "", "!done", ""]
+
+    def test_readWord_then_readSentence(self):
+        data = encode_sentence("!re", "=name=a", encoding="utf-8") + encode_sentence("!done", encoding="utf-8")
+        self.protocol.transport.read.side_effect = BytesIO(data).read
+        assert tuple(iter(self.protocol.readRawWord, b"")) == (b"!re", b"=name=a")
+        assert self.protocol.readSentence() == ("!done", ())
+
+    @pytest.mark.asyncio
+    async def test_async_readWord(self):
+        protocol = AsyncApiProtocol(transport=MagicMock(spec=AsyncSocketTransport), encoding="utf-8")
+        protocol.transport.read.side_effect = BytesIO(encode_sentence("!re", "=name=ą", encoding="utf-8")).read
+        assert [await protocol.readWord() for _ in range(3)] == ["!re", "=name=ą", ""]
+
+    def test_readRawSentence_uses_errors(self):
+        self.protocol.errors = "surrogateescape"
+        data = encode_sentence("!fatal", "bad \udcff", encoding="utf-8", errors="surrogateescape")
+        self.protocol.transport.read.side_effect = BytesIO(data).read
+        with pytest.raises(FatalError, match="bad \udcff"):
+            self.protocol.readRawSentence()
+        self.protocol.errors = "strict"
+        self.protocol.transport.read.side_effect = BytesIO(encode_sentence("!re", "=a=b", encoding="latin-1")).read
+        assert self.protocol.readRawSentence() == ("!re", (b"=a=b",))
+        self.protocol.transport.read.side_effect = BytesIO(b"\x03!r\xff\x00").read
+        with pytest.raises(UnicodeDecodeError):
+            self.protocol.readRawSentence()
+
+    @pytest.mark.asyncio
+    async def test_async_readRawSentence_uses_errors(self):
+        protocol = AsyncApiProtocol(
+            transport=MagicMock(spec=AsyncSocketTransport), encoding="utf-8", errors="surrogateescape"
+        )
+        data = encode_sentence("!fatal", "bad \udcff", encoding="utf-8", errors="surrogateescape")
+        protocol.transport.read.side_effect = BytesIO(data).read
+        with pytest.raises(FatalError, match="bad \udcff"):
+            await protocol.readRawSentence()
+
+    @pytest.mark.asyncio
+    async def test_async_readRawSentence(self):
+        protocol = AsyncApiProtocol(transport=MagicMock(spec=AsyncSocketTransport), encoding="utf-8")
+        data = encode_sentence("!re", "=data=\xff\xfe", encoding="latin-1")
+        protocol.transport.read.side_effect = BytesIO(data).read
+        assert await protocol.readRawSentence() == ("!re", (b"=data=\xff\xfe",))
+
+
+class Test_ApiProtocol_max_word_size:
+    def setup_method(self):
+        self.word = b"=source=" + b"x" * 100
+        data = encode_sentence("!re", self.word.decode(), "=name=script", encoding="ASCII")
+        self.protocol = ApiProtocol(transport=MagicMock(spec=SocketTransport), encoding="ASCII", max_word_size=16)
+        self.protocol.transport.read.side_effect = BytesIO(data).read
+        self.async_protocol = AsyncApiProtocol(
+            transport=MagicMock(spec=AsyncSocketTransport), encoding="ASCII", max_word_size=16
+        )
+        self.async_protocol.transport.read.side_effect = BytesIO(data).read
+        self.files = []
+
+    def test_raises_and_closes(self):
+        with pytest.raises(ProtocolError, match="exceeds maximum"):
+            self.protocol.readSentence()
+        self.protocol.transport.close.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_async_raises_and_closes(self):
+        with pytest.raises(ProtocolError, match="exceeds maximum"):
+            await self.async_protocol.readSentence()
+        self.async_protocol.transport.close.assert_awaited_once_with()
+
+    def sink(self, name):
+        self.files.append((name, BytesIO()))
+        return self.files[-1][1]
+
+    def test_streams_to_sink(self):
+        self.protocol.sink = self.sink
+        assert self.protocol.readSentence() == ("!re", ("=source=\x00sink:0", "=name=script"))
+        assert [(name, file.getvalue()) for name, file in self.files] == [("source", b"x" * 100)]
+        # Never read more than max_word_size at once.
+        assert max(call.args[0] for call in self.protocol.transport.read.call_args_list) <= 16
+
+    @pytest.mark.asyncio
+    async def test_async_streams_to_sink(self):
+        self.async_protocol.sink = self.sink
+        assert await self.async_protocol.readSentence() == ("!re", ("=source=\x00sink:0", "=name=script"))
+        assert [(name, file.getvalue()) for name, file in self.files] == [("source", b"x" * 100)]
+
+    def test_each_word_has_own_file(self):
+        self.protocol.sink = self.sink
+        data = encode_sentence("!re", "=source=" + "a" * 20, "=comment=", "=source=" + "b" * 20, encoding="ASCII")
+        self.protocol.transport.read.side_effect = BytesIO(data).read
+        assert self.protocol.readSentence() == ("!re", ("=source=\x00sink:0", "=comment=", "=source=\x00sink:1"))
+        assert [file.getvalue() for name, file in self.files] == [b"a" * 20, b"b" * 20]
+
+    def test_oversized_non_attribute_word_raises(self):
+        self.protocol.sink = self.sink
+        self.protocol.transport.read.side_effect = BytesIO(encode_sentence("!re", "y" * 100, encoding="ASCII")).read
+        with pytest.raises(ProtocolError, match="not an attribute word"):
+            self.protocol.readSentence()
+        self.protocol.transport.close.assert_called_once_with()
+        assert self.files == []
+
+    def test_no_limit_by_default(self):
+        protocol = ApiProtocol(transport=MagicMock(spec=SocketTransport), encoding="ASCII")
+        protocol.transport.read.side_effect = self.protocol.transport.read.side_effect
+        assert protocol.readSentence() == ("!re", (self.word.decode(), "=name=script"))
+
+
+class Test_SentenceParser:
+    def setup_method(self):
+        self.parser = SentenceParser()
+        self.sentences = (
+            ("!re", "=name=ether1", "=comment=" + "x" * 200),
+            ("!re", "=name=" + "y" * 0x4000),
+            ("!done",),
+        )
+        self.data = b"".join(encode_sentence(*sentence, encoding="ASCII") for sentence in self.sentences)
+        self.expected = [[word.encode() for word in sentence] for sentence in self.sentences]
+
+    def collect(self):
+        sentences = []
+        while (sentence := self.parser.next_sentence()) is not None:
+            sentences.append(sentence)
+        return sentences
+
+    def test_whole_buffer(self):
+        self.parser.feed(self.data)
+        assert self.collect() == self.expected
+
+    def test_byte_by_byte(self):
+        sentences = []
+        for position in range(len(self.data)):
+            self.parser.feed(self.data[position : position + 1])
+            sentences.extend(self.collect())
+        assert sentences == self.expected
+
+    @given(st.lists(st.integers(0, 0x4200), max_size=10))
+    def test_any_split(self, positions):
+        parser = SentenceParser()
+        sentences = []
+        for start, stop in zip([0, *sorted(positions)], [*sorted(positions), len(self.data)], strict=True):
+            parser.feed(self.data[start:stop])
+            while (sentence := parser.next_sentence()) is not None:
+                sentences.append(sentence)
+        assert sentences == self.expected
+
+    def test_large_word_in_small_chunks(self):
+        data = encode_sentence("!re", "=name=" + "z" * 0x10000, encoding="ASCII") + self.data
+        sentences = []
+        for position in range(0, len(data), 1000):
+            self.parser.feed(data[position : position + 1000])
+            sentences.extend(self.collect())
+        assert sentences == [[b"!re", b"=name=" + b"z" * 0x10000], *self.expected]
+        assert all(type(word) is bytes for sentence in sentences for word in sentence)
+
+    def test_needed_never_reads_past_sentence(self):
+        stream = BytesIO(self.data)
+        end = 0
+        for words, expected in zip(self.sentences, self.expected, strict=True):
+            end += len(encode_sentence(*words, encoding="ASCII"))
+            while (sentence := self.parser.next_sentence()) is None:
+                self.parser.feed(stream.read(self.parser.needed))
+            assert sentence == expected
+            assert stream.tell() == end
+
+    def test_next_word(self):
+        stream = BytesIO(self.data)
+        words = []
+        while len(words) < 9:
+            while (word := self.parser.next_word()) is None:
+                self.parser.feed(stream.read(self.parser.needed))
+            words.append(word)
+        assert words == [*self.expected[0], b"", *self.expected[1], b"", *self.expected[2], b""]
+        assert stream.tell() == len(self.data)
+
+    def test_word_length(self):
+        self.parser.feed(encode_length(0x4000)[:1])
+        assert self.parser.next_sentence() is None
+        assert self.parser.word_length is None
+        assert self.parser.needed == len(encode_length(0x4000)) - 1
+        self.parser.feed(encode_length(0x4000)[1:] + b"=name=")
+        assert self.parser.next_sentence() is None
+        assert self.parser.word_length == 0x4000
+
+    def test_take_word(self):
+        self.parser.feed(encode_length(3) + b"!re" + encode_length(0x4000) + b"=name=")
+        assert self.parser.next_sentence() is None
+        assert self.parser.take_word() == b"=name="
+        self.parser.add_word(b"=name=")
+        self.parser.feed(b"\x00")
+        assert self.parser.next_sentence() == [b"!re", b"=name="]
+
+    def test_invalid_control_byte(self, bad_first_length_bytes):
+        self.parser.feed(bad_first_length_bytes)
+        with pytest.raises(ProtocolError):
+            self.parser.next_sentence()
@@ -7,8 +7,12 @@ from librouteros.query import (
     And,
     AsyncQuery,
     Key,
+    Not,
     Or,
+    Param,
+    PreparedQuery,
     Query,
+    compact,
 )
 
 
@@ -40,6 +44,18 @@ class Test_Query:
         self.async_query.where((1, 2, 3), (4, 5))
         assert self.async_query.query == (1, 2, 3, 4, 5)
 
+    def test_where_compacts_operations(self):
+        name = Key("name")
+        self.query.where(name.In("ether1", "ether2", "ether3"), name != "ether4")
+        assert self.query.query == (
+            "?=name=ether1",
+            "?=name=ether2",
+            "?=name=ether3",
+            "?#||",
+            "?=name=ether4",
+            "?#!",
+        )
+
     @patch("librouteros.query.iter")
     def test_iter_with_proplist(self, iter_mock):
         self.query.keys = ("name", "disabled")
@@ -154,3 +170,112 @@ def test_Or():
             (4,),
         )
     ) == (1, 2, 3, 4, "?#|", "?#|", "?#|")
+
+
+class Test_Key_extended:
+    def setup_method(self):
+        self.key = Key(name="mtu")
+
+    def test_le(self):
+        assert tuple(self.key <= 1500) == ("?mtu", "?>mtu=1500", "?#!", "?#&")
+
+    def test_ge(self):
+        assert tuple(self.key >= 1500) == ("?mtu", "?<mtu=1500", "?#!", "?#&")
+
+    def test_has(self):
+        assert tuple(self.key.has()) == ("?mtu",)
+
+    def test_absent(self):
+        assert tuple(self.key.absent()) == ("?-mtu",)
+
+    def test_startswith(self):
+        assert tuple(Key("name").startswith("ether")) == (
+            "?name",
+            "?<name=ether",
+            "?#!",
+            "?#&",
+            "?<name=ethes",
+            "?#&",
+        )
+
+    def test_startswith_empty_prefix(self):
+        assert tuple(Key("name").startswith("")) == ("?name",)
+
+
+def test_Not():
+    assert tuple(Not(Key("disabled") == True)) == ("?=disabled=yes", "?#!")  # noqa E712
+
+
+@pytest.mark.parametrize(
+    ("words", "expected"),
+    (
+        (("?#|", "?#|", "?#&"), ("?#||&",)),
+        (("?=a=1", "?#!", "?=b=2", "?#!", "?#&"), ("?=a=1", "?#!", "?=b=2", "?#!&")),
+        # Digits push stack copies, merging them could change position number.
+        (("?#1", "?#2"), ("?#1", "?#2")),
+        (("?#", "?#|"), ("?#", "?#|")),
+        ((1, 2), (1, 2)),
+    ),
+)
+def test_compact(words, expected):
+    assert compact(words) == expected
+
+
+class Test_PreparedQuery:
+    def setup_method(self):
+        self.path = MagicMock()
+        self.path.join.return_value = "/interface/print"
+        self.name = Key("name")
+        self.query = Query(path=self.path, keys=(self.name, Key("mtu")), api=MagicMock())
+
+    def test_prepare(self):
+        prepared = self.query.where(self.name == "ether1").prepare()
+        assert prepared == PreparedQuery(
+            cmd="/interface/print",
+            words=("=.proplist=name,mtu", "?=name=ether1"),
+        )
+
+    def test_prepare_is_cached(self):
+        self.query.where(self.name == "ether1")
+        assert self.query.prepare() is self.query.prepare()
+        self.path.join.assert_called_once_with("print")
+
+    def test_where_resets_cache(self):
+        first = self.query.where(self.name == "ether1").prepare()
+        second = self.query.where(self.name == "ether2").prepare()
+        assert first != second
+
+    def test_is_hashable(self):
+        first = self.query.where(self.name == "ether1").prepare()
+        second = Query(path=self.path, keys=self.query.keys, api=MagicMock()).where(self.name == "ether1").prepare()
+        assert len({first, second}) == 1
+
+    def test_call_with_different_api(self):
+        prepared = self.query.prepare()
+        api = MagicMock()
+        prepared(api)
+        api.rawCmd.assert_called_once_with("/interface/print", "=.proplist=name,mtu")
+
+    def test_bind(self):
+        prepared = self.query.where(self.name == Param("iface"), Key("mtu") > Param("mtu")).prepare()
+        assert prepared.params == ((1, "?=name=", "iface"), (2, "?>mtu=", "mtu"))
+        bound = prepared.bind(iface="ether1", mtu=1500)
+        assert bound.words == ("=.proplist=name,mtu", "?=name=ether1", "?>mtu=1500")
+        assert bound.bind(iface="ether2", mtu=True).words == ("=.proplist=name,mtu", "?=name=ether2", "?>mtu=yes")
+
+    def test_bind_in(self):
+        prepared = self.query.where(self.name.In(Param("a"), Param("b"), True)).prepare()
+        assert prepared.params == ((1, "?=name=", "a"), (2, "?=name=", "b"))
+        bound = prepared.bind(a="ether1", b="ether2")
+        assert bound.words == ("=.proplist=name,mtu", "?=name=ether1", "?=name=ether2", "?=name=yes", "?#||")
+
+    def test_call_raises_when_not_bound(self):
+        prepared = self.query.where(self.name == Param("iface")).prepare()
+        with pytest.raises(ValueError, match="iface"):
+            prepared(MagicMock())
+
+    def test_async_query_prepare(self):
+        query = AsyncQuery(path=self.path, keys=(), api=MagicMock())
+        query.where(self.name != "ether1")
+        query.__aiter__()
+        query.api.rawCmd.assert_called_once_with("/interface/print", "?=name=ether1", "?#!")
@@ -0,0 +1,183 @@
+# -*- coding: UTF-8 -*-
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from librouteros.api import Api
+from librouteros.exceptions import TrapError
+from librouteros.reconcile import Change, longest_increasing, moves, plan, reconcile
+
+
+class Router:
+    """Minimal in memory emulation of ordered table."""
+
+    def __init__(self, *rows):
+        self.rows = [dict(row) for row in rows]
+        self.next_id = 100
+        self.calls = []
+        self.batches = []
+
+    def raw_cmd(self, cmd, *words):
+        self.calls.append((cmd, words))
+        return iter([dict(row) for row in self.rows])
+
+    def call(self, cmd, **kwargs):
+        self.calls.append((cmd, kwargs))
+        action = cmd.rsplit("/", 1)[1]
+        if action == "add":
+            self.next_id += 1
+            self.rows.append({".id": f"*{self.next_id}", **kwargs})
+            return iter(({"ret": f"*{self.next_id}"},))
+        if action == "remove":
+            ids = kwargs[".id"].split(",")
+            self.rows = [row for row in self.rows if row[".id"] not in ids]
+        elif action == "set":
+            self.find(kwargs[".id"]).update(kwargs)
+        elif action == "move":
+            row = self.find(kwargs["numbers"])
+            self.rows.remove(row)
+            if "destination" in kwargs:
+                self.rows.insert(self.rows.index(self.find(kwargs["destination"])), row)
+            else:
+                self.rows.append(row)
+        return iter(())
+
+    def batch(self, sentences):
+        sentences = list(sentences)
+        self.batches.append(len(sentences))
+        results = []
+        for cmd, *words in sentences:
+            kwargs = dict(word[1:].split("=", 1) for word in words)
+            if "=" in kwargs.get("name", ""):
+                results.append(TrapError(message="invalid name"))
+            else:
+                results.append(list(self.call(cmd, **kwargs)))
+        return results
+
+    def find(self, row_id):
+        return next(row for row in self.rows if row[".id"] == row_id)
+
+    def names(self):
+        return [row["name"] for row in self.rows]
+
+
+@pytest.fixture
+def router():
+    return Router(
+        {".id": "*1", "name": "a", "comment": "one"},
+        {".id": "*2", "name": "b", "comment": "two", "disabled": False},
+        {".id": "*3", "name": "c", "comment": "three"},
+        {".id": "*4", "name": "d", "comment": "four"},
+    )
+
+
+@pytest.fixture
+def path(router):
+    api = Api(protocol=MagicMock())
+    api.rawCmd = MagicMock(side_effect=router.raw_cmd)
+    api.__class__ = type(
+        "FakeApi",
+        (Api,),
+        {
+            "__call__": lambda self, cmd, **kwargs: router.call(cmd, **kwargs),
+            "batch": lambda self, sentences: router.batch(sentences),
+        },
+    )
+    return api.path("ip", "firewall", "filter")
+
+
+def test_plan_reads_minimal_proplist(router, path):
+    plan(path, [{"name": "a", "comment": "one"}])
+    assert router.calls[0] == ("/ip/firewall/filter/print", ("=.proplist=.id,name,comment",))
+
+
+def test_plan_changes(router, path):
+    result = plan(
+        path,
+        [
+            {"name": "a", "comment": "one"},
+            {"name": "b", "comment": "two", "disabled": "no"},
+            {"name": "c", "comment": "changed"},
+            {"name": "e", "comment": "new"},
+        ],
+    )
+    assert result.changes == [
+        Change(action="remove", key=("d",), params={".id": "*4"}),
+        Change(action="set", key=("c",), params={"comment": "changed"}),
+        Change(action="add", key=("e",), params={"name": "e", "comment": "new"}),
+    ]
+    assert str(result) == "remove ('d',) .id=*4\nset ('c',) comment=changed\nadd ('e',) name=e comment=new"
+
+
+def test_dry_run_does_not_apply(router, path):
+    result = reconcile(path, [{"name": "x"}], dry_run=True)
+    assert result
+    assert router.names() == ["a", "b", "c", "d"]
+
+
+def test_reconcile_applies(router, path):
+    desired = [
+        {"name": "d", "comment": "four"},
+        {"name": "a", "comment": "one"},
+        {"name": "e", "comment": "new"},
+        {"name": "c", "comment": "changed"},
+    ]
+    reconcile(path, desired, ordered=True)
+    assert router.names() == ["d", "a", "e", "c"]
+    assert router.find("*3")["comment"] == "changed"
+    assert not plan(path, desired, ordered=True)
+
+
+def test_reconcile_pipelines_changes(router, path):
+    desired = [
+        {"name": "d", "comment": "four"},
+        {"name": "a", "comment": "one"},
+        {"name": "e", "comment": "new"},
+        {"name": "f", "comment": "new"},
+        {"name": "c", "comment": "changed"},
+    ]
+    reconcile(path, desired, ordered=True)
+    # One batch with set and both adds, one with all moves.
+    assert router.batches == [3, 2]
+    assert router.names() == ["d", "a", "e", "f", "c"]
+
+
+def test_reconcile_raises_batch_error(router, path):
+    with pytest.raises(TrapError):
+        reconcile(path, [{"name": "a=b"}, {"name": "e"}], remove=False)
+    # Other changes of the batch were still applied.
+    assert router.names() == ["a", "b", "c", "d", "e"]
+
+
+def test_duplicates_are_removed_by_id(router, path):
+    router.rows.append({".id": "*9", "name": "a", "comment": "copy"})
+    result = plan(path, [{"name": "a", "comment": "one"}, {"name": "b"}, {"name": "c"}, {"name": "d"}])
+    assert result.changes == [Change(action="remove", key=("a",), params={".id": "*9"})]
+    assert result.ids[("a",)] == "*1"
+    result.apply()
+    assert router.find("*1")["comment"] == "one"
+    assert [row[".id"] for row in router.rows] == ["*1", "*2", "*3", "*4"]
+
+
+def test_reconcile_without_remove(router, path):
+    reconcile(path, [{"name": "e"}], remove=False)
+    assert router.names() == ["a", "b", "c", "d", "e"]
+
+
+def test_longest_increasing():
+    assert longest_increasing([3, 0, 1, 4, 2]) == {1, 2, 4}
+    assert longest_increasing([]) == set()
+
+
+@pytest.mark.parametrize(
+    ("current", "desired", "count"),
+    (
+        ("abcd", "abcd", 0),
+        ("abcd", "dabc", 1),
+        ("abcd", "dcba", 3),
+        ("abcd", "bcda", 1),
+    ),
+)
+def test_moves_minimal(current, desired, count):
+    assert len(moves([(c,) for c in current], [(c,) for c in desired])) == count
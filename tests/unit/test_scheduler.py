@@ -0,0 +1,141 @@
+# -*- coding: UTF-8 -*-
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from librouteros.api import AsyncApi
+from librouteros.exceptions import TrapError
+from librouteros.pool import AsyncPool
+from librouteros.query import PreparedQuery
+from librouteros.scheduler import Scheduler
+
+INTERFACE = PreparedQuery(cmd="/interface/print", words=())
+
+
+class Test_Scheduler:
+    def setup_method(self):
+        self.calls = []
+        self.delay = 0
+        self.error = None
+        self.pool = AsyncPool(self.connect)
+        self.results = []
+
+    async def connect(self, host):
+        api = AsyncApi(protocol=AsyncMock())
+        api.rawCmd = self.raw_cmd
+        return api
+
+    async def raw_cmd(self, cmd, *words):
+        self.calls.append((cmd, *words))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        yield {"name": "ether1"}
+
+    def collect(self, result):
+        self.results.append(result)
+
+    async def run_for(self, seconds, *jobs, **kwargs):
+        async with Scheduler(self.pool, jitter=0, spread=False, **kwargs) as scheduler:
+            schedules = [scheduler.add(*job) for job in jobs]
+            await asyncio.sleep(seconds)
+        return schedules
+
+    @pytest.mark.asyncio
+    async def test_polls_every_interval(self):
+        (schedule,) = await self.run_for(0.09, ("a", INTERFACE, 0.02, self.collect))
+        assert 4 <= len(self.results) == schedule.stats.runs <= 5
+        assert self.results[0].rows == [{"name": "ether1"}]
+        assert self.results[0].host == "a"
+        assert self.results[0].error is None
+
+    @pytest.mark.asyncio
+    async def test_path_is_printed(self):
+        await self.run_for(0.01, ("a", "interface", 1, self.collect))
+        assert self.calls == [("/interface/print",)]
+
+    @pytest.mark.asyncio
+    async def test_identical_jobs_share_schedule(self):
+        schedules = await self.run_for(0.01, ("a", INTERFACE, 1, self.collect), ("a", INTERFACE, 1, self.collect))
+        assert schedules[0] is schedules[1]
+        assert len(self.calls) == 1
+        assert len(self.results) == 2
+
+    @pytest.mark.asyncio
+    async def test_coalesces_inflight_query(self):
+        self.delay = 0.03
+        schedules = await self.run_for(0.02, ("a", INTERFACE, 1, self.collect), ("a", INTERFACE, 2, self.collect))
+        await asyncio.sleep(0)
+        assert len(self.calls) == 1
+        assert schedules[1].stats.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_other_host_is_not_coalesced(self):
+        await self.run_for(0.01, ("a", INTERFACE, 1, self.collect), ("b", INTERFACE, 1, self.collect))
+        assert len(self.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_skips_while_in_flight(self):
+        self.delay = 0.05
+        (schedule,) = await self.run_for(0.07, ("a", INTERFACE, 0.02, self.collect))
+        assert len(self.calls) == 2
+        assert schedule.stats.skipped >= 2
+
+    @pytest.mark.asyncio
+    async def test_error_is_passed_to_callback(self):
+        self.error = TrapError(message="no such command")
+        (schedule,) = await self.run_for(0.01, ("a", INTERFACE, 1, self.collect))
+        assert self.results[0].error is self.error
+        assert self.results[0].rows == []
+        assert schedule.stats.errors == 1
+
+    @pytest.mark.asyncio
+    async def test_callback_errors_are_counted(self):
+        async def failing(result):
+            raise ValueError("bad")
+
+        (schedule,) = await self.run_for(0.01, ("a", INTERFACE, 1, failing))
+        assert schedule.stats.callback_errors == 1
+        assert isinstance(schedule.stats.last_error, ValueError)
+
+    @pytest.mark.asyncio
+    async def test_lag(self):
+        async with Scheduler(self.pool, jitter=0, spread=False) as scheduler:
+            schedule = scheduler.add("a", INTERFACE, 1, self.collect)
+            # Block event loop, so timer fires late.
+            time.sleep(0.02)  # noqa ASYNC251
+            await asyncio.sleep(0.01)
+        assert schedule.stats.last_lag >= 0.02
+        assert schedule.stats.max_lag == schedule.stats.mean_lag == self.results[0].lag
+
+    @pytest.mark.asyncio
+    async def test_spread_and_jitter_stay_within_interval(self):
+        async with Scheduler(self.pool, jitter=0.2) as scheduler:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            schedules = [scheduler.add(host, INTERFACE, 10, self.collect) for host in "abcdefgh"]
+            bases = [schedule.base for schedule in schedules]
+            assert all(now <= base <= now + 10 for base in bases)
+            assert len(set(bases)) > 1
+            for schedule in schedules:
+                scheduler.fire(schedule, schedule.base)
+                assert schedule.handle.when() == pytest.approx(schedule.base, abs=2)
+
+    @pytest.mark.asyncio
+    async def test_close_stops_polls(self):
+        self.delay = 1
+        async with Scheduler(self.pool, jitter=0, spread=False) as scheduler:
+            scheduler.add("a", INTERFACE, 0.01, self.collect)
+            await asyncio.sleep(0.005)
+        assert not scheduler.inflight
+        assert all(schedule.handle is None for schedule in scheduler.schedules.values())
+        assert self.results == []
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="Jitter"):
+            Scheduler(self.pool, jitter=0.5)
+        with pytest.raises(ValueError, match="Interval"):
+            Scheduler(self.pool).add("a", INTERFACE, 0, self.collect)
@@ -0,0 +1,87 @@
+# -*- coding: UTF-8 -*-
+
+import asyncio
+from contextlib import aclosing
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from librouteros.api import AsyncApi
+from librouteros.exceptions import ConnectionClosed, MultiTrapError, TrapError
+
+ROWS = [{"name": f"ether{number}"} for number in range(10)]
+REPLIES = [*(("!re", row) for row in ROWS), ("!done", {})]
+
+
+def make_api(replies):
+    api = AsyncApi(protocol=AsyncMock())
+    api.protocol.transport.pause_reading = Mock()
+    api.protocol.transport.resume_reading = Mock()
+    api.readSentence = AsyncMock(side_effect=replies)
+    return api
+
+
+@pytest.mark.asyncio
+async def test_yields_rows_in_order():
+    api = make_api(REPLIES)
+    assert [row async for row in api.stream("/interface/print", "=.proplist=name")] == ROWS
+    api.protocol.writeSentence.assert_awaited_once_with("/interface/print", "=.proplist=name")
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_pauses_reading():
+    api = make_api(REPLIES)
+    stream = api.stream("/interface/print", maxsize=2)
+    rows = []
+    async for row in stream:
+        rows.append(row)
+        await asyncio.sleep(0.001)
+    assert rows == ROWS
+    assert stream.max_depth <= 2
+    assert stream.pauses > 0
+    assert api.protocol.transport.pause_reading.call_count == stream.pauses
+    assert not stream.paused
+
+
+@pytest.mark.asyncio
+async def test_fast_consumer_does_not_pause():
+    api = make_api(REPLIES)
+    stream = api.stream("/interface/print", maxsize=100)
+    assert [row async for row in stream] == ROWS
+    assert stream.pauses == 0
+    api.protocol.transport.pause_reading.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_early_exit_drains_response():
+    """Assert that whole response is read, leaving connection usable."""
+    api = make_api(REPLIES)
+    stream = api.stream("/interface/print", maxsize=2)
+    async with aclosing(aiter(stream)) as rows:
+        async for _ in rows:
+            break
+    assert api.readSentence.await_count == len(REPLIES)
+    assert not stream.paused
+
+
+@pytest.mark.asyncio
+async def test_raises_trap_after_rows():
+    api = make_api([("!re", ROWS[0]), ("!trap", {"message": "failure"}), ("!done", {})])
+    rows = aiter(api.stream("/interface/print"))
+    assert await anext(rows) == ROWS[0]
+    with pytest.raises(TrapError):
+        await anext(rows)
+
+
+@pytest.mark.asyncio
+async def test_raises_multi_trap():
+    api = make_api([("!trap", {"message": "first"}), ("!trap", {"message": "second"}), ("!done", {})])
+    with pytest.raises(MultiTrapError):
+        [row async for row in api.stream("/interface/print")]
+
+
+@pytest.mark.asyncio
+async def test_reraises_reader_errors():
+    api = make_api([("!re", ROWS[0]), ConnectionClosed("closed")])
+    with pytest.raises(ConnectionClosed):
+        [row async for row in api.stream("/interface/print")]
@@ -0,0 +1,91 @@
+# -*- coding: UTF-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from unittest.mock import Mock
+
+import pytest
+
+from librouteros.exceptions import ConnectionClosed, TrapError
+from librouteros.threaded import ThreadSafeApi
+
+
+class FakeProtocol:
+    """Reply with one row holding command name. Replies of each write are sent in reverse order."""
+
+    def __init__(self):
+        self.replies = Queue()
+        self.written = []
+        self.closed = False
+
+    def writeSentences(self, *sentences):
+        self.written.extend(sentences)
+        replies = []
+        for cmd, *words, tag in sentences:
+            if cmd == "/fail":
+                replies.append((("!trap", ("=message=failure", tag)), ("!done", (tag,))))
+            elif cmd == "/hang":
+                continue
+            else:
+                replies.append((("!re", (f"=cmd={cmd}", *words, tag)), ("!done", (tag,))))
+        for reply in reversed(replies):
+            for sentence in reply:
+                self.replies.put(sentence)
+
+    def readSentence(self):
+        reply = self.replies.get()
+        if reply is None:
+            raise ConnectionClosed("closed")
+        return reply
+
+    def close(self):
+        self.closed = True
+        self.replies.put(None)
+
+
+class Test_ThreadSafeApi:
+    def setup_method(self):
+        self.api = ThreadSafeApi(protocol=FakeProtocol())
+
+    def teardown_method(self):
+        self.api.close()
+
+    def test_call(self):
+        assert tuple(self.api("/system/resource/print", name="x")) == ({"cmd": "/system/resource/print", "name": "x"},)
+        assert self.api.protocol.written == [("/system/resource/print", "=name=x", ".tag=0")]
+
+    def test_many_threads_share_session(self):
+        paths = [f"/path{number}/print" for number in range(200)]
+        with ThreadPoolExecutor(16) as executor:
+            results = list(executor.map(lambda path: tuple(self.api.rawCmd(path)), paths))
+        assert results == [({"cmd": path},) for path in paths]
+        assert not self.api.calls
+
+    def test_trap_raised_only_in_failing_call(self):
+        failing = self.api.submit("/fail")
+        working = self.api.submit("/interface/print")
+        with pytest.raises(TrapError):
+            failing.result(timeout=1)
+        assert working.result(timeout=1) == [{"cmd": "/interface/print"}]
+
+    def test_batch(self):
+        resource, error = self.api.batch([("/system/resource/print",), ("/fail",)])
+        assert resource == [{"cmd": "/system/resource/print"}]
+        assert isinstance(error, TrapError)
+        assert len(self.api.protocol.written) == 2
+
+    def test_close_fails_waiting_calls(self):
+        pending = self.api.submit("/hang")
+        self.api.close()
+        with pytest.raises(ConnectionClosed):
+            pending.result(timeout=1)
+        with pytest.raises(ConnectionClosed):
+            self.api.submit("/interface/print")
+
+    def test_write_error_fails_calls(self):
+        self.api.protocol.writeSentences = Mock(side_effect=OSError("broken pipe"))
+        with pytest.raises(OSError, match="broken pipe"):
+            self.api.submit("/interface/print")
+        assert not self.api.calls
+        with pytest.raises(OSError, match="broken pipe"):
+            self.api.submit("/interface/print")
@@ -0,0 +1,187 @@
+# -*- coding: UTF-8 -*-
+
+import hashlib
+from collections import deque
+
+import pytest
+
+from librouteros.api import Api, AsyncApi
+from librouteros.exceptions import ProtocolError, TrapError
+from librouteros.transfer import Download
+
+CONTENT = bytes(range(256)) * 40
+
+
+class FakeRouter:
+    """Serve /file/print and /file/read. Replies to each batch of requests arrive in reverse order."""
+
+    def __init__(self, content, max_chunk=None, fail_at=None, modified="2026-01-01 00:00:00"):
+        self.content = content
+        self.modified = modified
+        self.max_chunk = max_chunk
+        self.fail_at = fail_at
+        self.replies = deque()
+        self.requests = []
+
+    def writeSentence(self, cmd, *words):
+        assert cmd == "/file/print"
+        row = (f"=size={len(self.content)}", f"=last-modified={self.modified}")
+        self.replies.extend((("!re", row), ("!done", ())))
+
+    def readSentence(self):
+        return self.replies.popleft()
+
+    def writeSentences(self, *sentences):
+        replies = []
+        for _, _, offset, chunk_size, tag in sentences:
+            offset = int(offset.split("=")[2])
+            chunk_size = min(int(chunk_size.split("=")[2]), self.max_chunk or len(self.content))
+            self.requests.append(offset)
+            raw_tag = tag.encode()
+            if offset == self.fail_at:
+                replies.append((("!trap", (b"=message=failure", raw_tag)), ("!done", (raw_tag,))))
+            else:
+                data = self.content[offset : offset + chunk_size]
+                replies.append((("!re", (b"=data=" + data, raw_tag)), ("!done", (raw_tag,))))
+        for reply in reversed(replies):
+            self.replies.extend(reply)
+
+    def readRawSentence(self):
+        return self.replies.popleft()
+
+
+class AsyncFakeRouter(FakeRouter):
+    async def writeSentence(self, cmd, *words):
+        super().writeSentence(cmd, *words)
+
+    async def readSentence(self):
+        return super().readSentence()
+
+    async def writeSentences(self, *sentences):
+        super().writeSentences(*sentences)
+
+    async def readRawSentence(self):
+        return super().readRawSentence()
+
+
+@pytest.fixture
+def destination(tmp_path):
+    return str(tmp_path / "backup.rsc")
+
+
+def test_download(destination):
+    router = FakeRouter(CONTENT)
+    digest = Api(protocol=router).download("backup.rsc", destination, chunk_size=1000, concurrency=3)
+    with open(destination, "rb") as file:
+        assert file.read() == CONTENT
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+    assert sorted(router.requests) == list(range(0, len(CONTENT), 1000))
+
+
+def test_download_requests_rest_of_short_chunk(destination):
+    router = FakeRouter(CONTENT, max_chunk=600)
+    Api(protocol=router).download("backup.rsc", destination, chunk_size=1000)
+    with open(destination, "rb") as file:
+        assert file.read() == CONTENT
+
+
+def partial_download(destination, router):
+    """Download whole file, then cut it as if download was interrupted."""
+    Api(protocol=router).download("backup.rsc", destination)
+    with open(destination, "r+b") as file:
+        file.truncate(3000)
+
+
+def test_download_resumes(destination):
+    partial_download(destination, FakeRouter(CONTENT))
+    router = FakeRouter(CONTENT)
+    digest = Api(protocol=router).download("backup.rsc", destination, chunk_size=1000)
+    assert min(router.requests) == 3000
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_download_restarts_when_remote_file_changed(destination):
+    partial_download(destination, FakeRouter(CONTENT))
+    changed = CONTENT[::-1]
+    router = FakeRouter(changed, modified="2026-02-01 00:00:00")
+    digest = Api(protocol=router).download("backup.rsc", destination, chunk_size=1000)
+    assert min(router.requests) == 0
+    assert digest == hashlib.sha256(changed).hexdigest()
+
+
+def test_download_restarts_without_saved_state(destination):
+    with open(destination, "wb") as file:
+        file.write(CONTENT[::-1][:3000])
+    router = FakeRouter(CONTENT)
+    Api(protocol=router).download("backup.rsc", destination, chunk_size=1000)
+    with open(destination, "rb") as file:
+        assert file.read() == CONTENT
+
+
+def test_download_restarts_when_local_file_is_bigger(destination):
+    partial_download(destination, FakeRouter(CONTENT))
+    with open(destination, "ab") as file:
+        file.write(CONTENT * 2)
+    Api(protocol=FakeRouter(CONTENT)).download("backup.rsc", destination)
+    with open(destination, "rb") as file:
+        assert file.read() == CONTENT
+
+
+def test_download_verifies_expected_digest(destination):
+    expected = hashlib.sha256(CONTENT).hexdigest()
+    assert Api(protocol=FakeRouter(CONTENT)).download("backup.rsc", destination, expected=expected) == expected
+    with pytest.raises(ProtocolError, match="expected"):
+        Api(protocol=FakeRouter(CONTENT)).download("backup.rsc", destination, expected="00")
+    # Next download starts from scratch.
+    router = FakeRouter(CONTENT)
+    Api(protocol=router).download("backup.rsc", destination, chunk_size=1000)
+    assert min(router.requests) == 0
+
+
+def test_download_raises_trap_and_drains(destination):
+    router = FakeRouter(CONTENT, fail_at=2000)
+    with pytest.raises(TrapError):
+        Api(protocol=router).download("backup.rsc", destination, chunk_size=1000, concurrency=4)
+    assert not router.replies
+
+
+def test_download_missing_file(destination):
+    router = FakeRouter(CONTENT)
+    router.writeSentence = lambda cmd, *words: router.replies.append(("!done", ()))
+    with pytest.raises(FileNotFoundError):
+        Api(protocol=router).download("missing.rsc", destination)
+
+
+@pytest.mark.asyncio
+async def test_async_download(destination):
+    digest = await AsyncApi(protocol=AsyncFakeRouter(CONTENT)).download("backup.rsc", destination, chunk_size=700)
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+
+
+class Test_Download:
+    def setup_method(self):
+        self.transfer = Download("file", size=2500, offset=0, chunk_size=1000, concurrency=2)
+
+    def test_requests_up_to_concurrency(self):
+        assert [sentence[2] for sentence in self.transfer.requests()] == ["=offset=0", "=offset=1000"]
+        assert self.transfer.requests() == []
+
+    def test_releases_chunks_in_order(self):
+        self.transfer.requests()
+        assert self.transfer.feed("!re", (b"=data=" + b"b" * 1000, b".tag=1000")) == []
+        assert self.transfer.feed("!re", (b"=data=" + b"a" * 1000, b".tag=0")) == [b"a" * 1000, b"b" * 1000]
+
+    def test_ignores_unknown_tags(self):
+        self.transfer.requests()
+        assert self.transfer.feed("!re", (b"=data=abc", b".tag=7")) == []
+        assert self.transfer.feed("!done", ()) == []
+        assert len(self.transfer.in_flight) == 2
+
+    def test_shrunk_file_raises(self):
+        self.transfer.requests()
+        self.transfer.feed("!done", (b".tag=0",))
+        self.transfer.feed("!done", (b".tag=1000",))
+        assert self.transfer.done
+        self.transfer.size = 2500
+        with pytest.raises(ProtocolError):
+            self.transfer.check()